@@ -12,6 +12,8 @@ import pytest
 import helpers.setup as test_setup
 from helpers.constants import PytestOptions, TestDirectory
 
+EXIT_NO_TESTS_COLLECTED = 5
+
 # Enable console logging
 test_setup.enable_logging()
 
@@ -36,13 +38,51 @@ def initialize_pytest_args():
                               .format(PytestOptions.XDIST_NO))
     arg_parser.add_argument("-l", "--lab", metavar="labName", default=None, 
                       help="Run tests on a specific Lab configuration directory, found under directory: conf/")
+    arg_parser.add_argument("--overlap", type=int, default=0, metavar="workers",
+                            help="Run the tests not marked config_mutating on this many concurrent workers sharing "
+                                 "the streams, then the config_mutating ones one at a time")
+    arg_parser.add_argument("--simulate", action="store_true", default=False,
+                            help="Run against the local A8/RIO/NSA simulator instead of the lab control plane")
+    arg_parser.add_argument("--time-scale", type=float, default=1.0,
+                            help="Compression factor of the recording timeline when simulating")
     return arg_parser
 
+
+def run_overlapped(pytest_args, workers, marker=None):
+    """
+    Run the tests in two passes: the independent ones concurrently, so that their wait phases overlap, and then
+    the config_mutating ones serially, as they change lab state every other test depends on.
+    :param pytest_args: arguments of a regular run
+    :param workers: number of concurrent workers of the first pass
+    :param marker: marker expression selecting the tests, if any
+    :return: exit code of the run
+    """
+    selection = "(%s) and " % marker if marker else ""
+    passes = [
+        pytest_args + ["-m", selection + "not config_mutating", "-n", str(workers), "--dist",
+                       PytestOptions.XDIST_LOAD, "--overlap"],
+        pytest_args + ["-m", selection + "config_mutating", "-n", "0", "--appendResults"],
+    ]
+    exit_code = 0
+    for args in passes:
+        result = pytest.main(args)
+        # A pass selecting no test is not a failure of the run
+        if result not in (0, EXIT_NO_TESTS_COLLECTED) and not exit_code:
+            exit_code = result
+    return exit_code
+
+
 if __name__ == "__main__":
     arg_parser = initialize_pytest_args()    
-    pytest_args = test_setup.construct_pytest_args(arg_parser.parse_args(), arg_parser)
+    args = arg_parser.parse_args()
+    pytest_args = test_setup.construct_pytest_args(args, arg_parser)
+    if args.simulate:
+        pytest_args += ["--simulate", "--simulateTimeScale", str(args.time_scale)]
 
-    test_run_result = pytest.main(pytest_args)  # Run the tests and pass the results of the test back to the caller
+    if args.overlap:
+        test_run_result = run_overlapped(pytest_args, args.overlap, args.m)
+    else:
+        test_run_result = pytest.main(pytest_args)  # Run the tests and pass the results of the test back to the caller
 
     sys.exit(test_run_result)
 
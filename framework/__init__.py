@@ -0,0 +1,6 @@
+"""
+Framework level building blocks shared by the test suites.
+
+The modules in this package sit on top of the lab helpers (helpers.*, validators.*) and take care of
+work that has to scale with the number of recordings, nodes or test cases handled in one run.
+"""
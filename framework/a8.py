@@ -0,0 +1,205 @@
+"""
+Bulk recording requests towards A8.
+
+helpers.vmr.a8.a8_helper sends a Recording object as one request, whatever the number of entries. The
+functions here split large Recording objects into chunks, submit the chunks concurrently with bounded
+parallelism and report the outcome of every entry. Deletions can additionally be verified against RIO.
+"""
+import copy
+import logging
+import multiprocessing.pool as mp_pool
+import os
+import time
+from collections import OrderedDict
+
+import requests
+
+import framework.clock as clock
+import helpers.models.recording as recording_model
+import helpers.vmr.a8.a8_helper as a8
+
+from framework.rio import find_recordings
+from helpers.constants import TestLog
+
+LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
+
+# Largest Recording a single A8 request is known to handle safely
+DEFAULT_CHUNK_SIZE = 20
+DEFAULT_PARALLELISM = 4
+# Time given to RIO to forget deleted recordings, and the pause between two verification rounds
+DELETION_TIMEOUT = 300
+DELETION_POLL_INTERVAL = 2
+
+
+class EntryResult(object):
+    """
+    Outcome of one recording entry of a bulk request.
+    """
+    __slots__ = ("recording_id", "accepted", "status_code", "latency", "error", "verified", "verify_latency")
+
+    def __init__(self, recording_id, accepted, status_code, latency, error=None):
+        self.recording_id = recording_id
+        self.accepted = accepted
+        self.status_code = status_code
+        self.latency = latency
+        self.error = error
+        # Only used by deletions: whether RIO stopped reporting the recording, and how long that took
+        self.verified = None
+        self.verify_latency = None
+
+    def __repr__(self):
+        return "EntryResult(recording_id=%s, accepted=%s, status_code=%s, latency=%.3f)" % (
+            self.recording_id, self.accepted, self.status_code, self.latency)
+
+
+def split_recording(recording, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Split a Recording into Recording objects of at most chunk_size entries.
+    :param recording: helpers.models.recording.Recording instance
+    :param chunk_size: maximum number of entries per chunk
+    :return: list of Recording objects, the original one when it already fits in a chunk
+    """
+    entries = recording.get_entries()
+    if len(entries) <= chunk_size:
+        return [recording]
+
+    chunks = []
+    for index, offset in enumerate(range(0, len(entries), chunk_size)):
+        chunk = copy.copy(recording)
+        chunk.Entries = entries[offset:offset + chunk_size]
+        chunk.RequestId = "%s_%d" % (recording.RequestId, index)
+        chunks.append(chunk)
+    return chunks
+
+
+def _submit(args):
+    action, chunk, expected_status = args
+    recording_ids = [entry.RecordingId for entry in chunk.get_entries()]
+    start = time.time()
+    try:
+        response = action(chunk)
+    except requests.exceptions.RequestException as e:
+        latency = time.time() - start
+        return [EntryResult(recording_id, False, None, latency, str(e)) for recording_id in recording_ids]
+
+    latency = time.time() - start
+    accepted = response.status_code == expected_status
+    error = None if accepted else "Unexpected status code %s: %s" % (response.status_code, response.text)
+    return [EntryResult(recording_id, accepted, response.status_code, latency, error) for recording_id in recording_ids]
+
+
+def submit_in_chunks(action, recording, expected_status, chunk_size=DEFAULT_CHUNK_SIZE,
+                     parallelism=DEFAULT_PARALLELISM):
+    """
+    Send a Recording through an a8_helper call chunk by chunk, with bounded parallelism.
+    :param action: a8_helper function taking a Recording, e.g. a8.create_recording
+    :param recording: Recording to send
+    :param expected_status: HTTP status code meaning the chunk was accepted
+    :param chunk_size: maximum number of entries per request
+    :param parallelism: maximum number of requests in flight
+    :return: OrderedDict of recording id -> EntryResult, in the order of the entries
+    """
+    chunks = split_recording(recording, chunk_size)
+    results = OrderedDict((entry.RecordingId, None) for entry in recording.get_entries())
+
+    pool = mp_pool.ThreadPool(processes=max(1, min(parallelism, len(chunks))))
+    try:
+        for chunk_results in pool.imap_unordered(_submit, [(action, chunk, expected_status) for chunk in chunks]):
+            for result in chunk_results:
+                results[result.recording_id] = result
+    finally:
+        pool.close()
+        pool.join()
+
+    LOGGER.debug("%s: %d entries in %d request(s)", action.__name__, len(results), len(chunks))
+    return results
+
+
+def create_recordings(recording, chunk_size=DEFAULT_CHUNK_SIZE, parallelism=DEFAULT_PARALLELISM):
+    """
+    Create (or update) the recordings of an arbitrarily large Recording.
+    :return: OrderedDict of recording id -> EntryResult
+    """
+    return submit_in_chunks(a8.create_recording, recording, requests.codes.no_content, chunk_size, parallelism)
+
+
+def build_recording(recording_ids):
+    """
+    Recording holding one entry per recording id, e.g. to delete recordings known only by their ids.
+    :return: Recording, None when there is no recording id
+    """
+    recording_ids = list(recording_ids)
+    if not recording_ids:
+        return None
+    recording = recording_model.Recording(RecordingId=recording_ids[0])
+    template = recording.get_entry(0)
+    for recording_id in recording_ids[1:]:
+        entry = copy.copy(template)
+        entry.RecordingId = recording_id
+        recording.Entries.append(entry)
+    return recording
+
+
+def verify_deletion(results, timeout=DELETION_TIMEOUT, poll_interval=DELETION_POLL_INTERVAL):
+    """
+    Poll RIO in batches until every accepted deletion disappeared from it or the timeout expires.
+    Updates verified / verify_latency of the results in place.
+    :param results: dict of recording id -> EntryResult returned by delete_recordings
+    """
+    start = clock.now()
+    pending = set(recording_id for recording_id, result in results.items() if result.accepted)
+
+    while pending:
+        responses = find_recordings(pending)
+        elapsed = clock.now() - start
+        for recording_id, response in responses.items():
+            if not response:
+                results[recording_id].verified = True
+                results[recording_id].verify_latency = elapsed
+                pending.discard(recording_id)
+
+        if not pending or elapsed >= timeout:
+            break
+        clock.sleep(poll_interval)
+
+    for recording_id in pending:
+        results[recording_id].verified = False
+        results[recording_id].error = "Recording still present in RIO after %s seconds" % timeout
+    return results
+
+
+def delete_recordings(recordings, verify=True, chunk_size=DEFAULT_CHUNK_SIZE, parallelism=DEFAULT_PARALLELISM,
+                      timeout=DELETION_TIMEOUT):
+    """
+    Delete many recordings with bounded concurrency and optionally verify the deletion in RIO.
+    :param recordings: Recording object, or an iterable of recording ids
+    :param verify: poll RIO until the recordings are gone
+    :return: OrderedDict of recording id -> EntryResult
+    """
+    if not isinstance(recordings, recording_model.Recording):
+        recordings = build_recording(recordings)
+        if recordings is None:
+            return OrderedDict()
+
+    results = submit_in_chunks(a8.delete_recording, recordings, requests.codes.no_content, chunk_size, parallelism)
+    if verify:
+        verify_deletion(results, timeout)
+    return results
+
+
+def validate_results(results):
+    """
+    Check that every entry of a bulk request was accepted and, for verified deletions, is gone from RIO.
+    :param results: dict of recording id -> EntryResult
+    :return: (is_valid, error)
+    """
+    rejected = [result for result in results.values() if not result.accepted]
+    if rejected:
+        return False, "%d of %d recording request(s) rejected, first: %s - %s" % (
+            len(rejected), len(results), rejected[0].recording_id, rejected[0].error)
+
+    unverified = [result for result in results.values() if result.verified is False]
+    if unverified:
+        return False, "%d of %d recording(s) not deleted, first: %s - %s" % (
+            len(unverified), len(results), unverified[0].recording_id, unverified[0].error)
+    return True, None
@@ -0,0 +1,174 @@
+"""
+Clock used for scheduling and waits.
+
+The tests compute recording times with utils.get_formatted_time and then block in utils.wait, sleeps or
+notification waits, so a test lasts at least its recording window. Every wait of the framework goes
+through the clock of this module. The real clock is used against a lab. Against the simulator a virtual
+clock is installed: sleeps move it forward instantly, and waits jump straight to the next event scheduled
+on it instead of letting wall time pass.
+
+install() also routes helpers.utils.get_formatted_time, get_sleep_time and wait through the clock.
+"""
+import datetime
+import heapq
+import logging
+import os
+import threading
+import time
+
+import helpers.utils as utils
+
+from helpers.constants import TestLog
+
+LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
+
+# Wall time given to the other threads (simulator, notification listener) to react before the virtual
+# clock jumps to the next event
+REACTION_TIME = 0.2
+
+_ORIGINALS = {}
+
+
+class RealClock(object):
+    """
+    Wall clock.
+    """
+
+    def now(self):
+        return time.time()
+
+    def utcnow(self):
+        return datetime.datetime.utcnow()
+
+    def get_offset(self):
+        return 0
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def schedule(self, timestamp):
+        pass
+
+    def wait(self, event, timeout=None):
+        """
+        Block until the event is set or the timeout expires.
+        :return: True if the event is set
+        """
+        return event.wait(timeout)
+
+
+class VirtualClock(RealClock):
+    """
+    Clock running with wall time plus an offset, the offset growing every time the clock is slept on.
+    """
+
+    def __init__(self):
+        self._offset = 0.0
+        self._wakeups = []
+        self._lock = threading.Lock()
+
+    def now(self):
+        return time.time() + self._offset
+
+    def utcnow(self):
+        return datetime.datetime.utcfromtimestamp(self.now())
+
+    def get_offset(self):
+        return self._offset
+
+    def advance(self, seconds):
+        if seconds > 0:
+            with self._lock:
+                self._offset += seconds
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def schedule(self, timestamp):
+        """
+        Register a time at which something is expected to happen, waits jump to it.
+        """
+        with self._lock:
+            heapq.heappush(self._wakeups, timestamp)
+
+    def _get_next_wakeup(self, now):
+        with self._lock:
+            while self._wakeups and self._wakeups[0] <= now:
+                heapq.heappop(self._wakeups)
+            return self._wakeups[0] if self._wakeups else None
+
+    def wait(self, event, timeout=None):
+        deadline = self.now() + timeout if timeout is not None else None
+        while not event.wait(REACTION_TIME):
+            now = self.now()
+            if deadline is not None and now >= deadline:
+                return event.is_set()
+            wakeup = self._get_next_wakeup(now)
+            targets = [target for target in (wakeup, deadline) if target is not None]
+            if targets:
+                self.advance(min(targets) - now)
+        return True
+
+
+_CLOCK = RealClock()
+
+
+def get_clock():
+    return _CLOCK
+
+
+def now():
+    return _CLOCK.now()
+
+
+def utcnow():
+    return _CLOCK.utcnow()
+
+
+def sleep(seconds):
+    _CLOCK.sleep(seconds)
+
+
+def wait(event, timeout=None):
+    return _CLOCK.wait(event, timeout)
+
+
+def schedule(timestamp):
+    _CLOCK.schedule(timestamp)
+
+
+def _get_formatted_time(seconds, *args, **kwargs):
+    return _ORIGINALS["get_formatted_time"](seconds + _CLOCK.get_offset(), *args, **kwargs)
+
+
+def _get_sleep_time(seconds, *args, **kwargs):
+    sleep_time = _ORIGINALS["get_sleep_time"](seconds, *args, **kwargs)
+    _CLOCK.sleep(sleep_time)
+    return 0
+
+
+def _wait(duration, *args, **kwargs):
+    _CLOCK.sleep(duration.total_seconds())
+
+
+def install(clock):
+    """
+    Make clock the clock of the framework and of the time helpers.
+    """
+    global _CLOCK
+    _CLOCK = clock
+    if isinstance(clock, VirtualClock) and not _ORIGINALS:
+        for name, replacement in (("get_formatted_time", _get_formatted_time), ("get_sleep_time", _get_sleep_time),
+                                  ("wait", _wait)):
+            _ORIGINALS[name] = getattr(utils, name)
+            setattr(utils, name, replacement)
+    LOGGER.info("%s installed", clock.__class__.__name__)
+
+
+def uninstall():
+    global _CLOCK
+    _CLOCK = RealClock()
+    for name, original in _ORIGINALS.items():
+        setattr(utils, name, original)
+    _ORIGINALS.clear()
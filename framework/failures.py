@@ -0,0 +1,145 @@
+"""
+Structured record of a test failure.
+
+pytest_runtest_makereport used to render the locals of the failing frame to text (rep.longrepr reprlocals, i.e.
+the repr of every local, 20 entry Recording objects, notification servers and queues included) and parse TC,
+US and message back out of it with regexes and ast.literal_eval. The record is now read directly from the
+exception and the frame of the test function: only the few locals of interest are looked up, and every text is
+truncated, so capturing a failure costs the same whatever the size of the locals, and the record stays small
+enough for the report and the xdist channel.
+"""
+import itertools
+import logging
+import os
+
+import framework.http_session as http_session
+
+from helpers.constants import TestLog
+
+LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
+
+MAX_TEXT_LENGTH = 2000
+MAX_RECORDING_IDS = 20
+# Locals of the tests holding the recordings they work on
+RECORDING_LOCALS = ("recording_id", "recording_ids", "recording", "recordings")
+# Locals of the tests declaring their test case and user story, and the message to report
+TC_LOCAL = "TC"
+US_LOCAL = "US"
+MESSAGE_LOCAL = "message"
+
+
+def _truncate(text, limit=MAX_TEXT_LENGTH):
+    if text is None or len(text) <= limit:
+        return text
+    return "%s... [%d characters truncated]" % (text[:limit], len(text) - limit)
+
+
+def _safe_str(value, limit=MAX_TEXT_LENGTH):
+    try:
+        return _truncate(value if isinstance(value, basestring) else str(value), limit)
+    except Exception as e:
+        return "<unprintable %s: %s>" % (value.__class__.__name__, e)
+
+
+def _get_test_entry(item, excinfo):
+    """
+    Traceback entry of the test function, the innermost one if it is not in the traceback (fixture failure).
+    """
+    function = getattr(item, "obj", None)
+    code = getattr(getattr(function, "__func__", function), "__code__", None)
+    for entry in reversed(excinfo.traceback):
+        if entry.frame.code.raw is code:
+            return entry
+    return excinfo.traceback[-1] if excinfo.traceback else None
+
+
+def _iter_recording_ids(value):
+    if isinstance(value, basestring):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for element in value:
+            for recording_id in _iter_recording_ids(element):
+                yield recording_id
+    elif getattr(value, "Entries", None) is not None:
+        for entry in value.Entries:
+            if getattr(entry, "RecordingId", None):
+                yield entry.RecordingId
+    elif getattr(value, "RecordingId", None):
+        yield value.RecordingId
+
+
+def get_recording_ids(test_locals):
+    """
+    Ids of the recordings held by the locals of RECORDING_LOCALS, MAX_RECORDING_IDS at most.
+    """
+    ids = itertools.chain.from_iterable(_iter_recording_ids(test_locals[name]) for name in RECORDING_LOCALS
+                                        if test_locals.get(name) is not None)
+    try:
+        return [str(recording_id) for recording_id in itertools.islice(ids, MAX_RECORDING_IDS)]
+    except Exception as e:
+        LOGGER.debug("Unable to get the recording ids of the failure: %s", e)
+        return []
+
+
+class FailureRecord(object):
+    """
+    What failed, where, and on which recordings.
+    """
+    __slots__ = ("phase", "exception", "message", "statement", "location", "tc", "us", "test_message",
+                 "recording_ids", "http_exchange", "traceback")
+
+    def __init__(self, phase, exception, message, statement=None, location=None, tc=None, us=None,
+                 test_message=None, recording_ids=(), http_exchange=None, traceback=None):
+        self.phase = phase
+        self.exception = exception
+        self.message = message
+        self.statement = statement
+        self.location = location
+        self.tc = tc
+        self.us = us
+        self.test_message = test_message
+        self.recording_ids = list(recording_ids)
+        self.http_exchange = http_exchange
+        self.traceback = traceback
+
+    def get_error(self):
+        """
+        Failing statement and error, as reported in the error field of the results.
+        """
+        error = "%s: %s" % (self.exception, self.message)
+        return "%s\n%s" % (self.statement, error) if self.statement else error
+
+    def to_dict(self):
+        """
+        Record without the traceback, for the report.
+        """
+        return dict((name, getattr(self, name)) for name in self.__slots__ if name != "traceback")
+
+
+def capture(item, call, phase):
+    """
+    :param call: pytest CallInfo of the failed phase
+    :return: FailureRecord
+    """
+    excinfo = call.excinfo
+    entry = _get_test_entry(item, excinfo)
+    test_locals = entry.frame.f_locals if entry is not None else {}
+
+    exchange = http_session.get_last_exchange()
+    if exchange is not None:
+        method, url, status_code, elapsed = exchange
+        exchange = {"method": method, "url": _truncate(url, 500), "status_code": status_code, "elapsed": elapsed}
+
+    return FailureRecord(
+        phase=phase,
+        exception=excinfo.typename,
+        message=_safe_str(excinfo.value),
+        statement=_safe_str(entry.statement).strip() if entry is not None else None,
+        location="%s:%d" % (entry.path, entry.lineno + 1) if entry is not None else None,
+        tc=_safe_str(test_locals[TC_LOCAL], 200) if test_locals.get(TC_LOCAL) is not None else None,
+        us=_safe_str(test_locals[US_LOCAL], 200) if test_locals.get(US_LOCAL) is not None else None,
+        test_message=_safe_str(test_locals[MESSAGE_LOCAL]) if test_locals.get(MESSAGE_LOCAL) is not None else None,
+        recording_ids=get_recording_ids(test_locals),
+        http_exchange=exchange,
+        # Without the locals, which can be arbitrarily large
+        traceback=_truncate(str(excinfo.getrepr(showlocals=False, style="short")), 10 * MAX_TEXT_LENGTH))
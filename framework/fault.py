@@ -0,0 +1,316 @@
+"""
+Declarative fault injection for the destructive tests.
+
+A FaultPlan lists the impairments (tc/netem commands built by the destructive utils) to apply to the interfaces
+of a set of nodes. The nodes are handled concurrently: each one is connected to, cleared of the revert jobs left
+by previous tests and given its own scheduled revert job, then every node waits on a barrier so the impairments
+start within a few milliseconds of each other and multi-node faults really overlap. Revert runs concurrently too.
+
+The scheduled revert jobs are tracked in a session registry instead of module globals, and the session
+teardown reverts any plan a test left behind, whatever happened to the test.
+"""
+import logging
+import multiprocessing.pool as mp_pool
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import framework.ssh as ssh
+import helpers.destructive.utils as destructive_utils
+
+from helpers.constants import Component
+from helpers.constants import DestructiveTesting
+from helpers.constants import Interface
+from helpers.constants import MINUTES
+from helpers.constants import TestLog
+
+LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
+
+# Delay after which the scheduled job reverts a fault the test could not revert itself
+REVERT_DELAY = 10 * MINUTES
+# A fault on the management interface cuts the SSH access to the node, only the scheduled job can revert it
+MGMT_REVERT_DELAY = 2 * MINUTES
+# Time given to every node to connect and schedule its revert job before the injection is abandoned
+PREPARE_TIMEOUT = 120
+
+
+class Fault(object):
+    """
+    Impairment of one interface of one node.
+    """
+
+    def __init__(self, node_ip, interface, des_cmd, expected_result=None, check_interface=None, ifb_interface=None,
+                 revert_delay=REVERT_DELAY):
+        """
+        :param interface: impaired interface, the scheduled revert job restores it
+        :param des_cmd: complete tc command causing the impairment
+        :param expected_result: qdisc settings exec_des_cmd verifies on check_interface, None when the command
+        cannot be verified (the impaired interface carries the SSH session)
+        :param check_interface: interface holding the impairment, the ifb device for incoming traffic
+        :param ifb_interface: ifb device used for incoming traffic, also removed by the revert job
+        """
+        self.node_ip = node_ip
+        self.interface = interface
+        self.des_cmd = des_cmd
+        self.expected_result = expected_result
+        self.check_interface = check_interface or interface
+        self.ifb_interface = ifb_interface
+        self.revert_delay = revert_delay
+        self.rev_cmd = None
+        # Set once the revert job is scheduled, only then the fault may have been injected
+        self.scheduled = False
+
+    def __repr__(self):
+        return "Fault(node_ip=%s, interface=%s)" % (self.node_ip, self.interface)
+
+
+def get_outgoing_faults(nodes, template, value, expected_result, cuts_mgmt=True):
+    """
+    One fault per node on its outgoing data interface.
+    :param nodes: node details (v2pc.get_app_worker_nodes)
+    :param template: DestructiveTesting command template, formatted with the interface and the value
+    :param cuts_mgmt: whether the impairment cuts the SSH access when the data interface is the management one,
+    the fault is then left unverified and reverted by its scheduled job only. False for impairments the SSH
+    session survives (latency)
+    """
+    faults = []
+    for node in nodes:
+        interface = node[Interface.DATA_OUT]
+        des_cmd = destructive_utils.get_outgoing_tc_cmd(interface, template.format(interface, value))
+        if cuts_mgmt and interface == node[Interface.MGMT]:
+            faults.append(Fault(node[Component.IP], interface, des_cmd, revert_delay=MGMT_REVERT_DELAY))
+        else:
+            faults.append(Fault(node[Component.IP], interface, des_cmd, expected_result))
+    return faults
+
+
+def get_incoming_faults(nodes, template, value, expected_result, revert_delay=REVERT_DELAY):
+    """
+    One fault per data interface of every node on its incoming traffic, redirected to its own ifb device.
+    :param nodes: node details (v2pc_helper.get_cos_node_data)
+    :param template: DestructiveTesting command template, formatted with the ifb device and the value
+    """
+    faults = []
+    for node in nodes:
+        for interface in node[Interface.INTERFACES]:
+            ifb_interface = DestructiveTesting.IFB_INTERFACE + str(len(faults))
+            des_cmd = destructive_utils.get_incoming_tc_cmd(interface, template.format(ifb_interface, value),
+                                                            ifb_interface)
+            faults.append(Fault(node[Component.IP], interface, des_cmd, expected_result,
+                                check_interface=ifb_interface, ifb_interface=ifb_interface,
+                                revert_delay=revert_delay))
+    return faults
+
+
+class _Barrier(object):
+    """
+    Releases the waiting threads together once parties of them arrived, or all of them when aborted.
+    """
+
+    def __init__(self, parties):
+        self._parties = parties
+        self._arrived = 0
+        self._aborted = False
+        self._condition = threading.Condition()
+
+    def wait(self, timeout):
+        """
+        :return: True when every party arrived, False if the barrier was aborted or timed out
+        """
+        with self._condition:
+            self._arrived += 1
+            self._condition.notify_all()
+            deadline = time.time() + timeout
+            while self._arrived < self._parties and not self._aborted:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    self._aborted = True
+                    self._condition.notify_all()
+                    break
+                self._condition.wait(remaining)
+            return not self._aborted
+
+    def abort(self):
+        with self._condition:
+            self._aborted = True
+            self._condition.notify_all()
+
+
+class RevertRegistry(object):
+    """
+    Scheduled revert jobs by component, and the plans injected but not reverted yet.
+    """
+
+    def __init__(self):
+        self._job_ids = {}
+        self._plans = []
+        self._lock = threading.Lock()
+
+    def get_job_ids(self, component):
+        """
+        Scheduled revert jobs of the component, the dict the destructive utils keep them in.
+        """
+        with self._lock:
+            return self._job_ids.setdefault(component, {})
+
+    def register(self, plan):
+        with self._lock:
+            if plan not in self._plans:
+                self._plans.append(plan)
+
+    def unregister(self, plan):
+        with self._lock:
+            if plan in self._plans:
+                self._plans.remove(plan)
+
+    def revert_all(self):
+        """
+        Revert the plans still injected, most recent first.
+        :return: list of errors
+        """
+        with self._lock:
+            plans = list(reversed(self._plans))
+        errors = []
+        for plan in plans:
+            is_valid, error = plan.revert()
+            if not is_valid:
+                errors.append(error)
+        return errors
+
+
+_REGISTRY = RevertRegistry()
+
+
+def get_registry():
+    return _REGISTRY
+
+
+class FaultPlan(object):
+    """
+    Faults of one component injected and reverted together.
+    """
+
+    def __init__(self, component, username, faults, registry=None, client_factory=None, **ssh_kwargs):
+        """
+        :param username: configuration key of the SSH user, as expected by utils.get_ssh_client
+        :param client_factory: function(node_ip) -> client with the SSHClient exec_command API, replaces the pooled
+        SSH connections (e.g. framework.netns)
+        :param ssh_kwargs: extra arguments of utils.get_ssh_client, e.g. password
+        """
+        self.component = component
+        self.username = username
+        self.faults = list(faults)
+        self.registry = registry or get_registry()
+        self.job_ids = self.registry.get_job_ids(component)
+        self.skew = None
+        self._client_factory = client_factory
+        self._ssh_kwargs = ssh_kwargs
+        self._injected = False
+
+    def _get_nodes(self):
+        nodes = OrderedDict()
+        for fault in self.faults:
+            nodes.setdefault(fault.node_ip, []).append(fault)
+        return nodes
+
+    def _get_client(self, node_ip):
+        if self._client_factory:
+            return self._client_factory(node_ip)
+        return ssh.get_ssh_client(self.component, self.username, component_ip=node_ip, **self._ssh_kwargs)
+
+    def _run_concurrently(self, function, nodes):
+        pool = mp_pool.ThreadPool(processes=len(nodes))
+        try:
+            return pool.map(function, nodes.items())
+        finally:
+            pool.close()
+
+    def _inject_node(self, barrier, start_times, node):
+        node_ip, faults = node
+        try:
+            client = self._get_client(node_ip)
+            # Jobs scheduled by previous tests would revert this test's faults at random times
+            destructive_utils.delete_scheduled_job(self.component, client, node_ip, self.job_ids)
+            for fault in faults:
+                args = (fault.ifb_interface,) if fault.ifb_interface else ()
+                fault.rev_cmd = destructive_utils.schedule_rev_cmd(client, fault.interface, node_ip, self.job_ids,
+                                                                   fault.revert_delay, *args)
+                fault.scheduled = True
+        except Exception as e:
+            barrier.abort()
+            return "%s: unable to prepare the faults: %s" % (node_ip, e)
+
+        if not barrier.wait(PREPARE_TIMEOUT):
+            return "%s: injection abandoned, not every node got ready" % node_ip
+
+        start_times.append(time.time())
+        for fault in faults:
+            if fault.expected_result is None:
+                LOGGER.info("Executing the command=%s to cause destruction in the component", fault.des_cmd)
+                client.exec_command(fault.des_cmd)
+                continue
+            is_valid, error = destructive_utils.exec_des_cmd(client, fault.check_interface, fault.des_cmd,
+                                                             fault.expected_result)
+            if not is_valid:
+                return "%s: %s" % (node_ip, error)
+        return None
+
+    def inject(self):
+        """
+        Schedule the revert jobs, then inject every fault, all nodes at once.
+        :return: (is_valid, error)
+        """
+        nodes = self._get_nodes()
+        if not nodes:
+            return False, "No %s node to inject faults on" % self.component
+        barrier = _Barrier(len(nodes))
+        start_times = []
+        self.registry.register(self)
+        self._injected = True
+        errors = [error for error in self._run_concurrently(
+            lambda node: self._inject_node(barrier, start_times, node), nodes) if error]
+        if start_times:
+            self.skew = max(start_times) - min(start_times)
+            LOGGER.info("%d fault(s) injected on %d %s node(s), skew %.3f seconds", len(self.faults), len(nodes),
+                        self.component, self.skew)
+        if errors:
+            return False, "; ".join(errors)
+        return True, None
+
+    def _revert_node(self, node):
+        node_ip, faults = node
+        # The faults of a node that failed its preparation were never injected
+        faults = [fault for fault in faults if fault.scheduled]
+        if not faults:
+            return None
+        try:
+            client = self._get_client(node_ip)
+            for fault in faults:
+                if fault.expected_result is None or not fault.rev_cmd:
+                    # Reverted by the scheduled job only, check it ran
+                    is_valid, error = destructive_utils.is_rev_effective(client, fault.interface)
+                else:
+                    is_valid, error = destructive_utils.exec_rev_cmd(self.component, client, node_ip, fault.rev_cmd,
+                                                                     fault.interface, self.job_ids)
+                if not is_valid:
+                    return "%s: %s" % (node_ip, error)
+                fault.scheduled = False
+        except Exception as e:
+            return "%s: unable to revert the faults: %s" % (node_ip, e)
+        return None
+
+    def revert(self):
+        """
+        Undo every fault, all nodes at once. Does nothing if the plan is not injected.
+        :return: (is_valid, error)
+        """
+        if not self._injected:
+            return True, None
+        errors = [error for error in self._run_concurrently(self._revert_node, self._get_nodes()) if error]
+        if errors:
+            return False, "; ".join(errors)
+        self._injected = False
+        self.registry.unregister(self)
+        LOGGER.info("%d fault(s) reverted on %s", len(self.faults), self.component)
+        return True, None
@@ -0,0 +1,49 @@
+"""
+Lock shared by the processes of a run.
+
+Every xdist worker is a process of its own, so a threading.Lock only serializes the threads of one worker.
+The files the workers share in the temp directory (health snapshot, default manifest agent configuration) are
+read, updated and written under an exclusive flock of a lock file next to them instead.
+"""
+import fcntl
+import os
+import threading
+
+
+class FileLock(object):
+    """
+    Exclusive lock held by one thread of one process at a time, as a context manager.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def __enter__(self):
+        self._lock.acquire()
+        try:
+            directory = os.path.dirname(self.path)
+            if not os.path.isdir(directory):
+                try:
+                    os.makedirs(directory)
+                except OSError:
+                    # Created meanwhile by another worker
+                    pass
+            self._file = open(self.path, "a")
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        except Exception:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._lock.release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+        finally:
+            self._file = None
+            self._lock.release()
@@ -0,0 +1,288 @@
+"""
+Health of the DP components, probed concurrently.
+
+Each component (VMR pods, MCE, MPE, COS CLM, CMC, MemSQL) has a probe returning (is_valid, error). The probes
+run at the same time, each bounded by its own timeout, so a health check lasts as long as the slowest probe
+instead of the sum of all of them. The resulting HealthSnapshot is cached, in memory and in the temp directory
+so every xdist worker shares it, and reused by whoever asks within SNAPSHOT_TTL. The workers probe under a
+lock of the snapshot file, so the first one probes and the others reuse its snapshot. The master removes the
+snapshot of a previous run when the session starts (reset).
+"""
+import json
+import logging
+import multiprocessing.pool as mp_pool
+import os
+import time
+
+import framework.file_lock as file_lock
+import framework.kube as kube
+import framework.ssh as ssh
+import helpers.utils as utils
+
+from helpers.constants import Component
+from helpers.constants import TestDirectory
+from helpers.constants import TestLog
+
+LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
+
+PROBE_TIMEOUT = 60
+SNAPSHOT_TTL = 5 * 60
+SNAPSHOT_FILE = "health_snapshot.json"
+LOCK_EXTENSION = ".lock"
+POD_HEALTHY_PHASES = ("Succeeded", "Running")
+VMR_MANDATORY_PODS = ('a8-updater', 'archive-agent', 'api', 'dash-origin', 'health-agent', 'health-monitor',
+                      'manifest-agent', 'nsa', 'reconstitution-agent', 'recorder-manager', 'segment-recorder', 'ui',
+                      'zookeeper', 'bmw', 'sats-server')
+MPE_MANDATORY_PODS = ('mpe',)
+
+_SNAPSHOT = None
+_SNAPSHOT_LOCK = None
+
+
+class ProbeResult(object):
+    """
+    Outcome of one probe.
+    """
+    __slots__ = ("name", "healthy", "error", "duration")
+
+    def __init__(self, name, healthy, error=None, duration=0.0):
+        self.name = name
+        self.healthy = healthy
+        self.error = error
+        self.duration = duration
+
+    def to_dict(self):
+        return {"name": self.name, "healthy": self.healthy, "error": self.error, "duration": self.duration}
+
+    def __repr__(self):
+        return "ProbeResult(name=%s, healthy=%s)" % (self.name, self.healthy)
+
+
+class HealthSnapshot(object):
+    """
+    Results of a round of probes, by probe name.
+    """
+
+    def __init__(self, results, taken_at=None):
+        self.results = dict((result.name, result) for result in results)
+        self.taken_at = time.time() if taken_at is None else taken_at
+
+    def __getitem__(self, name):
+        return self.results[name]
+
+    def get_age(self):
+        return time.time() - self.taken_at
+
+    def is_healthy(self, names=None):
+        return all(self.results[name].healthy for name in (names or self.results))
+
+    def get_errors(self, names=None):
+        return ["%s: %s" % (name, self.results[name].error) for name in sorted(names or self.results)
+                if not self.results[name].healthy]
+
+    def to_dict(self):
+        return {"taken_at": self.taken_at, "results": [result.to_dict() for result in self.results.values()]}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls([ProbeResult(**result) for result in data["results"]], data["taken_at"])
+
+
+def _check_pods(namespace, mandatory_pods):
+    pod_names = []
+    for pod in kube.get_pods(namespace).items:
+        pod_names.append(pod.metadata.name)
+        LOGGER.debug("%s\t%s\t%s", pod.status.pod_ip, pod.metadata.name, pod.status.phase)
+        if pod.status.phase not in POD_HEALTHY_PHASES:
+            return False, "Pod %s is in %s state" % (pod.metadata.name, pod.status.phase)
+
+    unavailable_pods = [pod for pod in mandatory_pods if not any(pod in name for name in pod_names)]
+    if unavailable_pods:
+        return False, "Following pods are unavailable: %s" % ",".join(unavailable_pods)
+    return True, None
+
+
+def _check_services_running(client, command):
+    """
+    Check the status listing of mce-app, every service but asperacentral is expected RUNNING.
+    """
+    exit_code, output = ssh.run(client, command)
+    for line in output.splitlines():
+        LOGGER.debug(line)
+        each_service = line.split()
+        if len(each_service) > 2 and each_service[0] != 'asperacentral' and each_service[1] != 'RUNNING':
+            return False, "%s service is in %s state" % (each_service[0], each_service[1])
+    return True, None
+
+
+def _check_output(client, command, expected, error, get_pty=True):
+    exit_code, output = ssh.run(client, command, get_pty=get_pty)
+    LOGGER.debug(output)
+    if expected not in output:
+        return False, error
+    return True, None
+
+
+def probe_vmr():
+    return _check_pods(Component.VMR, VMR_MANDATORY_PODS)
+
+
+def probe_mce():
+    mce_config = utils.get_spec_config(Component.MCE)
+    mce_username = mce_config[Component.MCE_USERNAME]
+    command = "/sbin/service mce-app status"
+    if utils.is_standalone(Component.MCE):
+        client = ssh.get_custom_ssh_client(ip=mce_config['node1']['ip'], username=mce_username,
+                                           key_path=mce_config['sshkey'])
+        is_valid, error = _check_services_running(client, command)
+        if not is_valid:
+            return False, error
+    if utils.is_v2pc(Component.MCE):
+        return _check_services_running(ssh.get_ssh_client(Component.MCE, mce_username), command)
+    return True, None
+
+
+def probe_mpe():
+    mpe_config = utils.get_spec_config(Component.MPE)
+    if utils.is_standalone(Component.MPE):
+        is_valid, error = _check_pods(mpe_config[Component.NAMESPACE], MPE_MANDATORY_PODS)
+        if not is_valid:
+            return False, error
+    if utils.is_v2pc(Component.MPE):
+        client = ssh.get_custom_ssh_client(mpe_config['node1'][Component.IP],
+                                           username=mpe_config[Component.MPE_USERNAME],
+                                           key_path=mpe_config[Component.SSH_KEY])
+        exit_code, output = ssh.run(client, "systemctl status mpe.service")
+        LOGGER.debug(output)
+        if 'active' not in output or 'running' not in output:
+            return False, "MPE service is not up and running"
+    return True, None
+
+
+def probe_cos():
+    cos_config = utils.get_spec_config(Component.COS)
+    client = ssh.get_custom_ssh_client(ip=cos_config['node1']['ip'], username=cos_config['user'],
+                                       password=cos_config['pass'])
+    return _check_output(client, "/sbin/service clm status", 'passing', "COS CLM service is not up and running")
+
+
+def probe_cmc():
+    cmc_config = utils.get_spec_config(Component.CMC)
+    client = ssh.get_custom_ssh_client(ip=cmc_config['ip'], username=cmc_config['user'],
+                                       password=cmc_config['pass'])
+    return _check_output(client, "/sbin/service cmc_aicc status", 'cmc_aicc is running',
+                         "CMC_AICC service is not up and running")
+
+
+def probe_memsql():
+    memsql_config = utils.get_configInfo()[Component.MEMSQL]
+    client = ssh.get_custom_ssh_client(ip=memsql_config['ip'], username=memsql_config['user'],
+                                       password=memsql_config['pass'])
+    return _check_output(client, "memsql-ops status", 'MemSQL Ops is running', "MEMSQL-OPS is not up and running")
+
+
+# name -> (probe, timeout in seconds)
+PROBES = {
+    Component.VMR: (probe_vmr, PROBE_TIMEOUT),
+    Component.MCE: (probe_mce, PROBE_TIMEOUT),
+    Component.MPE: (probe_mpe, PROBE_TIMEOUT),
+    Component.COS: (probe_cos, PROBE_TIMEOUT),
+    Component.CMC: (probe_cmc, PROBE_TIMEOUT),
+    Component.MEMSQL: (probe_memsql, PROBE_TIMEOUT),
+}
+
+
+def _run_probe(name, probe):
+    start = time.time()
+    try:
+        is_valid, error = probe()
+    except Exception as e:
+        is_valid, error = False, "%s: %s" % (e.__class__.__name__, e)
+    return ProbeResult(name, is_valid, error, round(time.time() - start, 3))
+
+
+def run_probes(probes=None):
+    """
+    Run the probes concurrently.
+    :param probes: dict of name -> (probe, timeout), PROBES by default
+    :return: HealthSnapshot
+    """
+    probes = probes or PROBES
+    pool = mp_pool.ThreadPool(processes=len(probes))
+    try:
+        start = time.time()
+        pending = [(name, timeout, pool.apply_async(_run_probe, (name, probe)))
+                   for name, (probe, timeout) in probes.items()]
+        results = []
+        for name, timeout, async_result in pending:
+            try:
+                results.append(async_result.get(max(start + timeout - time.time(), 0)))
+            except mp_pool.TimeoutError:
+                results.append(ProbeResult(name, False, "No answer after %s seconds" % timeout, timeout))
+    finally:
+        # Probes still running past their timeout are abandoned, not waited for
+        pool.close()
+
+    snapshot = HealthSnapshot(results)
+    LOGGER.info("Health probes done in %.1f seconds: %s", time.time() - start,
+                ", ".join("%s=%s" % (result.name, "ok" if result.healthy else "KO") for result in results))
+    return snapshot
+
+
+def _get_snapshot_file():
+    return os.path.join(utils.get_base_dir_path(), TestDirectory.TEMP_DIR, SNAPSHOT_FILE)
+
+
+def _get_snapshot_lock():
+    global _SNAPSHOT_LOCK
+    if _SNAPSHOT_LOCK is None:
+        _SNAPSHOT_LOCK = file_lock.FileLock(_get_snapshot_file() + LOCK_EXTENSION)
+    return _SNAPSHOT_LOCK
+
+
+def _load_snapshot():
+    try:
+        with open(_get_snapshot_file()) as snapshot_file:
+            return HealthSnapshot.from_dict(json.load(snapshot_file))
+    except (IOError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _save_snapshot(snapshot):
+    try:
+        with open(_get_snapshot_file(), "w") as snapshot_file:
+            json.dump(snapshot.to_dict(), snapshot_file)
+    except IOError as e:
+        LOGGER.warning("Unable to save the health snapshot: %s", e)
+
+
+def get_snapshot(ttl=SNAPSHOT_TTL, refresh=False):
+    """
+    Health of the DP components, probed again only when the last snapshot is older than ttl seconds.
+    :param refresh: probe even if a recent snapshot exists
+    :return: HealthSnapshot
+    """
+    global _SNAPSHOT
+    with _get_snapshot_lock():
+        if not refresh:
+            for snapshot in (_SNAPSHOT, _load_snapshot()):
+                if snapshot is not None and snapshot.get_age() < ttl:
+                    LOGGER.debug("Health snapshot reused, %d seconds old", snapshot.get_age())
+                    _SNAPSHOT = snapshot
+                    return snapshot
+        _SNAPSHOT = run_probes()
+        _save_snapshot(_SNAPSHOT)
+        return _SNAPSHOT
+
+
+def reset():
+    """
+    Forget the snapshot of a previous run.
+    """
+    global _SNAPSHOT
+    with _get_snapshot_lock():
+        _SNAPSHOT = None
+        try:
+            os.unlink(_get_snapshot_file())
+        except OSError:
+            pass
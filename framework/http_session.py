@@ -0,0 +1,148 @@
+"""
+Shared keep-alive HTTP session for the control plane APIs (A8, RIO, NSA, V2PC).
+
+The lab helpers issue module level requests calls (requests.get, requests.post, ...), each creating a
+throw-away session and paying a new TCP/TLS handshake. install() routes those calls through one pooled
+session, so connections to each host are reused, and records the latency of every call.
+"""
+import cookielib
+import logging
+import os
+import threading
+import urlparse
+from collections import OrderedDict
+
+import requests
+import requests.api
+from requests.adapters import HTTPAdapter
+
+from helpers.constants import TestLog
+
+LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
+
+# Number of hosts whose connection pool is kept, and connections kept per host. The bulk tests run up to
+# 20 concurrent requests (recording pools of 20), so this keeps every one of them on a warm connection.
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 20
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+_ORIGINAL_REQUEST = requests.api.request
+# Last exchange made on behalf of the running test, whichever thread made it: the calls of a test mostly run in
+# thread pools. Reset as every test starts, background threads (watchers) leave their exchanges out of it
+_LAST_EXCHANGE = None
+_UNTRACKED = threading.local()
+
+
+class LatencyStats(object):
+    """
+    Thread safe latency book-keeping per method and host.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = OrderedDict()
+
+    def record(self, method, host, elapsed):
+        with self._lock:
+            stat = self._stats.setdefault((method, host), {"count": 0, "total": 0.0, "max": 0.0})
+            stat["count"] += 1
+            stat["total"] += elapsed
+            stat["max"] = max(stat["max"], elapsed)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def summary(self):
+        """
+        :return: list of dicts with method, host, count, average and max latency in seconds
+        """
+        with self._lock:
+            return [{"method": method, "host": host, "count": stat["count"],
+                     "avg": round(stat["total"] / stat["count"], 4), "max": round(stat["max"], 4)}
+                    for (method, host), stat in self._stats.items()]
+
+
+LATENCY = LatencyStats()
+
+
+def _record_latency(response, *args, **kwargs):
+    elapsed = response.elapsed.total_seconds()
+    request = response.request
+    LATENCY.record(request.method, urlparse.urlparse(request.url).netloc, elapsed)
+    if not getattr(_UNTRACKED, "value", False):
+        global _LAST_EXCHANGE
+        _LAST_EXCHANGE = (request.method, request.url, response.status_code, elapsed)
+    return response
+
+
+def get_session():
+    """
+    The pooled session shared by every thread of the process.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            # The one-off calls being replaced never carried cookies from one request to the next
+            session.cookies.set_policy(cookielib.DefaultCookiePolicy(allowed_domains=[]))
+            session.hooks["response"].append(_record_latency)
+            _SESSION = session
+        return _SESSION
+
+
+def request(method, url, **kwargs):
+    """
+    Same contract as requests.request, served by the pooled session.
+    """
+    return get_session().request(method=method, url=url, **kwargs)
+
+
+def get_last_exchange():
+    """
+    Last HTTP exchange made for the running test, from any thread but the untracked ones.
+    :return: (method, url, status code, elapsed seconds) or None
+    """
+    return _LAST_EXCHANGE
+
+
+def reset_last_exchange():
+    """
+    Forget the last exchange, as a test starts.
+    """
+    global _LAST_EXCHANGE
+    _LAST_EXCHANGE = None
+
+
+def untrack_thread():
+    """
+    Leave the exchanges of the calling thread out of get_last_exchange, for the background threads whose
+    requests are not made on behalf of the running test (e.g. the first segment watcher of framework.recovery).
+    """
+    _UNTRACKED.value = True
+
+
+def install():
+    """
+    Route the module level requests API (requests.get, requests.post, ...) through the pooled session.
+    """
+    requests.api.request = request
+    LOGGER.debug("Pooled HTTP session installed (%d hosts x %d connections)", POOL_CONNECTIONS, POOL_MAXSIZE)
+
+
+def uninstall():
+    global _SESSION
+    requests.api.request = _ORIGINAL_REQUEST
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+            _SESSION = None
+
+
+def log_latency_summary():
+    for stat in LATENCY.summary():
+        LOGGER.info("HTTP %(method)s %(host)s: calls=%(count)d avg=%(avg)ss max=%(max)ss", stat)
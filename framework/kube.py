@@ -0,0 +1,267 @@
+"""
+Direct access to the VMR kubernetes cluster.
+
+The kube config is loaded once by the session setup (tests/conftest.py), the API clients built on it are
+cached here and shared by every caller. Waits are driven by watch events instead of periodic polling.
+"""
+import logging
+import os
+import threading
+
+import yaml
+from kubernetes import client
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+
+import framework.clock as clock
+
+from helpers.constants import TestLog
+
+LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
+
+POD_READY_TIMEOUT = 600
+# Status of a watch resumed from a resource version the API server no longer keeps
+GONE = 410
+
+_CORE_V1 = None
+_APPS_V1 = None
+_LOCK = threading.Lock()
+
+
+def get_core_v1():
+    """
+    CoreV1Api shared by the process.
+    """
+    global _CORE_V1
+    with _LOCK:
+        if _CORE_V1 is None:
+            _CORE_V1 = client.CoreV1Api()
+        return _CORE_V1
+
+
+def get_apps_v1():
+    """
+    AppsV1Api shared by the process.
+    """
+    global _APPS_V1
+    with _LOCK:
+        if _APPS_V1 is None:
+            _APPS_V1 = client.AppsV1Api()
+        return _APPS_V1
+
+
+def read_config_map(name, namespace):
+    """
+    :return: data of the config map, dict of key -> raw string value
+    """
+    return dict(get_core_v1().read_namespaced_config_map(name, namespace).data or {})
+
+
+def parse_config_data(data):
+    """
+    Parse the values of config map data, YAML (or JSON) documents where possible, so they can be compared
+    structurally rather than as text.
+    """
+    parsed = {}
+    for key, value in data.items():
+        try:
+            parsed[key] = yaml.safe_load(value)
+        except yaml.YAMLError:
+            parsed[key] = value
+    return parsed
+
+
+def diff(current, desired, path=()):
+    """
+    Structural difference between two parsed documents.
+    :return: list of (path, current value, desired value), empty when they are equal
+    """
+    if isinstance(current, dict) and isinstance(desired, dict):
+        changes = []
+        for key in sorted(set(current) | set(desired)):
+            changes.extend(diff(current.get(key), desired.get(key), path + (key,)))
+        return changes
+    if isinstance(current, list) and isinstance(desired, list) and len(current) == len(desired):
+        changes = []
+        for index, (current_item, desired_item) in enumerate(zip(current, desired)):
+            changes.extend(diff(current_item, desired_item, path + (index,)))
+        return changes
+    return [] if current == desired else [(path, current, desired)]
+
+
+def is_pod_ready(pod):
+    if pod.metadata.deletion_timestamp or not pod.status or not pod.status.conditions:
+        return False
+    return any(condition.type == "Ready" and condition.status == "True" for condition in pod.status.conditions)
+
+
+def get_pods(namespace):
+    """
+    Pods of the namespace, in place of vmr_helper.get_pod_details which shells out to oc.
+    :return: V1PodList
+    """
+    return get_core_v1().list_namespaced_pod(namespace)
+
+
+def list_pods(namespace, name_prefix):
+    return [pod for pod in get_pods(namespace).items if pod.metadata.name.startswith(name_prefix)]
+
+
+def _is_gone(event):
+    """
+    Whether a watch event reports an expired resource version (410 Gone), as an ERROR event carrying a Status.
+    """
+    if event["type"] != "ERROR":
+        return False
+    status = event.get("raw_object") or event["object"]
+    code = status.get("code") if isinstance(status, dict) else getattr(status, "code", None)
+    return code == GONE
+
+
+def _watch_pods(namespace, pod_list, on_event, deadline):
+    """
+    Feed the pod events of the namespace to on_event until it returns True or the deadline passes.
+    :param pod_list: V1PodList the watch starts from, the state on_event was initialized with
+    :return: True if on_event returned True
+    """
+    core_v1 = get_core_v1()
+    pods = dict((pod.metadata.uid, pod) for pod in pod_list.items)
+    resource_version = pod_list.metadata.resource_version
+    pod_watch = watch.Watch()
+    try:
+        # The stream ends on its server side timeout, it is then resumed from the last event seen
+        while clock.now() < deadline:
+            expired = False
+            try:
+                for event in pod_watch.stream(core_v1.list_namespaced_pod, namespace,
+                                              resource_version=resource_version,
+                                              timeout_seconds=max(int(deadline - clock.now()), 1)):
+                    if _is_gone(event):
+                        expired = True
+                        break
+                    if event["type"] == "ERROR":
+                        continue
+                    pod = event["object"]
+                    resource_version = pod.metadata.resource_version
+                    if event["type"] == "DELETED":
+                        pods.pop(pod.metadata.uid, None)
+                    else:
+                        pods[pod.metadata.uid] = pod
+                    if on_event(event["type"], pod):
+                        return True
+            except ApiException as e:
+                if e.status != GONE:
+                    raise
+                expired = True
+            if not expired:
+                continue
+
+            # The last resource version seen is too old to resume from (long restarts): the pods are listed
+            # again and the changes missed meanwhile are replayed as events before watching from the new list
+            LOGGER.debug("Pod watch of %s expired at resource version %s, listing the pods again", namespace,
+                         resource_version)
+            pod_list = get_pods(namespace)
+            resource_version = pod_list.metadata.resource_version
+            listed = dict((pod.metadata.uid, pod) for pod in pod_list.items)
+            events = [("DELETED", pod) for uid, pod in pods.items() if uid not in listed]
+            events.extend(("MODIFIED" if uid in pods else "ADDED", pod) for uid, pod in listed.items())
+            pods = listed
+            done = False
+            for event_type, pod in events:
+                done = on_event(event_type, pod) or done
+            if done:
+                return True
+    finally:
+        pod_watch.stop()
+    return False
+
+
+def wait_for_pods_ready(namespace, name_prefix, count, excluded_uids=(), timeout=POD_READY_TIMEOUT):
+    """
+    Wait on pod events until count pods whose name starts with name_prefix are ready.
+    :param excluded_uids: uids of pods not to count, e.g. the pods being replaced (names can be reused, uids not)
+    :return: (is_valid, error)
+    """
+    pod_list = get_pods(namespace)
+    ready = set(pod.metadata.uid for pod in pod_list.items
+                if pod.metadata.name.startswith(name_prefix) and pod.metadata.uid not in excluded_uids and
+                is_pod_ready(pod))
+    if len(ready) >= count:
+        return True, None
+
+    def on_event(event_type, pod):
+        if not pod.metadata.name.startswith(name_prefix) or pod.metadata.uid in excluded_uids:
+            return False
+        if event_type != "DELETED" and is_pod_ready(pod):
+            ready.add(pod.metadata.uid)
+        else:
+            ready.discard(pod.metadata.uid)
+        return len(ready) >= count
+
+    if _watch_pods(namespace, pod_list, on_event, clock.now() + timeout):
+        LOGGER.debug("%d %s pod(s) ready", len(ready), name_prefix)
+        return True, None
+    return False, "%d of %d %s pod(s) ready after %s seconds" % (len(ready), count, name_prefix, timeout)
+
+
+def restart_pods(name_prefix, namespace, timeout=POD_READY_TIMEOUT, timeline=None):
+    """
+    Delete the pods whose name starts with name_prefix and wait until they are gone and as many replacements
+    are ready, in place of vmr_helper.delete_vmr_pods. Deletions and Ready transitions are followed on a single
+    watch stream.
+    :param timeline: optional recorder whose mark(event) is called on "restart" (deletion requested), "deleted"
+    (last old pod gone), "scheduled" (first replacement bound to a node) and "ready" (all replacements ready)
+    :return: (is_valid, error)
+    """
+    mark = timeline.mark if timeline is not None else lambda event: None
+    core_v1 = get_core_v1()
+    old_pods = list_pods(namespace, name_prefix)
+    if not old_pods:
+        return False, "No %s pod found in namespace %s" % (name_prefix, namespace)
+
+    old_uids = set(pod.metadata.uid for pod in old_pods)
+    mark("restart")
+    for pod in old_pods:
+        try:
+            core_v1.delete_namespaced_pod(pod.metadata.name, namespace, client.V1DeleteOptions())
+        except ApiException as e:
+            if e.status != 404:
+                return False, "Unable to delete pod %s: %s" % (pod.metadata.name, e.reason)
+    LOGGER.info("%d %s pod(s) deleted", len(old_pods), name_prefix)
+
+    # Listed after the deletions, so that no event of the restart is missed by the watch started from it
+    pod_list = get_pods(namespace)
+    deleting = set(pod.metadata.uid for pod in pod_list.items if pod.metadata.uid in old_uids)
+    ready = set(pod.metadata.uid for pod in pod_list.items
+                if pod.metadata.name.startswith(name_prefix) and pod.metadata.uid not in old_uids and
+                is_pod_ready(pod))
+    if any(pod.metadata.uid not in old_uids and pod.metadata.name.startswith(name_prefix) and pod.spec.node_name
+           for pod in pod_list.items):
+        mark("scheduled")
+
+    def is_restarted():
+        if not deleting:
+            mark("deleted")
+        if len(ready) >= len(old_uids):
+            mark("ready")
+        return not deleting and len(ready) >= len(old_uids)
+
+    def on_event(event_type, pod):
+        uid = pod.metadata.uid
+        if uid in old_uids:
+            if event_type == "DELETED":
+                deleting.discard(uid)
+        elif pod.metadata.name.startswith(name_prefix):
+            if pod.spec.node_name:
+                mark("scheduled")
+            if event_type != "DELETED" and is_pod_ready(pod):
+                ready.add(uid)
+            else:
+                ready.discard(uid)
+        return is_restarted()
+
+    if is_restarted() or _watch_pods(namespace, pod_list, on_event, clock.now() + timeout):
+        LOGGER.info("%d %s pod(s) restarted", len(ready), name_prefix)
+        return True, None
+    return False, "%s restart not complete after %s seconds: %d pod(s) still terminating, %d of %d ready" % (
+        name_prefix, timeout, len(deleting), len(ready), len(old_uids))
@@ -0,0 +1,180 @@
+"""
+Incremental compression of the per stream logs.
+
+The worker logs (output/<stream>.log) grow for the whole run, hours for the longevity suites, and used to be
+handled only once the session was over. The LogArchiver compresses them while the run goes on: every time a log
+grew by CHUNK_SIZE, a background thread appends the new complete lines to <stream>.log.gz as a new gzip member
+(gzip, zcat and the gzip module read the members back as one stream). The banner lines written around every test
+by pytest_runtest_setup and pytest_runtest_teardown (printed and logged, so repeated) are stored once, and the
+blank lines padding them dropped; any other blank line, in a traceback or a pretty printed value, is kept. At the
+end of the session only the tail written since the last chunk is left to compress, so finish() lasts about the
+same whatever the length of the run. remove_logs() then removes the raw logs, so that test_teardown.archive_logs()
+collects the compressed logs only.
+"""
+import gzip
+import logging
+import os
+import re
+import threading
+
+from helpers.constants import TestLog
+
+LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
+
+CHUNK_SIZE = 4 * 1024 * 1024
+CHECK_INTERVAL = 30
+COMPRESS_LEVEL = 6
+ARCHIVE_SUFFIX = ".gz"
+# Kind and test name of a banner, whatever the timestamp and log prefix in front of it
+_BANNER = re.compile(r"#{30} (STARTED|ENDED|SKIPPED) :\s+(\S+)")
+
+
+class _LogFile(object):
+    """
+    Compression state of one log: offset archived so far and (kind, test name) of the last banner seen.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.archive_path = path + ARCHIVE_SUFFIX
+        self.offset = 0
+        self.last_banner = None
+        # Blank lines held back until the next line tells whether they pad a banner
+        self.blank_lines = []
+        self.after_banner = False
+        self.read_bytes = 0
+        self.written_lines = 0
+        self.dropped_lines = 0
+
+    def get_pending(self):
+        try:
+            return os.path.getsize(self.path) - self.offset
+        except OSError:
+            return 0
+
+    def _drop_blank_lines(self):
+        self.dropped_lines += len(self.blank_lines)
+        self.blank_lines = []
+
+    def _filter(self, lines, last=False):
+        """
+        Drop the repeated banners and the blank lines next to a banner, any other blank line is kept.
+        :param last: no line follows, the blank lines held back are written unless they follow a banner
+        """
+        kept = []
+        for line in lines:
+            if not line.strip():
+                self.blank_lines.append(line)
+                continue
+            banner = _BANNER.search(line)
+            if banner:
+                self._drop_blank_lines()
+                self.after_banner = True
+                if banner.groups() == self.last_banner:
+                    self.dropped_lines += 1
+                    continue
+                self.last_banner = banner.groups()
+            else:
+                if self.after_banner:
+                    self._drop_blank_lines()
+                kept.extend(self.blank_lines)
+                self.blank_lines = []
+                self.after_banner = False
+            kept.append(line)
+        if last:
+            if self.after_banner:
+                self._drop_blank_lines()
+            kept.extend(self.blank_lines)
+            self.blank_lines = []
+        self.written_lines += len(kept)
+        return kept
+
+    def archive(self, complete_lines_only=True):
+        """
+        Compress what was written since the last call into a new member of the archive.
+        :param complete_lines_only: leave a trailing partial line for the next call
+        """
+        data = ""
+        if self.get_pending() > 0:
+            with open(self.path, "rb") as log_file:
+                log_file.seek(self.offset)
+                data = log_file.read()
+            if complete_lines_only:
+                data = data[:data.rfind("\n") + 1]
+        self.offset += len(data)
+        self.read_bytes += len(data)
+        lines = self._filter(data.splitlines(True), last=not complete_lines_only)
+        if not lines:
+            return
+        with open(self.archive_path, "ab") as archive_file:
+            member = gzip.GzipFile(filename=os.path.basename(self.path), mode="wb", compresslevel=COMPRESS_LEVEL,
+                                   fileobj=archive_file)
+            member.writelines(lines)
+            member.close()
+            archive_file.flush()
+            os.fsync(archive_file.fileno())
+
+
+class LogArchiver(object):
+    """
+    Background compression of a set of growing logs.
+    """
+
+    def __init__(self, paths, chunk_size=CHUNK_SIZE, interval=CHECK_INTERVAL):
+        """
+        :param paths: logs to compress, they do not have to exist yet
+        """
+        self.chunk_size = chunk_size
+        self.interval = interval
+        self._logs = []
+        for path in paths:
+            log = _LogFile(path)
+            # A previous run's archive of the same stream is replaced
+            if os.path.isfile(log.archive_path):
+                os.unlink(log.archive_path)
+            self._logs.append(log)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="log-archiver")
+        self._thread.daemon = True
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            for log in self._logs:
+                if log.get_pending() >= self.chunk_size:
+                    try:
+                        log.archive()
+                    except (IOError, OSError) as e:
+                        LOGGER.warning("Unable to compress %s: %s", log.path, e)
+
+    def finish(self):
+        """
+        Compress the tail of every log. The raw logs are left in place.
+        """
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        for log in self._logs:
+            if not os.path.isfile(log.path):
+                continue
+            try:
+                log.archive(complete_lines_only=False)
+            except (IOError, OSError) as e:
+                LOGGER.warning("Unable to compress %s, kept as is: %s", log.path, e)
+                continue
+            LOGGER.info("%s compressed to %s: %d bytes read, %d line(s) kept, %d banner/blank line(s) dropped",
+                        log.path, log.archive_path, log.read_bytes, log.written_lines, log.dropped_lines)
+
+    def remove_logs(self):
+        """
+        Remove the raw logs compressed by finish(), a log that could not be compressed is kept.
+        """
+        for log in self._logs:
+            if os.path.isfile(log.path) and os.path.isfile(log.archive_path) and log.get_pending() <= 0:
+                try:
+                    os.unlink(log.path)
+                except OSError as e:
+                    LOGGER.warning("Unable to remove %s: %s", log.path, e)
@@ -0,0 +1,180 @@
+"""
+Search of the VMR pod logs over a time window.
+
+vmr_helper.verify_error_logs_in_vmr fetches the logs of a component once per searched string, and the tests
+call it several times over the same window (ERROR in manifest-agent, ERROR in segment-recorder, discontinuity
+in manifest-agent). Here the logs of every pod of the component are streamed concurrently from the kubernetes
+API, limited server side to the window start (since_seconds) and cut client side at its end, into a LogWindow
+that matches any number of patterns in one pass over its lines. Windows are cached, and a window covering the
+requested one is reused, so the checks of a test over the same interval cost one fetch per component.
+"""
+import datetime
+import logging
+import multiprocessing.pool as mp_pool
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import framework.kube as kube
+
+from helpers.constants import TestLog
+from helpers.constants import TimeFormat
+
+LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
+
+# Extra history requested before the window start, for the clock skew between the lab and the cluster
+SINCE_MARGIN = 60
+CACHE_SIZE = 16
+MAX_REPORTED_LINES = 5
+MAX_FETCH_THREADS = 8
+# Timestamps prefixed by the API to every line (timestamps=True), RFC3339 UTC
+_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+_TIMESTAMP_LENGTH = 19
+
+_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def _to_datetime(value):
+    """
+    :param value: UTC datetime, or string in TimeFormat.TIME_FORMAT_LOG as given to verify_error_logs_in_vmr
+    """
+    if isinstance(value, datetime.datetime):
+        return value
+    return datetime.datetime.strptime(str(value), TimeFormat.TIME_FORMAT_LOG)
+
+
+class LogWindow(object):
+    """
+    Log lines of the pods of a component between two UTC times, as (timestamp, pod name, text).
+    """
+
+    def __init__(self, namespace, name_prefix, start_time, end_time, lines):
+        self.namespace = namespace
+        self.name_prefix = name_prefix
+        self.start_time = start_time
+        self.end_time = end_time
+        self.lines = lines
+
+    def covers(self, namespace, name_prefix, start_time, end_time):
+        return (self.namespace == namespace and self.name_prefix == name_prefix and
+                self.start_time <= start_time and end_time <= self.end_time)
+
+    def slice(self, start_time, end_time):
+        return LogWindow(self.namespace, self.name_prefix, start_time, end_time,
+                         [line for line in self.lines if start_time <= line[0] <= end_time])
+
+    def search(self, patterns, contains=None):
+        """
+        Find the lines containing any of the patterns, in a single pass.
+        :param patterns: literal strings
+        :param contains: only consider the lines containing this string too, if given
+        :return: OrderedDict of pattern -> list of (pod name, text)
+        """
+        matches = OrderedDict((pattern, []) for pattern in patterns)
+        if not patterns:
+            return matches
+        any_pattern = re.compile("|".join(re.escape(pattern) for pattern in patterns))
+        for _, pod_name, text in self.lines:
+            if not any_pattern.search(text) or (contains and contains not in text):
+                continue
+            for pattern in patterns:
+                if pattern in text:
+                    matches[pattern].append((pod_name, text))
+        return matches
+
+
+def _read_pod_log(namespace, pod_name, container, since_seconds, start_time, end_time):
+    lines = []
+    response = kube.get_core_v1().read_namespaced_pod_log(pod_name, namespace, container=container,
+                                                          since_seconds=since_seconds, timestamps=True,
+                                                          _preload_content=False)
+    try:
+        for line in response:
+            timestamp, _, text = line.rstrip("\n").partition(" ")
+            try:
+                timestamp = datetime.datetime.strptime(timestamp[:_TIMESTAMP_LENGTH], _TIMESTAMP_FORMAT)
+            except ValueError:
+                continue
+            if timestamp > end_time:
+                # Lines come in time order, nothing further is in the window
+                break
+            if timestamp >= start_time:
+                lines.append((timestamp, pod_name, text))
+    finally:
+        response.release_conn()
+    return lines
+
+
+def fetch_window(name_prefix, namespace, start_time, end_time):
+    """
+    Stream the logs of every container of the pods whose name starts with name_prefix, all at once.
+    :return: LogWindow
+    """
+    start_time = _to_datetime(start_time).replace(microsecond=0)
+    end_time = _to_datetime(end_time)
+    since_seconds = int((datetime.datetime.utcnow() - start_time).total_seconds()) + SINCE_MARGIN
+    sources = [(pod.metadata.name, container.name) for pod in kube.list_pods(namespace, name_prefix)
+               for container in pod.spec.containers]
+    lines = []
+    if sources:
+        pool = mp_pool.ThreadPool(processes=min(len(sources), MAX_FETCH_THREADS))
+        try:
+            for pod_lines in pool.map(lambda source: _read_pod_log(namespace, source[0], source[1], since_seconds,
+                                                                   start_time, end_time), sources):
+                lines.extend(pod_lines)
+        finally:
+            pool.close()
+    lines.sort(key=lambda line: line[0])
+    LOGGER.debug("%d log line(s) of %d %s container(s) between %s and %s", len(lines), len(sources), name_prefix,
+                 start_time, end_time)
+    return LogWindow(namespace, name_prefix, start_time, end_time, lines)
+
+
+def get_window(name_prefix, namespace, start_time, end_time):
+    """
+    Log window served from the cache when a cached window covers it, fetched otherwise. Windows ending in the
+    future are still being written and are not cached.
+    :return: LogWindow
+    """
+    start_time = _to_datetime(start_time).replace(microsecond=0)
+    end_time = _to_datetime(end_time)
+    with _CACHE_LOCK:
+        for key, window in reversed(_CACHE.items()):
+            if window.covers(namespace, name_prefix, start_time, end_time):
+                _CACHE[key] = _CACHE.pop(key)
+                return window.slice(start_time, end_time)
+
+    window = fetch_window(name_prefix, namespace, start_time, end_time)
+    if end_time <= datetime.datetime.utcnow():
+        with _CACHE_LOCK:
+            _CACHE[(namespace, name_prefix, start_time, end_time)] = window
+            while len(_CACHE) > CACHE_SIZE:
+                _CACHE.popitem(last=False)
+    return window
+
+
+def clear_cache():
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
+def verify_no_logs(stream, name_prefix, namespace, patterns, start_time, end_time):
+    """
+    Check that no log line of the component mentioning stream contains one of the patterns, in place of
+    vmr_helper.verify_error_logs_in_vmr called once per pattern.
+    :param stream: stream id the lines must mention, None for every line
+    :param patterns: literal strings, e.g. ["ERROR", "discontinuity"]
+    :return: (is_valid, error)
+    """
+    window = get_window(name_prefix, namespace, start_time, end_time)
+    errors = []
+    for pattern, matches in window.search(patterns, contains=stream).items():
+        if matches:
+            errors.append("%d %s log line(s) with '%s', e.g. %s" % (
+                len(matches), name_prefix, pattern,
+                "; ".join("%s: %s" % match for match in matches[:MAX_REPORTED_LINES])))
+    if errors:
+        return False, "\n".join(errors)
+    return True, None
@@ -0,0 +1,274 @@
+"""
+Manifest agent configuration declared by the tests.
+
+A test needing a non default manifest agent configuration declares it with a marker instead of applying and
+reverting it itself:
+
+    @pytest.mark.manifest_config(batch_size='4')
+    def test_...(stream):
+
+Every apply or revert redeploys the manifest agent, which takes minutes. group_by_config orders the tests
+so the ones sharing a configuration run back to back, ManifestConfigState applies a configuration only when
+the live config map differs from it, and the default configuration is restored once, at the end of the session.
+"""
+import copy
+import json
+import logging
+import os
+from collections import OrderedDict
+
+import yaml
+from kubernetes.client.rest import ApiException
+
+import framework.file_lock as file_lock
+import framework.kube as kube
+import helpers.utils as utils
+
+from helpers.constants import Component
+from helpers.constants import TestDirectory
+from helpers.constants import TestLog
+from helpers.constants import V2pc
+from helpers.utils import cleanup
+from helpers.vmr.vmr_helper import redeploy_config_map
+from helpers.vmr.vmr_helper import v2pc_edit_manifest_config
+from helpers.vmr.vmr_helper import verify_batch_size_update
+
+LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
+
+MARKER = "manifest_config"
+DEFAULTS_FILE = "manifest_config_defaults.json"
+LOCK_EXTENSION = ".lock"
+DEFAULT = ()
+# Configuration left by a failed apply or a previous run, only a revert brings it back to a known state
+UNKNOWN = None
+
+
+def get_required_config(item):
+    """
+    Configuration declared by a test item.
+    :return: dict of v2pc_edit_manifest_config arguments, None when the test does not declare any
+    """
+    marker = item.get_closest_marker(MARKER)
+    return dict(marker.kwargs) if marker else None
+
+
+def get_config_key(settings):
+    return tuple(sorted(settings.items())) if settings else DEFAULT
+
+
+def group_by_config(items):
+    """
+    Reorder the items in place: the tests declaring a configuration are moved up to the first test declaring the
+    same one, so each group runs back to back where its first test was, and every other test keeps its place.
+    """
+    groups = OrderedDict()
+    slots = []
+    for item in items:
+        settings = get_required_config(item)
+        if settings is None:
+            slots.append([item])
+            continue
+        key = get_config_key(settings)
+        if key not in groups:
+            groups[key] = []
+            slots.append(groups[key])
+        groups[key].append(item)
+
+    if groups:
+        items[:] = [item for slot in slots for item in slot]
+        LOGGER.debug("%d manifest agent configuration(s) required: %s", len(groups), groups.keys())
+
+
+def _normalize_name(name):
+    return name.replace("_", "").replace("-", "").replace(".", "").lower()
+
+
+def _parse_value(value):
+    try:
+        return yaml.safe_load(str(value))
+    except yaml.YAMLError:
+        return value
+
+
+def find_setting_paths(data, name, path=()):
+    """
+    Paths of the values named after a setting in parsed config map data, whatever the case and separators of
+    the key (batch_size: batchSize, BATCH_SIZE, batch-size).
+    :return: list of paths, tuples of keys and indexes
+    """
+    paths = []
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if isinstance(key, basestring) and _normalize_name(key) == _normalize_name(name) and \
+                    not isinstance(value, (dict, list)):
+                paths.append(path + (key,))
+            else:
+                paths.extend(find_setting_paths(value, name, path + (key,)))
+    elif isinstance(data, list):
+        for index, value in enumerate(data):
+            paths.extend(find_setting_paths(value, name, path + (index,)))
+    return paths
+
+
+def get_expected_data(default, settings):
+    """
+    Config map data expected once a configuration is applied: the default data with the values of the settings.
+    :param default: parsed config map data of the default configuration
+    :param settings: dict of v2pc_edit_manifest_config arguments
+    :return: (expected data, names of the settings found nowhere in the default data)
+    """
+    expected = copy.deepcopy(default)
+    missing = []
+    for name, value in sorted((settings or {}).items()):
+        paths = find_setting_paths(expected, name)
+        if not paths:
+            missing.append(name)
+        for path in paths:
+            parent = expected
+            for key in path[:-1]:
+                parent = parent[key]
+            parent[path[-1]] = _parse_value(value)
+    return expected, missing
+
+
+class ManifestConfigState(object):
+    """
+    Configuration in place on the manifest agent, changed only when a test needs another one.
+
+    The live config map is read before every change and compared structurally with the data expected for the
+    target configuration, the default data with the declared settings in place: when nothing differs the redeploy
+    is skipped. The default data is read right after a revert and kept on disk, shared by the xdist workers, so a
+    lab left in a given configuration by a previous run is recognised too.
+    """
+
+    def __init__(self, service_name=V2pc.MANIFEST_AGENT, namespace=Component.VMR, config_map_name=None):
+        self.service_name = service_name
+        self.namespace = namespace
+        self.config_map_name = config_map_name or service_name
+        self.current = UNKNOWN
+        self.changed = False
+        self._defaults_file = os.path.join(utils.get_base_dir_path(), TestDirectory.TEMP_DIR, DEFAULTS_FILE)
+        self._lock = file_lock.FileLock(self._defaults_file + LOCK_EXTENSION)
+        self.default = self._load_defaults().get(self._get_config_map_id())
+
+    def _get_config_map_id(self):
+        return "%s/%s" % (self.namespace, self.config_map_name)
+
+    def _load_defaults(self):
+        try:
+            with open(self._defaults_file) as defaults_file:
+                return json.load(defaults_file)
+        except (IOError, ValueError):
+            return {}
+
+    def _save_default(self, live):
+        """
+        Record the default data of the config map, next to the ones of the other config maps.
+        """
+        self.default = live
+        try:
+            # Read again under the lock, another worker may have recorded another config map meanwhile
+            with self._lock:
+                defaults = self._load_defaults()
+                defaults[self._get_config_map_id()] = live
+                with open(self._defaults_file, "w") as defaults_file:
+                    json.dump(defaults, defaults_file, default=str)
+        except IOError as e:
+            LOGGER.warning("Unable to save the default manifest agent configuration: %s", e)
+
+    def _read_live(self):
+        try:
+            return kube.parse_config_data(kube.read_config_map(self.config_map_name, self.namespace))
+        except ApiException as e:
+            LOGGER.warning("Unable to read config map %s/%s: %s", self.namespace, self.config_map_name, e.reason)
+            return None
+
+    def _is_in_place(self, settings, live):
+        """
+        :return: True when the live data is the default data with the settings in place, False when it differs
+            or cannot be told (default data or setting unknown)
+        """
+        if live is None or self.default is None:
+            return False
+        expected, missing = get_expected_data(self.default, settings)
+        return not missing and not kube.diff(live, expected)
+
+    def _run_rollout(self, action, *args, **kwargs):
+        """
+        Run a helper redeploying the manifest agent and wait on pod events for its new pods to be ready.
+        """
+        old_pods = kube.list_pods(self.namespace, self.service_name)
+        is_valid, error = action(*args, **kwargs)
+        if not is_valid:
+            return False, error
+        return kube.wait_for_pods_ready(self.namespace, self.service_name, max(len(old_pods), 1),
+                                        excluded_uids=set(pod.metadata.uid for pod in old_pods))
+
+    def apply(self, settings):
+        """
+        Put the configuration in place, unless it already is.
+        :param settings: dict of v2pc_edit_manifest_config arguments, None or empty for the default configuration
+        :return: (is_valid, error)
+        """
+        key = get_config_key(settings)
+        if key == self.current:
+            return True, None
+
+        live = self._read_live()
+        if self._is_in_place(settings, live):
+            LOGGER.info("Manifest agent configuration %s already in place, redeploy skipped", key)
+            self.current = key
+            return True, None
+
+        LOGGER.info("Manifest agent configuration change: %s -> %s", self.current, key)
+        self.changed = True
+        self.current = UNKNOWN
+        if not self._is_in_place(None, live):
+            is_valid, error = self._run_rollout(cleanup, redeploy_config_map, self.service_name, revert=True)
+            if not is_valid:
+                return False, error
+            live = self._read_live()
+            if live is not None:
+                self._save_default(live)
+        self.current = DEFAULT
+        # The declared values may be the default ones
+        if not settings or self._is_in_place(settings, live):
+            self.current = key
+            return True, None
+
+        self.current = UNKNOWN
+        is_valid, error = self._run_rollout(v2pc_edit_manifest_config, self.service_name, **settings)
+        if not is_valid:
+            return False, error
+        live = self._read_live()
+        expected, missing = get_expected_data(self.default, settings) if self.default is not None else (None, ())
+        if missing:
+            LOGGER.warning("Settings %s not found in config map %s", ", ".join(missing), self.config_map_name)
+        if live is not None and expected is not None and not missing:
+            changes = kube.diff(live, expected)
+            if changes:
+                return False, "Manifest agent configuration %s not applied, config map %s differs: %s" % (
+                    key, self.config_map_name, changes)
+        elif "batch_size" in settings:
+            # Config map not readable or not understood, fall back to the check inside the pods
+            is_valid, error = verify_batch_size_update(self.service_name, self.namespace, settings["batch_size"])
+            if not is_valid:
+                return False, error
+        self.current = key
+        return True, None
+
+    def ensure_default(self):
+        """
+        Restore the default configuration if a declared one is in place.
+        """
+        if self.current not in (DEFAULT, UNKNOWN):
+            return self.apply(None)
+        return True, None
+
+    def revert(self):
+        """
+        Restore the default configuration if the session changed it.
+        """
+        if not self.changed or self.current == DEFAULT:
+            return True, None
+        return self.apply(None)
@@ -0,0 +1,295 @@
+"""
+Local network namespace harness for the destructive scenarios.
+
+Every simulated node is a Linux network namespace linked to the host by a veth pair, with the control plane
+simulator (framework.simulator) running inside as the service stand-in. NamespaceClient runs commands in a
+namespace behind the SSH client API, so the fault plans of framework.fault apply the very tc/netem/ifb commands
+the destructive utils generate for the lab nodes, and their impairment and revert pipeline can be validated
+and timed offline, in seconds:
+
+    sudo python -m framework.netns --nodes 3 --impairment loss
+
+atd runs the jobs it is given in the host namespace. The revert jobs the destructive utils schedule with at
+(the job read on its standard input) go through an at wrapper put first in the PATH of the namespace commands,
+which submits them as ip netns exec <namespace> sh, so they revert the namespace interfaces.
+
+Needs root (or CAP_NET_ADMIN), the iproute2 tools and atd for the scheduled revert jobs.
+"""
+import argparse
+import distutils.spawn
+import logging
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib2
+
+import framework.fault as fault
+import helpers.utils as utils
+
+from helpers.constants import Component
+from helpers.constants import DestructiveTesting
+from helpers.constants import Interface
+from helpers.constants import TestLog
+
+LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
+
+NAMESPACE_PREFIX = "dpns"
+VETH_PREFIX = "dpveth"
+# Name of the data interface inside every namespace, the loopback plays the management interface
+DATA_INTERFACE = "data0"
+MGMT_INTERFACE = "lo"
+# Node n gets the /30 10.200.n.0: host side .1, namespace side .2
+SUBNET = "10.200.%d.%d"
+STANDIN_PORT = 8080
+STANDIN_START_TIMEOUT = 10
+PROBE_TIMEOUT = 2
+PROBE_COUNT = 20
+COMPONENT = "netns"
+# Submits the job read on stdin so that atd runs it inside the namespace of the command calling at
+AT_WRAPPER = """#!/bin/sh
+{ echo "ip netns exec $NETNS_NAME sh <<'NETNS_JOB'"; cat; echo; echo "NETNS_JOB"; } | exec "$NETNS_AT" "$@"
+"""
+
+_WRAPPER_DIR = None
+_WRAPPER_LOCK = threading.Lock()
+
+# name -> (outgoing command template, value, qdisc settings expected once applied)
+IMPAIRMENTS = {
+    "loss": (DestructiveTesting.PACKET_LOSS_OUTGOING_INTERFACE, DestructiveTesting.PACKET_LOSS,
+             {DestructiveTesting.LOSS: DestructiveTesting.PACKET_LOSS,
+              DestructiveTesting.DST: DestructiveTesting.NETWORK}),
+    "block": (DestructiveTesting.PACKET_LOSS_OUTGOING_INTERFACE, DestructiveTesting.PACKET_LOSS_BLOCK,
+              {DestructiveTesting.LOSS: DestructiveTesting.PACKET_LOSS_BLOCK,
+               DestructiveTesting.DST: DestructiveTesting.NETWORK}),
+    "latency": (DestructiveTesting.PACKET_LATENCY_OUTGOING_INTERFACE, DestructiveTesting.PACKET_LATENCY,
+                {DestructiveTesting.DELAY: DestructiveTesting.PACKET_LATENCY,
+                 DestructiveTesting.DST: DestructiveTesting.NETWORK}),
+}
+
+
+def _run(command):
+    LOGGER.debug("netns: %s", " ".join(command))
+    subprocess.check_call(command)
+
+
+class _ChannelFile(object):
+    """
+    Output of a finished local command, with the read API of a paramiko channel file.
+    """
+
+    def __init__(self, data, exit_status):
+        self._data = data
+        self.channel = self
+        self._exit_status = exit_status
+
+    def read(self):
+        return self._data
+
+    def readlines(self):
+        return self._data.splitlines(True)
+
+    def recv_exit_status(self):
+        return self._exit_status
+
+
+def get_wrapper_dir():
+    """
+    Directory holding the at wrapper, created once per process.
+    """
+    global _WRAPPER_DIR
+    with _WRAPPER_LOCK:
+        if _WRAPPER_DIR is None:
+            wrapper_dir = tempfile.mkdtemp(prefix=NAMESPACE_PREFIX)
+            wrapper = os.path.join(wrapper_dir, "at")
+            with open(wrapper, "w") as wrapper_file:
+                wrapper_file.write(AT_WRAPPER)
+            os.chmod(wrapper, stat.S_IRWXU | stat.S_IRGRP | stat.S_IXGRP | stat.S_IROTH | stat.S_IXOTH)
+            _WRAPPER_DIR = wrapper_dir
+        return _WRAPPER_DIR
+
+
+class NamespaceClient(object):
+    """
+    Runs commands inside a network namespace, in place of the SSH client of a node.
+    """
+
+    def __init__(self, namespace, at_path=None):
+        """
+        :param at_path: at the wrapper submits the jobs to, the one of the PATH by default
+        """
+        self.namespace = namespace
+        self.at_path = at_path or distutils.spawn.find_executable("at")
+
+    def get_command(self, command):
+        return ["ip", "netns", "exec", self.namespace, "sh", "-c", command]
+
+    def get_environment(self):
+        """
+        Environment of the commands: the at wrapper first in the PATH, when at is installed.
+        """
+        environment = dict(os.environ)
+        if self.at_path:
+            environment.update(PATH=os.pathsep.join([get_wrapper_dir(), environment.get("PATH", os.defpath)]),
+                               NETNS_NAME=self.namespace, NETNS_AT=self.at_path)
+        return environment
+
+    def exec_command(self, command, timeout=None, get_pty=False):
+        process = subprocess.Popen(self.get_command(command), stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   env=self.get_environment())
+        output, error = process.communicate()
+        return None, _ChannelFile(output, process.returncode), _ChannelFile(error, process.returncode)
+
+    def close(self):
+        pass
+
+
+class Node(object):
+    """
+    One namespace, its veth pair and its service stand-in.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.namespace = "%s%d" % (NAMESPACE_PREFIX, index)
+        self.host_interface = "%s%d" % (VETH_PREFIX, index)
+        self.host_ip = SUBNET % (index, 1)
+        self.ip = SUBNET % (index, 2)
+        self.standin = None
+
+    def get_details(self):
+        """
+        :return: node details shaped like v2pc.get_app_worker_nodes entries
+        """
+        return {Component.IP: self.ip, Interface.DATA_IN: DATA_INTERFACE, Interface.DATA_OUT: DATA_INTERFACE,
+                Interface.MGMT: MGMT_INTERFACE}
+
+    def create(self):
+        peer = self.host_interface + "p"
+        _run(["ip", "netns", "add", self.namespace])
+        _run(["ip", "link", "add", self.host_interface, "type", "veth", "peer", "name", peer])
+        _run(["ip", "link", "set", peer, "netns", self.namespace])
+        _run(["ip", "addr", "add", self.host_ip + "/30", "dev", self.host_interface])
+        _run(["ip", "link", "set", self.host_interface, "up"])
+        for command in (["ip", "link", "set", peer, "name", DATA_INTERFACE],
+                        ["ip", "addr", "add", self.ip + "/30", "dev", DATA_INTERFACE],
+                        ["ip", "link", "set", DATA_INTERFACE, "up"],
+                        ["ip", "link", "set", MGMT_INTERFACE, "up"]):
+            _run(["ip", "netns", "exec", self.namespace] + command)
+
+    def start_standin(self):
+        self.standin = subprocess.Popen(
+            ["ip", "netns", "exec", self.namespace, sys.executable, "-m", "framework.simulator", "--host", self.ip,
+             "--port", str(STANDIN_PORT)], cwd=utils.get_base_dir_path())
+        deadline = time.time() + STANDIN_START_TIMEOUT
+        while time.time() < deadline:
+            if probe(self.get_url(), count=1)[0] == 0:
+                return
+            time.sleep(0.2)
+        raise RuntimeError("Stand-in of %s not answering on %s" % (self.namespace, self.get_url()))
+
+    def get_url(self):
+        return "http://%s:%d/" % (self.ip, STANDIN_PORT)
+
+    def delete(self):
+        if self.standin:
+            self.standin.terminate()
+            self.standin.wait()
+            self.standin = None
+        # Deleting the namespace deletes the veth pair with it
+        subprocess.call(["ip", "netns", "del", self.namespace])
+
+
+class Harness(object):
+    """
+    A set of namespace nodes, usable as a context manager.
+    """
+
+    def __init__(self, node_count):
+        self.nodes = [Node(index) for index in range(node_count)]
+
+    def __enter__(self):
+        try:
+            for node in self.nodes:
+                node.create()
+                node.start_standin()
+        except Exception:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for node in self.nodes:
+            node.delete()
+
+    def get_client(self, node_ip):
+        return NamespaceClient(next(node.namespace for node in self.nodes if node.ip == node_ip))
+
+    def get_plan(self, impairment):
+        """
+        Fault plan impairing the data interface of every node with one of IMPAIRMENTS.
+        """
+        template, value, expected_result = IMPAIRMENTS[impairment]
+        faults = fault.get_outgoing_faults([node.get_details() for node in self.nodes], template, value,
+                                           expected_result)
+        return fault.FaultPlan(COMPONENT, None, faults, registry=fault.RevertRegistry(),
+                               client_factory=self.get_client)
+
+    def probe(self, count=PROBE_COUNT):
+        """
+        :return: list of (loss ratio, average latency in seconds) per node
+        """
+        return [probe(node.get_url(), count) for node in self.nodes]
+
+
+def probe(url, count=PROBE_COUNT, timeout=PROBE_TIMEOUT):
+    """
+    Request the url count times.
+    :return: (loss ratio, average latency in seconds of the answered requests, None if none was)
+    """
+    latencies = []
+    for _ in range(count):
+        start = time.time()
+        try:
+            urllib2.urlopen(url, timeout=timeout).read()
+        except urllib2.HTTPError:
+            # Answered, whatever the status
+            pass
+        except Exception:
+            continue
+        latencies.append(time.time() - start)
+    average = sum(latencies) / len(latencies) if latencies else None
+    return 1 - float(len(latencies)) / count, average
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Destructive scenarios on local network namespaces")
+    parser.add_argument("--nodes", type=int, default=2)
+    parser.add_argument("--impairment", choices=sorted(IMPAIRMENTS), default="loss")
+    parser.add_argument("--probes", type=int, default=PROBE_COUNT)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with Harness(args.nodes) as harness:
+        LOGGER.info("Baseline: %s", harness.probe(args.probes))
+        plan = harness.get_plan(args.impairment)
+        start = time.time()
+        is_valid, error = plan.inject()
+        injected = time.time()
+        LOGGER.info("Injection %s in %.3f seconds, skew %s seconds", "done" if is_valid else error,
+                    injected - start, plan.skew)
+        LOGGER.info("Impaired: %s", harness.probe(args.probes))
+        is_valid, error = plan.revert()
+        LOGGER.info("Revert %s in %.3f seconds", "done" if is_valid else error, time.time() - injected)
+        LOGGER.info("Reverted: %s", harness.probe(args.probes))
+    return 0 if is_valid else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+"""
+Session wide notification receiver for recording status callbacks.
+
+One HTTP listener serves every recording of the session. Each recording registers a route and the
+route URL (<base url>/notifications/<recording id>) is used as the UpdateUrl of the recording entry,
+so the listener knows which recording a callback belongs to without one server per recording.
+"""
+import BaseHTTPServer
+import collections
+import json
+import logging
+import os
+import socket
+import SocketServer
+import threading
+import urllib
+
+import framework.clock as clock
+
+from helpers.constants import RecordingStatus
+from helpers.constants import TestLog
+
+LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
+
+NOTIFICATION_PATH = "/notifications/"
+STATUS_KEY = "Status"
+# Only the latest notifications of a recording are kept, so memory per recording stays constant
+MAX_NOTIFICATIONS_PER_RECORDING = 16
+REQUEST_TIMEOUT = 10
+# Address used only to find the interface that routes to the lab, no packet is sent to it
+ROUTE_PROBE_ADDRESS = ("8.8.8.8", 80)
+
+_SERVER = None
+_SERVER_LOCK = threading.Lock()
+
+
+class Notification(object):
+    """
+    A single status callback received for a recording.
+    """
+    __slots__ = ("recording_id", "status", "payload", "received_at")
+
+    def __init__(self, recording_id, status, payload, received_at):
+        self.recording_id = recording_id
+        self.status = status
+        self.payload = payload
+        self.received_at = received_at
+
+    def __repr__(self):
+        return "Notification(recording_id=%s, status=%s)" % (self.recording_id, self.status)
+
+
+class NotificationRoute(object):
+    """
+    Handle of one recording registered on the shared notification server.
+
+    Mirrors the web service object API used by the tests (get_url / stop_server), where stop_server only
+    removes the route, the listener keeps serving the other recordings.
+    """
+
+    def __init__(self, server, recording_id):
+        self.recording_id = recording_id
+        self._server = server
+        self._notifications = collections.deque(maxlen=MAX_NOTIFICATIONS_PER_RECORDING)
+        self._lock = threading.Lock()
+        # Events of the pending wait_for_status calls, set on every notification and waited on through the clock
+        self._waiters = set()
+
+    def get_url(self):
+        return self._server.get_url(self.recording_id)
+
+    def get_notifications(self):
+        with self._lock:
+            return list(self._notifications)
+
+    def get_last_status(self):
+        with self._lock:
+            return self._notifications[-1].status if self._notifications else None
+
+    def add_notification(self, notification):
+        with self._lock:
+            self._notifications.append(notification)
+            for waiter in self._waiters:
+                waiter.set()
+
+    def wait_for_status(self, status, timeout):
+        """
+        Wait until a notification with the expected status is received for the recording.
+        :param status: expected status, or a list of accepted statuses
+        :param timeout: maximum number of seconds to wait
+        :return: (is_valid, error)
+        """
+        statuses = status if isinstance(status, (list, tuple, set)) else [status]
+        end = clock.now() + max(timeout, 0)
+        waiter = threading.Event()
+        with self._lock:
+            self._waiters.add(waiter)
+
+        try:
+            while True:
+                with self._lock:
+                    received = [notification.status for notification in self._notifications]
+                    # Cleared under the lock, a notification added from here on sets it again
+                    waiter.clear()
+                if any(received_status in statuses for received_status in received):
+                    return True, None
+                if RecordingStatus.FAILED in received and RecordingStatus.FAILED not in statuses:
+                    return False, "Recording %s reported %s while waiting for %s" % (
+                        self.recording_id, RecordingStatus.FAILED, ",".join(statuses))
+
+                remaining = end - clock.now()
+                if remaining <= 0:
+                    return False, "Notification %s not received for recording %s, received=%s" % (
+                        ",".join(statuses), self.recording_id, received)
+                clock.wait(waiter, remaining)
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+    def stop_server(self):
+        self._server.unregister(self.recording_id)
+
+
+class _ThreadingHTTPServer(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    # A slow or stalled client does not hold back the callbacks of the other recordings
+    daemon_threads = True
+
+
+class _NotificationHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    timeout = REQUEST_TIMEOUT
+
+    def _handle_notification(self):
+        length = int(self.headers.getheader("content-length", 0) or 0)
+        body = self.rfile.read(length) if length else ""
+        path = self.path.split("?", 1)[0]
+
+        if not path.startswith(NOTIFICATION_PATH):
+            self.send_response(404)
+        else:
+            recording_id = urllib.unquote(path[len(NOTIFICATION_PATH):].strip("/"))
+            self.send_response(self.server.receiver.dispatch(recording_id, body))
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_POST = _handle_notification
+    do_PUT = _handle_notification
+
+    def log_message(self, message_format, *args):
+        LOGGER.debug("Notification server: " + message_format, *args)
+
+
+class NotificationServer(object):
+    """
+    Single HTTP listener that routes recording callbacks by the recording id in the UpdateUrl.
+    """
+
+    def __init__(self, host=None, port=0):
+        self._advertised_host = host
+        self._port = port
+        self._routes = {}
+        self._observers = collections.defaultdict(set)
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return "http://%s:%s" % (self._advertised_host, self._httpd.server_address[1])
+
+    def start(self):
+        if self._httpd:
+            return self
+        self._httpd = _ThreadingHTTPServer(("", self._port), _NotificationHandler)
+        self._httpd.receiver = self
+        if not self._advertised_host:
+            self._advertised_host = get_local_ip()
+
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="notification-server")
+        self._thread.daemon = True
+        self._thread.start()
+        LOGGER.info("Notification server listening on %s", self.base_url)
+        return self
+
+    def stop(self):
+        if not self._httpd:
+            return
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+        self._httpd = None
+        self._thread = None
+        with self._lock:
+            self._routes.clear()
+            self._observers.clear()
+        LOGGER.info("Notification server stopped")
+
+    def register(self, recording_id):
+        """
+        Register a recording on the listener.
+        :param recording_id: recording identifier
+        :return: NotificationRoute of the recording
+        """
+        with self._lock:
+            route = self._routes.get(recording_id)
+            if route is None:
+                route = NotificationRoute(self, recording_id)
+                self._routes[recording_id] = route
+        return route
+
+    def unregister(self, recording_id):
+        with self._lock:
+            self._routes.pop(recording_id, None)
+
+    def add_observer(self, observer, recording_ids):
+        """
+        Subscribe an observer to the notifications of the given recordings.
+        The observer's notify(notification) is called from the listener threads for every callback received,
+        possibly concurrently.
+        """
+        with self._lock:
+            for recording_id in recording_ids:
+                self._observers[recording_id].add(observer)
+
+    def remove_observer(self, observer, recording_ids):
+        with self._lock:
+            for recording_id in recording_ids:
+                observers = self._observers.get(recording_id)
+                if observers is not None:
+                    observers.discard(observer)
+                    if not observers:
+                        del self._observers[recording_id]
+
+    def get_route(self, recording_id):
+        with self._lock:
+            return self._routes.get(recording_id)
+
+    def get_url(self, recording_id):
+        return self.base_url + NOTIFICATION_PATH + urllib.quote(recording_id, safe="")
+
+    def dispatch(self, recording_id, body):
+        """
+        Deliver a callback body to the route of the recording.
+        :return: HTTP status code sent back to the caller
+        """
+        route = self.get_route(recording_id)
+        if route is None:
+            LOGGER.debug("Notification received for unregistered recording %s", recording_id)
+            return 404
+
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            payload = body
+        status = payload.get(STATUS_KEY) if isinstance(payload, dict) else None
+
+        LOGGER.debug("Notification received for recording %s: status=%s", recording_id, status)
+        notification = Notification(recording_id, status, payload, clock.now())
+        route.add_notification(notification)
+
+        with self._lock:
+            observers = list(self._observers.get(recording_id, ()))
+        for observer in observers:
+            observer.notify(notification)
+        return 200
+
+
+def get_local_ip():
+    """
+    Address of the interface the lab components use to reach this machine.
+    """
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        probe.connect(ROUTE_PROBE_ADDRESS)
+        return probe.getsockname()[0]
+    except socket.error:
+        return socket.gethostbyname(socket.gethostname())
+    finally:
+        probe.close()
+
+
+def get_notification_server():
+    """
+    Shared notification server of the session, started on first use.
+    """
+    global _SERVER
+    with _SERVER_LOCK:
+        if _SERVER is None:
+            _SERVER = NotificationServer().start()
+        return _SERVER
+
+
+def stop_notification_server():
+    global _SERVER
+    with _SERVER_LOCK:
+        if _SERVER is not None:
+            _SERVER.stop()
+            _SERVER = None
+
+
+def get_web_service_object(recording_id):
+    """
+    Drop in replacement of notification_utils.get_web_service_object backed by the shared listener.
+    """
+    return get_notification_server().register(recording_id)
@@ -0,0 +1,168 @@
+"""
+Deadline aware polling of recordings in RIO.
+
+The poller tracks a set of recordings until every one of them satisfies a check, or one of them fails. RIO
+is queried in batches, and the interval between two rounds grows while nothing changes and falls back to
+the initial value as soon as a recording makes progress. The wait ends the moment the outcome is known
+instead of after a guessed sleep, and never runs past the deadline.
+"""
+import logging
+import os
+
+import framework.clock as clock
+import validators.validate_storage as validate_storage
+
+from framework.rio import find_recordings
+from framework.waiters import get_remaining_seconds
+from helpers.constants import Cos
+from helpers.constants import RecordingStatus
+from helpers.constants import TestLog
+
+LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
+
+INITIAL_INTERVAL = 1
+MAX_INTERVAL = 15
+BACKOFF = 2
+# Archival is driven by the archive time of the lab, which is a few minutes at most
+ARCHIVAL_TIMEOUT = 20 * 60
+STATUS_KEY = "Status"
+
+
+def poll(recording_ids, check, deadline, probe=find_recordings, initial_interval=INITIAL_INTERVAL,
+         max_interval=MAX_INTERVAL, backoff=BACKOFF):
+    """
+    Poll the recordings until every one of them satisfies the check.
+    :param recording_ids: recordings to track
+    :param check: function(recording_id, response) -> (done, error), a non empty error ends the wait
+    :param deadline: datetime (UTC) or seconds since the epoch after which the wait fails
+    :param probe: function(recording_ids) -> dict of recording id -> response, RIO by default
+    :param initial_interval: seconds between the first rounds, and after any progress
+    :param max_interval: upper bound of the interval between two rounds
+    :param backoff: factor applied to the interval after a round without progress
+    :return: (is_valid, error)
+    """
+    start = clock.now()
+    pending = set(recording_ids)
+    interval = initial_interval
+    rounds = 0
+
+    while pending:
+        rounds += 1
+        responses = probe(pending)
+        progress = False
+        for recording_id, response in responses.items():
+            done, error = check(recording_id, response)
+            if error:
+                LOGGER.debug("Polling stopped after %d round(s): %s", rounds, error)
+                return False, error
+            if done:
+                pending.discard(recording_id)
+                progress = True
+
+        if not pending:
+            break
+
+        remaining = get_remaining_seconds(deadline)
+        if remaining <= 0:
+            pending = sorted(pending)
+            return False, "%d recording(s) did not reach the expected state after %d seconds: %s" % (
+                len(pending), clock.now() - start, ",".join(pending))
+
+        interval = initial_interval if progress else min(interval * backoff, max_interval)
+        clock.sleep(min(interval, remaining))
+
+    LOGGER.debug("Polling of %d recording(s) done in %d round(s), %.1f seconds", len(set(recording_ids)), rounds,
+                 clock.now() - start)
+    return True, None
+
+
+def _get_status(response):
+    return response[0].get(STATUS_KEY) if response else None
+
+
+def status_check(statuses):
+    """
+    Check passing once the RIO status of the recording is one of the statuses, failing on FAILED.
+    """
+    if not isinstance(statuses, (list, tuple, set)):
+        statuses = [statuses]
+
+    def check(recording_id, response):
+        if not response:
+            return False, "Recording %s not found in RIO" % recording_id
+        status = _get_status(response)
+        if status in statuses:
+            return True, None
+        if status == RecordingStatus.FAILED:
+            return False, "Recording %s reported %s while waiting for %s" % (recording_id, status,
+                                                                            ",".join(statuses))
+        return False, None
+
+    return check
+
+
+def storage_check(storage_type, storage_status, **kwargs):
+    """
+    Check passing once validate_recording_in_storage accepts the recording, failing on FAILED.
+    :param kwargs: extra arguments of validate_recording_in_storage, e.g. rec_status
+    """
+    def check(recording_id, response):
+        if not response:
+            return False, "Recording %s not found in RIO" % recording_id
+        if _get_status(response) == RecordingStatus.FAILED:
+            return False, "Recording %s reported %s while waiting for %s" % (recording_id, RecordingStatus.FAILED,
+                                                                            storage_type)
+        is_valid, _ = validate_storage.validate_recording_in_storage(response, storage_type, storage_status,
+                                                                     **kwargs)
+        return is_valid, None
+
+    return check
+
+
+def archive_check(**kwargs):
+    """
+    Check passing once the archive job of the recording is complete: the recording is stored in the archive
+    storage and no longer in the active storage. Archive copy and active storage cleanup are separate steps,
+    the archive storage alone does not tell the job is over.
+    :param kwargs: extra arguments of validate_recording_in_storage for the archive storage, e.g. rec_status
+    """
+    archived = storage_check(Cos.ARCHIVE_STORAGE, Cos.RECORDING_STORED, **kwargs)
+
+    def check(recording_id, response):
+        done, error = archived(recording_id, response)
+        if not done or error:
+            return done, error
+        is_valid, _ = validate_storage.validate_recording_in_storage(response, Cos.ACTIVE_STORAGE,
+                                                                     Cos.RECORDING_NOT_STORED)
+        return is_valid, None
+
+    return check
+
+
+def wait_for_status(recording_ids, statuses, deadline):
+    """
+    Wait until the RIO status of every recording is one of the statuses.
+    :return: (is_valid, error)
+    """
+    return poll(recording_ids, status_check(statuses), deadline)
+
+
+def wait_for_storage(recording_ids, storage_type, storage_status, deadline, **kwargs):
+    """
+    Wait until every recording is in the expected state in the given storage.
+    :return: (is_valid, error)
+    """
+    return poll(recording_ids, storage_check(storage_type, storage_status, **kwargs), deadline)
+
+
+def wait_for_archival(recording_ids, deadline=None, **kwargs):
+    """
+    Wait until the archive job of every recording is complete, stored in the archive storage and cleaned up
+    from the active storage.
+    :param deadline: datetime (UTC) or seconds since the epoch, ARCHIVAL_TIMEOUT from now by default
+    :param kwargs: extra arguments of validate_recording_in_storage for the archive storage, e.g. rec_status
+    :return: (is_valid, error)
+    """
+    if deadline is None:
+        deadline = clock.now() + ARCHIVAL_TIMEOUT
+    return poll(recording_ids, archive_check(**kwargs), deadline)
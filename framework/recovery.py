@@ -0,0 +1,179 @@
+"""
+Recovery timeline of the pod restart scenarios.
+
+A restart test used to only assert that the recordings survived the restart of a VMR component. The timeline
+records when each step of the recovery happened, relative to the deletion request:
+
+    deleted             last old pod gone
+    scheduled           first replacement pod bound to a node
+    ready               all replacement pods ready
+    first_segment       first change of the segment or duration fields in RIO of an in-flight recording, i.e.
+                        the first segment written after the restart (resolution: SEGMENT_POLL_INTERVAL), watched
+                        in the background while the test goes on
+    first_notification  first status callback received for one of the recordings after the restart, the
+                        recordings have to be registered on the shared notification server (notification_server
+                        fixture) for the timeline to see their callbacks
+
+The steps not seen by the time the timeline is closed are reported as None: the timeline measures the recovery,
+it does not decide whether the test passes. The timelines of a test are attached to its report (user_properties)
+and to its entry in pytest.tc_data by the recovery_timelines fixture, so recovery time regressions can be
+tracked across VMR builds.
+"""
+import datetime
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import framework.clock as clock
+import framework.http_session as http_session
+import framework.kube as kube
+import framework.notification as notification
+import framework.poller as poller
+
+from framework.rio import find_recordings
+from helpers.constants import TestLog
+
+LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
+
+RESTART = "restart"
+EVENTS = ("deleted", "scheduled", "ready", "first_segment", "first_notification")
+SEGMENT_POLL_INTERVAL = 1
+# Segments are a few seconds long, a recording writing none for this long after the restart did not recover
+SEGMENT_TIMEOUT = 120
+PROPERTY_NAME = "recovery_timeline"
+# Synthetic id under which the poller tracks "any recording changed"
+_ANY_RECORDING = "any"
+# Fields of a RIO response growing with the segments written, matched case-insensitively within the key names
+PROGRESS_KEYWORDS = ("segment", "duration")
+
+
+class RecoveryTimeline(object):
+    """
+    Times of the recovery steps of one restart, observer of the notifications of the recordings in flight.
+    """
+
+    def __init__(self, name_prefix, namespace, recording_ids=()):
+        self.name_prefix = name_prefix
+        self.namespace = namespace
+        self.recording_ids = list(recording_ids)
+        self._times = OrderedDict()
+        self._lock = threading.Lock()
+        self._server = None
+        self._closed = threading.Event()
+
+    def mark(self, event, timestamp=None):
+        """
+        Record the time of an event, only its first occurrence is kept.
+        """
+        with self._lock:
+            if event not in self._times:
+                self._times[event] = clock.now() if timestamp is None else timestamp
+                LOGGER.debug("%s recovery: %s", self.name_prefix, event)
+
+    def notify(self, received):
+        if RESTART in self._times:
+            self.mark("first_notification")
+
+    def observe(self, server):
+        self._server = server
+        server.add_observer(self, self.recording_ids)
+
+    def is_closed(self):
+        return self._closed.is_set()
+
+    def close(self):
+        self._closed.set()
+        if self._server is not None:
+            self._server.remove_observer(self, self.recording_ids)
+            self._server = None
+
+    def get_durations(self):
+        """
+        :return: OrderedDict of event -> seconds since the deletion request, None for the events not seen
+        """
+        with self._lock:
+            start = self._times.get(RESTART)
+            return OrderedDict((event, round(self._times[event] - start, 3)
+                                if start is not None and event in self._times else None) for event in EVENTS)
+
+    def to_dict(self):
+        start = self._times.get(RESTART)
+        data = OrderedDict([
+            ("component", self.name_prefix),
+            ("namespace", self.namespace),
+            ("recordings", len(self.recording_ids)),
+            (RESTART, str(datetime.datetime.utcfromtimestamp(start)) if start is not None else None),
+        ])
+        data.update(self.get_durations())
+        return data
+
+
+def get_progress(response):
+    """
+    Recording progress in a RIO response: the segment and duration fields of its copies, storage sections
+    included. Status and state fields are left out, the restart itself flips them.
+    :return: sorted list of (path, value)
+    """
+    progress = []
+
+    def collect(value, path):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if isinstance(item, (dict, list)):
+                    collect(item, path + (key,))
+                elif any(word in key.lower() for word in PROGRESS_KEYWORDS):
+                    progress.append((path + (key,), item))
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                collect(item, path + (index,))
+
+    collect(response or [], ())
+    return sorted(progress)
+
+
+def _first_segment_check(baseline, timeline):
+    baseline = dict((recording_id, get_progress(response)) for recording_id, response in baseline.items())
+
+    def check(_, responses):
+        if timeline.is_closed():
+            return True, None
+        for recording_id, response in responses.items():
+            progress = get_progress(response)
+            if progress and progress != baseline.get(recording_id):
+                timeline.mark("first_segment")
+                return True, None
+        return False, None
+
+    return check
+
+
+def _watch_first_segment(timeline, baseline, segment_timeout):
+    # The watcher outlives the restart, its RIO calls must not pass for the last exchange of the test
+    http_session.untrack_thread()
+    try:
+        poller.poll([_ANY_RECORDING], _first_segment_check(baseline, timeline), clock.now() + segment_timeout,
+                    probe=lambda _: {_ANY_RECORDING: find_recordings(timeline.recording_ids)},
+                    initial_interval=SEGMENT_POLL_INTERVAL, max_interval=SEGMENT_POLL_INTERVAL)
+    except Exception as e:
+        LOGGER.warning("%s recovery: first segment not watched: %s", timeline.name_prefix, e)
+    LOGGER.info("%s recovery: %s", timeline.name_prefix, dict(timeline.get_durations()))
+
+
+def restart_pods(timeline, timeout=kube.POD_READY_TIMEOUT, segment_timeout=SEGMENT_TIMEOUT):
+    """
+    Restart the pods of the timeline's component. The first segment written for the recordings in flight is
+    watched in the background for up to segment_timeout seconds, and the first notification recorded whenever it
+    arrives, until the timeline is closed.
+    :return: (is_valid, error) of the restart itself
+    """
+    timeline.observe(notification.get_notification_server())
+    baseline = find_recordings(timeline.recording_ids)
+
+    is_valid, error = kube.restart_pods(timeline.name_prefix, timeline.namespace, timeout, timeline=timeline)
+    if is_valid and timeline.recording_ids:
+        watcher = threading.Thread(target=_watch_first_segment, args=(timeline, baseline, segment_timeout),
+                                   name="first-segment-watcher")
+        watcher.daemon = True
+        watcher.start()
+    return is_valid, error
@@ -0,0 +1,230 @@
+"""
+Durable test results, aggregated across the xdist workers.
+
+pytest.tc_data only reaches the disk when prepare_test_summary runs at the end of the session, so a crash or a
+kill during a longevity run loses every result, and every xdist worker holds its own copy. Each process now
+appends the result of every test to its own JSON lines file in output/results/ as soon as the test is over,
+flushed and fsync'd, so the journal survives whatever happens to the run.
+
+The entry also travels to the master in the user properties of the teardown report, where a ResultAggregator
+keeps the results of every worker with the counts and percentages by status, overall and by stream, up to date
+as they come in, and writes them as one report (TestReport.RALLY_RESULT_FILE, read by update_rally_results.py)
+at the end of the session. Once journaled, a result is dropped from pytest.tc_data, so prepare_test_summary
+only writes the suite and setup summary and no process holds every result until the end of the session.
+merge() builds the same report from the journals, to recover the results of an interrupted run:
+
+    python -m framework.results
+"""
+import glob
+import json
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+
+import helpers.utils as utils
+
+from helpers.constants import TestDirectory
+from helpers.constants import TestLog
+from helpers.constants import TestReport
+
+LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
+
+JOURNAL_DIR = "results"
+JOURNAL_EXTENSION = ".jsonl"
+MASTER = "master"
+TOTAL = "Total"
+UNKNOWN_STREAM = "unknown"
+# Name of the user property carrying the result entry of a test from its worker to the master
+PROPERTY_NAME = "test_result"
+
+_JOURNAL = None
+_JOURNAL_LOCK = threading.Lock()
+
+
+def get_journal_dir():
+    return os.path.join(utils.get_base_dir_path(), TestDirectory.OUTPUT_DIR, JOURNAL_DIR)
+
+
+def get_report_file():
+    return os.path.join(utils.get_base_dir_path(), TestReport.RALLY_RESULT_FILE)
+
+
+class ResultJournal(object):
+    """
+    Append only JSON lines file, one line per test result.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # Created meanwhile by another worker
+                pass
+        self._file = open(path, "a")
+
+    def append(self, entry):
+        line = json.dumps(entry, default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def get_journal():
+    """
+    Journal of the current process, output/results/<xdist worker id>.jsonl.
+    """
+    global _JOURNAL
+    with _JOURNAL_LOCK:
+        if _JOURNAL is None:
+            name = os.environ.get("PYTEST_XDIST_WORKER", MASTER)
+            _JOURNAL = ResultJournal(os.path.join(get_journal_dir(), name + JOURNAL_EXTENSION))
+        return _JOURNAL
+
+
+def reset():
+    """
+    Remove the journals of a previous run.
+    """
+    shutil.rmtree(get_journal_dir(), ignore_errors=True)
+
+
+def read_entries(journal_dir=None):
+    """
+    Entries of every journal, the last one of each test winning (a test run again by an appended pass).
+    :return: OrderedDict of test name -> entry
+    """
+    entries = OrderedDict()
+    for path in sorted(glob.glob(os.path.join(journal_dir or get_journal_dir(), "*" + JOURNAL_EXTENSION))):
+        with open(path) as journal:
+            for line in journal:
+                try:
+                    entry = json.loads(line, object_pairs_hook=OrderedDict)
+                except ValueError:
+                    # Last line of a process killed while writing it
+                    LOGGER.warning("Truncated result entry ignored in %s", path)
+                    continue
+                entries.pop(entry["name"], None)
+                entries[entry["name"]] = entry
+    return entries
+
+
+def to_plain(data):
+    """
+    Copy made of plain dicts, lists and strings only, as the xdist channel between the workers and the master
+    carries no other type (e.g. no OrderedDict, datetime).
+    """
+    return json.loads(json.dumps(data, default=str))
+
+
+def get_percentage(counts):
+    total = counts.get(TOTAL, 0)
+    return OrderedDict((status, round(100.0 * count / total, 2) if total else 0.0)
+                       for status, count in counts.items())
+
+
+class ResultAggregator(object):
+    """
+    Results of every test of the run, with the counts by status overall and by stream kept up to date as the
+    results come in.
+    """
+
+    def __init__(self):
+        self.testcases = OrderedDict()
+        self.counts = OrderedDict([(TOTAL, 0)])
+        self.stream_counts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _count(self, entry, increment):
+        stream_counts = self.stream_counts.setdefault(entry.get("stream") or UNKNOWN_STREAM,
+                                                      OrderedDict([(TOTAL, 0)]))
+        for counts in (self.counts, stream_counts):
+            counts[TOTAL] += increment
+            counts[entry["status"]] = counts.get(entry["status"], 0) + increment
+
+    def add(self, entry):
+        """
+        Account for the result of a test, replacing the previous result of the same test if any.
+        """
+        with self._lock:
+            previous = self.testcases.pop(entry["name"], None)
+            if previous is not None:
+                self._count(previous, -1)
+            self.testcases[entry["name"]] = entry
+            self._count(entry, 1)
+
+    def get_summary(self):
+        """
+        :return: OrderedDict with the counts and percentages by status, overall and by stream
+        """
+        with self._lock:
+            return OrderedDict([
+                ("counts", OrderedDict(self.counts)),
+                ("percentage", get_percentage(self.counts)),
+                ("streams", OrderedDict((stream, OrderedDict([("counts", OrderedDict(counts)),
+                                                              ("percentage", get_percentage(counts))]))
+                                        for stream, counts in self.stream_counts.items())),
+            ])
+
+    def get_progress(self):
+        with self._lock:
+            return ", ".join("%s %d (%.1f%%)" % (status, count, percentage) for (status, count), percentage in
+                             zip(self.counts.items(), get_percentage(self.counts).values()))
+
+    def write(self, report_file=None):
+        """
+        Write the report. The other contents of an existing report (suite and setup summary written by
+        prepare_test_summary) are kept.
+        :return: report dict
+        """
+        report_file = report_file or get_report_file()
+        try:
+            with open(report_file) as report_fp:
+                report = json.load(report_fp, object_pairs_hook=OrderedDict)
+        except (IOError, ValueError):
+            report = OrderedDict()
+
+        with self._lock:
+            report["testcases"] = OrderedDict(self.testcases)
+        report.setdefault("summary", OrderedDict()).update(self.get_summary())
+
+        # Written aside and renamed, a reader never sees a partial report
+        temp_file = report_file + ".tmp"
+        with open(temp_file, "w") as report_fp:
+            json.dump(report, report_fp, indent=4, default=str)
+        os.rename(temp_file, report_file)
+        LOGGER.info("%d test result(s) written to %s", len(report["testcases"]), report_file)
+        return report
+
+
+def load(journal_dir=None):
+    """
+    :return: ResultAggregator holding the results of the journals
+    """
+    aggregator = ResultAggregator()
+    for entry in read_entries(journal_dir).values():
+        aggregator.add(entry)
+    return aggregator
+
+
+def merge(journal_dir=None, report_file=None):
+    """
+    Build the report from the journals.
+    :return: report dict
+    """
+    return load(journal_dir).write(report_file)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    merge()
@@ -0,0 +1,55 @@
+"""
+Bulk access to the RIO recording API.
+
+helpers.vmr.rio.api.find_recording answers for one recording per request. find_recordings issues the
+requests of many recordings concurrently, so a validation phase over N recordings costs about one
+round-trip of latency instead of N.
+"""
+import logging
+import multiprocessing.pool as mp_pool
+import os
+import threading
+from collections import OrderedDict
+
+import helpers.vmr.rio.api as rio
+
+from helpers.constants import TestLog
+
+LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
+
+# Matches the largest recording pools used by the bulk tests
+MAX_CONCURRENT_REQUESTS = 20
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool():
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = mp_pool.ThreadPool(processes=MAX_CONCURRENT_REQUESTS)
+        return _POOL
+
+
+def _find_recording(recording_id):
+    return rio.find_recording(recording_id).json()
+
+
+def find_recordings(recording_ids):
+    """
+    Fetch the RIO details of many recordings concurrently.
+    :param recording_ids: iterable of recording identifiers
+    :return: dict of recording identifier -> RIO response (the json of find_recording)
+    """
+    unique_ids = list(OrderedDict.fromkeys(recording_ids))
+    if not unique_ids:
+        return {}
+
+    if len(unique_ids) == 1:
+        responses = [_find_recording(unique_ids[0])]
+    else:
+        responses = _get_pool().map(_find_recording, unique_ids)
+
+    LOGGER.debug("Fetched %d recording(s) from RIO", len(unique_ids))
+    return dict(zip(unique_ids, responses))
@@ -0,0 +1,444 @@
+"""
+Local stand-in for the control plane APIs used by the tests: A8, RIO and NSA.
+
+The simulator keeps recordings in memory, moves them through their states on a compressible timeline and
+posts the status callbacks to the UpdateUrl of every entry, so framework changes can be exercised and
+benchmarked without a lab. Requests of the helpers to the A8, RIO and NSA hosts of the lab configuration are
+redirected to it by mounting an adapter for these hosts on the pooled HTTP session (see install), the other
+hosts are still reached directly.
+
+Endpoints are matched loosely, the way the helpers use them:
+    POST/PUT with a body holding Entries     A8 create / update, 204
+    DELETE with a body holding Entries       A8 delete, 204
+    DELETE .../<recording id>                A8 delete, 204
+    GET .../<recording id> or ?<key>=<id>    RIO find_recording, list with the recording, or an empty list
+    GET .../stream(s)/<stream id>            NSA get_stream
+
+Only the recording life cycle is simulated: COS storage details, segments and playback are not. The tests
+validating them (see get_cos_vle_calls) are skipped in a simulated run instead of failing on hosts that do not
+exist.
+
+Run standalone with:
+    python -m framework.simulator --port 8080 --time-scale 10 --fail-rate 0.1
+"""
+import argparse
+import BaseHTTPServer
+import calendar
+import datetime
+import json
+import logging
+import os
+import random
+import SocketServer
+import threading
+import time
+import types
+import urllib
+import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import framework.clock as clock
+import framework.http_session as http_session
+
+from helpers.constants import Component
+from helpers.constants import RecordingStatus
+from helpers.constants import TestLog
+
+LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
+
+PENDING = "PENDING"
+ENTRIES_KEY = "Entries"
+RECORDING_ID_KEY = "RecordingId"
+STATUS_KEY = "Status"
+TIME_FORMATS = ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S")
+# Granularity of the state machine
+TICK = 0.05
+NOTIFICATION_TIMEOUT = 5
+# Validators (and waits built on them) reading the COS storage of the recordings or playing them back through VLE
+COS_VLE_CALLS = frozenset([
+    "validate_recording_in_storage", "validate_copy_count", "validate_segments_threshold_storage",
+    "validate_recording_deletion", "validate_playback", "validate_playback_using_vle",
+    "validate_playback_using_hls_checker", "wait_for_storage", "wait_for_archival",
+])
+
+
+class SimulatorConfig(object):
+    """
+    Timing and failure injection of the simulator.
+    :param time_scale: factor by which the recording timeline is compressed, 10 runs a 60 seconds
+                       recording in 6 seconds
+    :param start_delay: seconds between the start time of a recording and its STARTED callback
+    :param complete_delay: seconds between the end time of a recording and its final callback
+    :param fail_rate: fraction of recordings ending FAILED instead of COMPLETE
+    :param reject_rate: fraction of A8 requests answered with an internal server error
+    :param latency: seconds added to every response
+    :param seed: seed of the failure injection, for reproducible runs
+    """
+
+    def __init__(self, time_scale=1.0, start_delay=0.0, complete_delay=0.0, fail_rate=0.0, reject_rate=0.0,
+                 latency=0.0, seed=None):
+        self.time_scale = float(time_scale)
+        self.start_delay = start_delay
+        self.complete_delay = complete_delay
+        self.fail_rate = fail_rate
+        self.reject_rate = reject_rate
+        self.latency = latency
+        self.seed = seed
+
+
+class SimulatedRecording(object):
+    """
+    State of one recording known by the simulator.
+    """
+
+    def __init__(self, entry, created_at, config, rng):
+        self.entry = entry
+        self.recording_id = entry[RECORDING_ID_KEY]
+        self.status = PENDING
+        self.update(entry, created_at, config, rng)
+
+    def update(self, entry, now, config, rng):
+        """
+        Apply a create or update request, the timeline is rebuilt from the new start and end times.
+        """
+        self.entry = entry
+        start = _parse_time(entry.get("StartTime"), now)
+        end = _parse_time(entry.get("EndTime"), start)
+        self.started_at = _compress(start, now, config.time_scale) + config.start_delay
+        self.ended_at = _compress(end, now, config.time_scale) + config.complete_delay
+        self.final_status = RecordingStatus.FAILED if rng.random() < config.fail_rate else RecordingStatus.COMPLETE
+        if self.status != PENDING and now < self.started_at:
+            self.status = PENDING
+
+    def advance(self, now):
+        """
+        Move the recording along its timeline.
+        :return: the new status, None when it did not change
+        """
+        if self.status == PENDING and now >= self.started_at:
+            self.status = RecordingStatus.STARTED
+            return self.status
+        if self.status == RecordingStatus.STARTED and now >= self.ended_at:
+            self.status = self.final_status
+            return self.status
+        return None
+
+    def to_rio(self):
+        response = dict(self.entry)
+        response[STATUS_KEY] = self.status
+        return response
+
+
+def _parse_time(value, default):
+    if not value:
+        return default
+    for time_format in TIME_FORMATS:
+        try:
+            return calendar.timegm(datetime.datetime.strptime(value, time_format).timetuple())
+        except ValueError:
+            continue
+    LOGGER.debug("Simulator: unparsable time %s", value)
+    return default
+
+
+def _compress(timestamp, now, time_scale):
+    return now + max(timestamp - now, 0) / time_scale
+
+
+class _ThreadingHTTPServer(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class _SimulatorHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    def _read_body(self):
+        length = int(self.headers.getheader("content-length", 0) or 0)
+        if not length:
+            return None
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return None
+
+    def _send(self, status_code, payload=None):
+        simulator = self.server.simulator
+        if simulator.config.latency:
+            time.sleep(simulator.config.latency)
+        body = json.dumps(payload) if payload is not None else ""
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _get_keys(self):
+        parsed = urlparse.urlparse(self.path)
+        segments = [urllib.unquote(segment) for segment in parsed.path.split("/") if segment]
+        query_values = [value for values in urlparse.parse_qs(parsed.query).values() for value in values]
+        return segments, query_values
+
+    def do_POST(self):
+        body = self._read_body()
+        if not isinstance(body, dict) or ENTRIES_KEY not in body:
+            self._send(404)
+            return
+        self._send(self.server.simulator.create(body[ENTRIES_KEY]))
+
+    do_PUT = do_POST
+
+    def do_DELETE(self):
+        body = self._read_body()
+        if isinstance(body, dict) and ENTRIES_KEY in body:
+            recording_ids = [entry.get(RECORDING_ID_KEY) for entry in body[ENTRIES_KEY]]
+        else:
+            segments, query_values = self._get_keys()
+            recording_ids = (segments[-1:] + query_values)[:1]
+        self._send(self.server.simulator.delete(recording_ids))
+
+    def do_GET(self):
+        simulator = self.server.simulator
+        segments, query_values = self._get_keys()
+
+        for key in reversed(query_values + segments):
+            recording = simulator.find(key)
+            if recording is not None:
+                self._send(200, [recording])
+                return
+
+        lowered = [segment.lower() for segment in segments]
+        for marker in ("stream", "streams"):
+            if marker in lowered and lowered.index(marker) + 1 < len(segments):
+                self._send(200, simulator.get_stream(segments[lowered.index(marker) + 1]))
+                return
+
+        # Unknown recording: RIO answers with an empty list
+        self._send(200, [])
+
+    def log_message(self, message_format, *args):
+        LOGGER.debug("Simulator: " + message_format, *args)
+
+
+class Simulator(object):
+    """
+    In-memory A8 / RIO / NSA served over HTTP.
+    """
+
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.config = config or SimulatorConfig()
+        self._host = host
+        self._port = port
+        self._recordings = {}
+        self._streams = {}
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.config.seed)
+        self._stopped = threading.Event()
+        self._httpd = None
+        self._threads = []
+        # Own session: the callbacks must not be redirected to the simulator by install()
+        self._notifier = requests.Session()
+
+    @property
+    def base_url(self):
+        return "http://%s:%s" % (self._host, self._httpd.server_address[1])
+
+    def start(self):
+        if self._httpd:
+            return self
+        self._stopped.clear()
+        self._httpd = _ThreadingHTTPServer((self._host, self._port), _SimulatorHandler)
+        self._httpd.simulator = self
+        self._threads = [threading.Thread(target=self._httpd.serve_forever, name="simulator-http"),
+                         threading.Thread(target=self._run_timeline, name="simulator-timeline")]
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+        LOGGER.info("Simulator listening on %s (time scale %s)", self.base_url, self.config.time_scale)
+        return self
+
+    def stop(self):
+        if not self._httpd:
+            return
+        self._stopped.set()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        for thread in self._threads:
+            thread.join()
+        self._httpd = None
+        self._threads = []
+        self._notifier.close()
+        LOGGER.info("Simulator stopped")
+
+    def _reject(self):
+        return self._rng.random() < self.config.reject_rate
+
+    def create(self, entries):
+        """
+        Create or update recordings.
+        :return: HTTP status code of the A8 response
+        """
+        if self._reject():
+            return requests.codes.internal_server_error
+        now = clock.now()
+        with self._lock:
+            for entry in entries:
+                recording_id = entry.get(RECORDING_ID_KEY)
+                if not recording_id:
+                    return requests.codes.bad_request
+                recording = self._recordings.get(recording_id)
+                if recording is None:
+                    recording = SimulatedRecording(entry, now, self.config, self._rng)
+                    self._recordings[recording_id] = recording
+                else:
+                    recording.update(entry, now, self.config, self._rng)
+                clock.schedule(recording.started_at)
+                clock.schedule(recording.ended_at)
+        return requests.codes.no_content
+
+    def delete(self, recording_ids):
+        """
+        :return: HTTP status code of the A8 response
+        """
+        if self._reject():
+            return requests.codes.internal_server_error
+        with self._lock:
+            for recording_id in recording_ids:
+                self._recordings.pop(recording_id, None)
+        return requests.codes.no_content
+
+    def find(self, recording_id):
+        """
+        :return: RIO view of the recording, None when unknown
+        """
+        with self._lock:
+            recording = self._recordings.get(recording_id)
+            return recording.to_rio() if recording else None
+
+    def add_stream(self, stream_id, **details):
+        with self._lock:
+            self._streams[stream_id] = details
+
+    def get_stream(self, stream_id):
+        with self._lock:
+            details = dict(self._streams.get(stream_id, {}))
+        details.setdefault("StreamId", stream_id)
+        return details
+
+    def _run_timeline(self):
+        while not self._stopped.wait(TICK):
+            now = clock.now()
+            changes = []
+            with self._lock:
+                for recording in self._recordings.values():
+                    status = recording.advance(now)
+                    if status:
+                        changes.append((recording.recording_id, recording.entry.get("UpdateUrl"), status))
+            for recording_id, url, status in changes:
+                self._notify(recording_id, url, status)
+
+    def _notify(self, recording_id, url, status):
+        LOGGER.debug("Simulator: recording %s is %s", recording_id, status)
+        if not url:
+            return
+        try:
+            self._notifier.post(url, json={RECORDING_ID_KEY: recording_id, STATUS_KEY: status},
+                                timeout=NOTIFICATION_TIMEOUT)
+        except requests.exceptions.RequestException as e:
+            LOGGER.debug("Simulator: callback of recording %s to %s failed: %s", recording_id, url, e)
+
+
+class SimulatorAdapter(HTTPAdapter):
+    """
+    Transport adapter sending every request to the simulator, keeping path, query and body.
+    """
+
+    def __init__(self, base_url, **kwargs):
+        super(SimulatorAdapter, self).__init__(**kwargs)
+        self._base_url = base_url
+
+    def send(self, request, **kwargs):
+        parsed = urlparse.urlparse(request.url)
+        request.url = urlparse.urlunparse(urlparse.urlparse(self._base_url)[:2] + parsed[2:])
+        return super(SimulatorAdapter, self).send(request, **kwargs)
+
+
+def get_control_plane_hosts(vmr_config):
+    """
+    Hosts of the VMR services (A8, RIO, NSA) in the VMR section of the lab configuration.
+    :return: sorted list of the IPs of the sub-sections declaring one
+    """
+    return sorted(set(section[Component.IP] for section in vmr_config.values()
+                      if isinstance(section, dict) and section.get(Component.IP)))
+
+
+def install(simulator, hosts):
+    """
+    Redirect the requests made through the pooled HTTP session (see http_session.install) to the given hosts,
+    whatever their port, to the simulator.
+    :param hosts: host names or IPs of the A8, RIO and NSA services
+    """
+    adapter = SimulatorAdapter(simulator.base_url)
+    session = http_session.get_session()
+    for host in hosts:
+        for scheme in ("http://", "https://"):
+            # Followed by a port or by the path, never by a longer host name
+            session.mount("%s%s:" % (scheme, host), adapter)
+            session.mount("%s%s/" % (scheme, host), adapter)
+    LOGGER.info("Requests to %s redirected to the simulator at %s", ", ".join(hosts), simulator.base_url)
+
+
+def _get_code_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _get_code_names(const)
+    return names
+
+
+def get_cos_vle_calls(function, _seen=None):
+    """
+    Validators of COS storage and VLE playback a test calls, directly or through the functions of the tests
+    package it calls (shared test bodies, sanity tests run as a check). These reach COS and VLE, which the
+    simulator does not stand in for.
+    :return: sorted list of the names of the validators called
+    """
+    seen = _seen if _seen is not None else set()
+    if function in seen:
+        return []
+    seen.add(function)
+    names = _get_code_names(function.func_code)
+    calls = set(names & COS_VLE_CALLS)
+    for name in names:
+        callee = function.func_globals.get(name)
+        if isinstance(callee, types.FunctionType) and callee.__module__.split(".")[0] == "tests":
+            calls.update(get_cos_vle_calls(callee, seen))
+    return sorted(calls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local A8 / RIO / NSA simulator")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--time-scale", type=float, default=1.0)
+    parser.add_argument("--start-delay", type=float, default=0.0)
+    parser.add_argument("--complete-delay", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--reject-rate", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG)
+    config = SimulatorConfig(args.time_scale, args.start_delay, args.complete_delay, args.fail_rate,
+                             args.reject_rate, args.latency, args.seed)
+    simulator = Simulator(config, args.host, args.port).start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Session wide pool of SSH connections to the lab components.
+
+utils.get_ssh_client and get_custom_ssh_client open a new connection, key exchange and authentication
+included, for every command run on a node, and the callers close it right after. The pool keeps one
+connection per host and user for the whole session: every exec_command opens a new channel on the shared
+transport, so several threads can run commands on the same node at once, and a connection found dead is
+reopened transparently. The clients handed out keep the paramiko SSHClient API, and their close() leaves the
+shared connection open.
+
+install() routes utils.get_ssh_client and get_custom_ssh_client (and so the helpers calling them, e.g.
+core_dump) through the pool.
+"""
+import logging
+import os
+import socket
+import threading
+
+import paramiko
+
+import helpers.utils as utils
+
+from helpers.constants import TestLog
+
+LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
+
+SSH_PORT = 22
+CONNECT_TIMEOUT = 30
+COMMAND_TIMEOUT = 120
+# Keeps idle connections open through firewalls and NAT between two uses
+KEEPALIVE_INTERVAL = 30
+CONNECTION_ERRORS = (paramiko.SSHException, socket.error, EOFError)
+
+_ORIGINALS = {}
+
+
+class PooledSshClient(object):
+    """
+    Shared connection to one host, handed out in place of a paramiko SSHClient.
+    """
+
+    def __init__(self, key, connect):
+        """
+        :param key: pool key, (host, username, port) for the connections opened by the pool
+        :param connect: function() -> connected paramiko SSHClient, called again to reconnect
+        """
+        self.key = key
+        self._connect = connect
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        with self._lock:
+            transport = self._client.get_transport() if self._client else None
+            if transport is None or not transport.is_active():
+                if self._client:
+                    LOGGER.debug("SSH connection %s lost, reconnecting", self.key)
+                    self._client.close()
+                self._client = self._connect()
+                if self._client is None:
+                    raise paramiko.SSHException("Unable to connect to %s" % (self.key,))
+                self._client.get_transport().set_keepalive(KEEPALIVE_INTERVAL)
+            return self._client
+
+    def _reset(self):
+        with self._lock:
+            if self._client:
+                self._client.close()
+                self._client = None
+
+    def exec_command(self, command, *args, **kwargs):
+        """
+        Same contract as SSHClient.exec_command, run on a new channel of the shared connection. A connection
+        broken since its last use is reopened once.
+        """
+        try:
+            return self._get_client().exec_command(command, *args, **kwargs)
+        except CONNECTION_ERRORS as e:
+            LOGGER.debug("SSH %s: %s, retrying on a new connection", self.key, e)
+            self._reset()
+            return self._get_client().exec_command(command, *args, **kwargs)
+
+    def get_transport(self):
+        return self._get_client().get_transport()
+
+    def close(self):
+        """
+        Kept open for the next user, see disconnect().
+        """
+
+    def disconnect(self):
+        self._reset()
+
+    def __getattr__(self, name):
+        return getattr(self._get_client(), name)
+
+
+class SshPool(object):
+    """
+    Pooled clients by key, created on first use.
+    """
+
+    def __init__(self):
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, connect):
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = PooledSshClient(key, connect)
+                self._clients[key] = client
+            return client
+
+    def close(self):
+        with self._lock:
+            clients = self._clients.values()
+            self._clients.clear()
+        for client in clients:
+            client.disconnect()
+        if clients:
+            LOGGER.debug("%d pooled SSH connection(s) closed", len(clients))
+
+
+_POOL = SshPool()
+
+
+def get_pool():
+    return _POOL
+
+
+def _connect(host, username, password, key_path, port):
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    client.connect(hostname=host, port=port, username=username, password=password, key_filename=key_path,
+                   timeout=CONNECT_TIMEOUT)
+    return client
+
+
+def get_client(host, username, password=None, key_path=None, port=SSH_PORT):
+    """
+    Pooled connection to host as username.
+    """
+    return _POOL.get((host, username, port), lambda: _connect(host, username, password, key_path, port))
+
+
+def _get_helper_client(name, *args, **kwargs):
+    # The helpers resolve the host and the credentials from their arguments, which identify the connection
+    key = (name, args, tuple(sorted(kwargs.items())))
+    original = _ORIGINALS.get(name) or getattr(utils, name)
+    return _POOL.get(key, lambda: original(*args, **kwargs))
+
+
+def get_ssh_client(*args, **kwargs):
+    """
+    Drop in replacement of utils.get_ssh_client served by the pool.
+    """
+    return _get_helper_client("get_ssh_client", *args, **kwargs)
+
+
+def get_custom_ssh_client(*args, **kwargs):
+    """
+    Drop in replacement of utils.get_custom_ssh_client served by the pool.
+    """
+    return _get_helper_client("get_custom_ssh_client", *args, **kwargs)
+
+
+def run(client, command, timeout=COMMAND_TIMEOUT, get_pty=False):
+    """
+    Run a command and read its whole output.
+    :return: (exit code, output)
+    """
+    stdin, stdout, stderr = client.exec_command(command, timeout=timeout, get_pty=get_pty)
+    output = stdout.read()
+    return stdout.channel.recv_exit_status(), output
+
+
+def install():
+    """
+    Route utils.get_ssh_client and get_custom_ssh_client through the pool.
+    """
+    if not _ORIGINALS:
+        for name, replacement in (("get_ssh_client", get_ssh_client),
+                                  ("get_custom_ssh_client", get_custom_ssh_client)):
+            _ORIGINALS[name] = getattr(utils, name)
+            setattr(utils, name, replacement)
+    LOGGER.debug("Pooled SSH connections installed")
+
+
+def uninstall():
+    for name, original in _ORIGINALS.items():
+        setattr(utils, name, original)
+    _ORIGINALS.clear()
+    _POOL.close()
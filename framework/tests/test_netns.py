@@ -0,0 +1,90 @@
+"""
+Checks of the namespace harness that do not need root: no namespace is created.
+
+    python -m pytest framework/tests
+"""
+import BaseHTTPServer
+import os
+import socket
+import stat
+import subprocess
+import threading
+
+import framework.netns as netns
+
+NAMESPACE = "dpns0"
+JOB = "tc qdisc del dev data0 root; echo 'reverted'"
+
+
+def _write_script(path, content):
+    with open(path, "w") as script:
+        script.write("#!/bin/sh\n" + content)
+    os.chmod(path, stat.S_IRWXU)
+    return path
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        self.send_error(404)
+
+    def log_message(self, *args):
+        pass
+
+
+def _get_free_port():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def test_namespace_client_command():
+    client = netns.NamespaceClient(NAMESPACE, at_path="/usr/bin/at")
+    assert client.get_command("tc qdisc show") == ["ip", "netns", "exec", NAMESPACE, "sh", "-c", "tc qdisc show"]
+
+
+def test_namespace_client_without_at():
+    client = netns.NamespaceClient(NAMESPACE)
+    client.at_path = None
+    assert client.get_environment()["PATH"] == os.environ["PATH"]
+
+
+def test_scheduled_job_runs_in_namespace(tmpdir):
+    submitted = tmpdir.join("job")
+    fake_at = _write_script(str(tmpdir.join("fake_at")), 'echo "$@" > %s.args; cat > %s\n' % (submitted, submitted))
+    client = netns.NamespaceClient(NAMESPACE, at_path=fake_at)
+
+    subprocess.check_call(["sh", "-c", 'echo "%s" | at now + 5 minutes' % JOB], env=client.get_environment())
+
+    assert tmpdir.join("job.args").read().strip() == "now + 5 minutes"
+    job = submitted.read()
+    assert job.splitlines()[0] == "ip netns exec %s sh <<'NETNS_JOB'" % NAMESPACE
+    assert JOB in job
+
+    # Run as atd would, with an ip stand-in running the command given after netns exec <namespace>
+    bin_dir = tmpdir.mkdir("bin")
+    _write_script(str(bin_dir.join("ip")), 'shift 3; exec "$@"\n')
+    _write_script(str(bin_dir.join("tc")), 'echo "tc $@"\n')
+    environment = dict(os.environ, PATH=os.pathsep.join([str(bin_dir), os.environ["PATH"]]))
+    output = subprocess.check_output(["sh", submitted.strpath], env=environment)
+    assert output.splitlines() == ["tc qdisc del dev data0 root", "reverted"]
+
+
+def test_probe_answered():
+    server = BaseHTTPServer.HTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    try:
+        loss, latency = netns.probe("http://127.0.0.1:%d/" % server.server_address[1], count=3)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert loss == 0
+    assert latency is not None
+
+
+def test_probe_unanswered():
+    assert netns.probe("http://127.0.0.1:%d/" % _get_free_port(), count=2, timeout=1) == (1, None)
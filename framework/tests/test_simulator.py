@@ -0,0 +1,80 @@
+"""
+Recording life cycle through the control plane stand-in, reached the way the helpers reach A8 and RIO: through
+the pooled HTTP session, at the hosts of the lab configuration.
+
+    python -m pytest framework/tests
+"""
+import time
+
+import pytest
+
+import framework.http_session as http_session
+import framework.simulator as simulator
+
+from helpers.constants import Component
+from helpers.constants import RecordingStatus
+
+A8_HOST = "a8.lab"
+RIO_HOST = "rio.lab"
+A8_URL = "http://%s:5000/a8/record" % A8_HOST
+RIO_URL = "http://%s/rio/recordings" % RIO_HOST
+RECORDING_ID = "simulated_recording"
+POLL_TIMEOUT = 5
+POLL_INTERVAL = 0.05
+
+
+@pytest.fixture
+def standin():
+    control_plane = simulator.Simulator(simulator.SimulatorConfig(seed=0)).start()
+    simulator.install(control_plane, [A8_HOST, RIO_HOST])
+    yield control_plane
+    http_session.uninstall()
+    control_plane.stop()
+
+
+def _find(recording_id):
+    response = http_session.request("GET", RIO_URL, params={"RecordingId": recording_id})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_control_plane_hosts():
+    vmr_config = {"a8": {Component.IP: "10.0.0.1"}, "rio": {Component.IP: "10.0.0.2"}, "user": "admin"}
+    assert simulator.get_control_plane_hosts(vmr_config) == ["10.0.0.1", "10.0.0.2"]
+
+
+def test_cos_vle_calls():
+    def recording_only(validate_recordings):
+        return validate_recordings.validate_notification()
+
+    def storage_and_playback(validate_storage, validate_recordings):
+        check = lambda: validate_recordings.validate_playback_using_vle()
+        return validate_storage.validate_recording_in_storage(), check()
+
+    assert simulator.get_cos_vle_calls(recording_only) == []
+    assert simulator.get_cos_vle_calls(storage_and_playback) == ["validate_playback_using_vle",
+                                                                 "validate_recording_in_storage"]
+
+
+def test_only_configured_hosts_redirected(standin):
+    session = http_session.get_session()
+    assert isinstance(session.get_adapter(A8_URL), simulator.SimulatorAdapter)
+    assert isinstance(session.get_adapter("https://%s/rio" % RIO_HOST), simulator.SimulatorAdapter)
+    assert not isinstance(session.get_adapter("http://v2pc.lab:8080/api"), simulator.SimulatorAdapter)
+    assert not isinstance(session.get_adapter("http://%s.other/a8" % A8_HOST), simulator.SimulatorAdapter)
+
+
+def test_create_poll_delete(standin):
+    entries = {"Entries": [{"RecordingId": RECORDING_ID}]}
+    assert http_session.request("POST", A8_URL, json=entries).status_code == 204
+
+    # No start or end time: the recording starts and completes right away
+    deadline = time.time() + POLL_TIMEOUT
+    found = _find(RECORDING_ID)
+    while found[0][simulator.STATUS_KEY] != RecordingStatus.COMPLETE and time.time() < deadline:
+        time.sleep(POLL_INTERVAL)
+        found = _find(RECORDING_ID)
+    assert found[0][simulator.STATUS_KEY] == RecordingStatus.COMPLETE
+
+    assert http_session.request("DELETE", A8_URL, json=entries).status_code == 204
+    assert _find(RECORDING_ID) == []
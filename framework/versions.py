@@ -0,0 +1,156 @@
+"""
+Inventory of the DP component versions.
+
+get_dp_version.py used to select each OpenShift project in turn with oc and parse the Image: lines of
+oc describe deployments. Here the deployments of the vmr, mpe-standalone and playoutbundle namespaces are read
+concurrently from the kubernetes API, together with their pods for the digest of the images actually running.
+The inventory is plain JSON, cached per lab in the temp directory so every run can stamp its report with the
+versions without reading the cluster again.
+"""
+import json
+import logging
+import multiprocessing.pool as mp_pool
+import os
+import time
+from collections import OrderedDict
+
+from kubernetes.client.rest import ApiException
+
+import framework.kube as kube
+import helpers.utils as utils
+
+from helpers.constants import TestDirectory
+from helpers.constants import TestLog
+
+LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
+
+VMR_NAMESPACE = "vmr"
+# The MPE is deployed in one or the other
+MPE_NAMESPACES = ("mpe-standalone", "playoutbundle")
+NAMESPACES = (VMR_NAMESPACE,) + MPE_NAMESPACES
+INVENTORY_TTL = 30 * 60
+INVENTORY_FILE = "dp_versions_%s.json"
+
+
+def parse_image(image):
+    """
+    :return: (repository, tag, digest) of an image reference, tag and digest None when absent
+    """
+    digest = None
+    if "@" in image:
+        image, digest = image.split("@", 1)
+    tag = None
+    name_start = image.rfind("/") + 1
+    if ":" in image[name_start:]:
+        image, tag = image.rsplit(":", 1)
+    return image, tag, digest
+
+
+def _get_running_digests(namespace):
+    """
+    :return: dict of image -> digest of the image the pods run (docker-pullable://repository@sha256:...)
+    """
+    digests = {}
+    for pod in kube.get_pods(namespace).items:
+        for status in (pod.status.container_statuses or []) if pod.status else []:
+            if status.image_id and "@" in status.image_id:
+                digests[status.image] = status.image_id.split("@", 1)[1]
+    return digests
+
+
+def read_namespace(namespace):
+    """
+    :return: OrderedDict of deployment name -> list of container images, None if the namespace is absent
+    """
+    try:
+        deployments = kube.get_apps_v1().list_namespaced_deployment(namespace).items
+        digests = _get_running_digests(namespace)
+    except ApiException as e:
+        if e.status in (403, 404):
+            return None
+        raise
+    inventory = OrderedDict()
+    for deployment in sorted(deployments, key=lambda deployment: deployment.metadata.name):
+        images = []
+        for container in deployment.spec.template.spec.containers:
+            repository, tag, digest = parse_image(container.image)
+            images.append(OrderedDict([("container", container.name), ("image", container.image),
+                                       ("repository", repository), ("tag", tag),
+                                       ("digest", digest or digests.get(container.image))]))
+        inventory[deployment.metadata.name] = images
+    return inventory
+
+
+def get_versions(namespaces):
+    """
+    Component versions as reported by get_dp_version.py: VMR image tags, MPE tag and VMP release.
+    """
+    versions = OrderedDict()
+    vmr_images = [image for images in (namespaces.get(VMR_NAMESPACE) or {}).values() for image in images]
+    versions["VMR"] = sorted(set(image["tag"] for image in vmr_images if "ZK" not in image["image"] and image["tag"]))
+    for namespace in MPE_NAMESPACES:
+        mpe_images = [image for images in (namespaces.get(namespace) or {}).values() for image in images]
+        if not mpe_images:
+            continue
+        vmp = [image["repository"].split("/")[-2] for image in mpe_images
+               if "vmp" in image["image"] and "mpe" not in image["image"] and image["repository"].count("/")]
+        mpe = [image["tag"] for image in mpe_images if "mpe" in image["image"]]
+        if vmp:
+            versions["VMP"] = sorted(set(vmp))[0]
+        if mpe:
+            versions["MPE"] = sorted(set(mpe))[0]
+        break
+    return versions
+
+
+def read_inventory(lab_name):
+    """
+    Read the namespaces concurrently.
+    :return: inventory dict
+    """
+    start = time.time()
+    pool = mp_pool.ThreadPool(processes=len(NAMESPACES))
+    try:
+        results = [(namespace, pool.apply_async(read_namespace, (namespace,))) for namespace in NAMESPACES]
+        namespaces = OrderedDict()
+        errors = OrderedDict()
+        for namespace, async_result in results:
+            try:
+                namespaces[namespace] = async_result.get()
+            except Exception as e:
+                namespaces[namespace] = None
+                errors[namespace] = "%s: %s" % (e.__class__.__name__, e)
+    finally:
+        pool.close()
+    LOGGER.debug("DP versions read in %.2f seconds", time.time() - start)
+    return OrderedDict([("lab", lab_name), ("taken_at", time.time()), ("versions", get_versions(namespaces)),
+                        ("namespaces", namespaces), ("errors", errors)])
+
+
+def _get_inventory_file(lab_name):
+    return os.path.join(utils.get_base_dir_path(), TestDirectory.TEMP_DIR, INVENTORY_FILE % lab_name)
+
+
+def get_inventory(lab_name, ttl=INVENTORY_TTL, refresh=False):
+    """
+    Versions of the lab, read from the cluster only when the cached inventory is older than ttl seconds or
+    incomplete.
+    :return: inventory dict
+    """
+    inventory_file = _get_inventory_file(lab_name)
+    if not refresh:
+        try:
+            with open(inventory_file) as cache:
+                inventory = json.load(cache, object_pairs_hook=OrderedDict)
+            if time.time() - inventory["taken_at"] < ttl and not inventory["errors"]:
+                return inventory
+        except (IOError, ValueError, KeyError):
+            pass
+
+    inventory = read_inventory(lab_name)
+    try:
+        with open(inventory_file, "w") as cache:
+            json.dump(inventory, cache, indent=2)
+    except IOError as e:
+        LOGGER.warning("Unable to cache the DP versions: %s", e)
+    return inventory
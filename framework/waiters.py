@@ -0,0 +1,133 @@
+"""
+Event driven waits on recording states.
+
+Waiters are resolved by the notification listener thread as callbacks arrive, so waiting on any number of
+recordings costs one blocked caller instead of one thread per recording.
+"""
+import datetime
+import logging
+import os
+import threading
+
+import framework.clock as clock
+import framework.notification as notification
+
+from helpers.constants import RecordingStatus
+from helpers.constants import TestLog
+
+LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
+
+
+class RecordingStateFuture(object):
+    """
+    Resolves once every tracked recording reported one of the expected statuses, or as soon as one of them
+    reported FAILED.
+    """
+
+    def __init__(self, server, recording_ids, statuses):
+        self._server = server
+        self._recording_ids = list(recording_ids)
+        self._statuses = set(statuses)
+        self._pending = set(self._recording_ids)
+        self._error = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+        server.add_observer(self, self._recording_ids)
+        # Notifications received before the waiter was created are replayed from the route history
+        for recording_id in self._recording_ids:
+            for received in server.register(recording_id).get_notifications():
+                self.notify(received)
+
+        if not self._pending:
+            self._resolve()
+
+    def notify(self, received):
+        with self._lock:
+            if self._done.is_set():
+                return
+            if received.status in self._statuses:
+                self._pending.discard(received.recording_id)
+            elif received.status == RecordingStatus.FAILED:
+                self._error = "Recording %s reported %s while waiting for %s" % (
+                    received.recording_id, RecordingStatus.FAILED, ",".join(self._statuses))
+
+            if self._error or not self._pending:
+                self._resolve()
+
+    def _resolve(self):
+        self._done.set()
+        self._server.remove_observer(self, self._recording_ids)
+
+    def done(self):
+        return self._done.is_set()
+
+    def get_pending(self):
+        with self._lock:
+            return sorted(self._pending)
+
+    def cancel(self):
+        with self._lock:
+            if not self._done.is_set():
+                self._error = "Wait cancelled"
+                self._resolve()
+
+    def result(self, timeout=None):
+        """
+        Block until the future resolves or the timeout expires.
+        :param timeout: maximum number of seconds to wait, None to wait forever
+        :return: (is_valid, error)
+        """
+        clock.wait(self._done, timeout)
+
+        with self._lock:
+            if not self._done.is_set():
+                pending = sorted(self._pending)
+                self._resolve()
+                return False, "Notification %s not received for %d recording(s): %s" % (
+                    ",".join(self._statuses), len(pending), ",".join(pending))
+            if self._error:
+                return False, self._error
+            return True, None
+
+
+def get_remaining_seconds(deadline):
+    """
+    Seconds left until the deadline.
+    :param deadline: datetime (UTC) or seconds since the epoch
+    """
+    if isinstance(deadline, datetime.datetime):
+        remaining = (deadline - clock.utcnow()).total_seconds()
+    else:
+        remaining = deadline - clock.now()
+    return max(remaining, 0)
+
+
+def expect_states(recording_ids, statuses, server=None):
+    """
+    Start tracking the recordings without blocking.
+    :param recording_ids: recordings to track
+    :param statuses: expected status, or a list of accepted statuses
+    :param server: notification server the recordings are registered on, the shared one by default
+    :return: RecordingStateFuture
+    """
+    if not isinstance(statuses, (list, tuple, set)):
+        statuses = [statuses]
+    return RecordingStateFuture(server or notification.get_notification_server(), recording_ids, statuses)
+
+
+def wait_for_states(recording_ids, statuses, deadline, server=None):
+    """
+    Wait until every recording reported one of the expected statuses.
+    :param recording_ids: recordings to wait for
+    :param statuses: expected status, or a list of accepted statuses
+    :param deadline: datetime (UTC) or seconds since the epoch after which the wait fails
+    :param server: notification server the recordings are registered on, the shared one by default
+    :return: (is_valid, error)
+    """
+    recording_ids = list(recording_ids)
+    future = expect_states(recording_ids, statuses, server)
+    is_valid, error = future.result(get_remaining_seconds(deadline))
+    LOGGER.debug("Wait for %s on %d recording(s): is_valid=%s error=%s", statuses, len(recording_ids),
+                 is_valid, error)
+    return is_valid, error
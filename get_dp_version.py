@@ -1,23 +1,27 @@
-import subprocess
-import sys
 import argparse
+import json
 import os
-# kubectl describe deployments | grep Image
+
+from kubernetes import config
+
+import framework.versions as versions
+# Deployment images read through the kubernetes API, see framework/versions.py
 
 
 class dp_version():
     def __init__(self):
         parser = argparse.ArgumentParser()
         parser.add_argument('-l', required=True, dest='lab_name', help="Provide labname")
+        parser.add_argument('--refresh', action='store_true', help="Ignore the cached versions of the lab")
         args = parser.parse_args()
         self.lab_name = args.lab_name
+        self.refresh = args.refresh
+        self.inventory = None
 
         print "Lab :", self.lab_name
 
         if not self._get_kubeconfig():
-            return False
-        if not self.select_project():
-            return False
+            return
 
     def _get_kubeconfig(self):
         dir_path = os.path.dirname(os.path.abspath(__file__))
@@ -29,98 +33,41 @@ class dp_version():
         print "KubeConfig :", kube_config
         if os.path.exists(kube_config):
             os.environ['KUBECONFIG'] = kube_config
+            config.load_kube_config(config_file=kube_config)
             return True
         else:
             print "Kubecofig file not found"
             return False
 
-    def select_project(self, project="vmr"):
-        try:
-            subprocess.check_output("oc project %s" % project, shell=True)
-            return True
-        except Exception as e:
-            return False
+    def get_inventory(self):
+        if self.inventory is None:
+            self.inventory = versions.get_inventory(self.lab_name, refresh=self.refresh)
+        return self.inventory
 
-    def get_vmr_version(self, vmr_deployment="vmr"):
+    def get_vmr_version(self, vmr_deployment=versions.VMR_NAMESPACE):
         try:
-            vmr_version = []
-            if not self.select_project(vmr_deployment):
-                msg = "Deployment %s not present " % vmr_deployment
+            inventory = self.get_inventory()
+            if inventory["namespaces"].get(vmr_deployment) is None:
+                msg = inventory["errors"].get(vmr_deployment, "Deployment %s not present " % vmr_deployment)
                 return False, msg
 
-            cmd = "oc describe deployments | grep Image:"
-
-            code, details = self.execute_cmd(cmd)
-            if code != 0:
-                # print details
-                return False, details
-            # print details
-            for ln in details.split("\n"):
-                if "ZK" not in ln:
-                    vmr_version.append(ln.split(":")[-1])
-
-            return True, list(set(vmr_version))
+            return True, inventory["versions"]["VMR"]
 
         except Exception as e:
-            # print str(e)
             return False, str(e)
 
-    def get_mpe_version(self, mpe_deployment="mpe-standalone"):
+    def get_mpe_version(self):
         try:
-            mpe_version = {}
-            if self.select_project(mpe_deployment):
-                pass
-            elif self.select_project("playoutbundle"):
-                pass
-            else:
-                msg = "Project mpe-standalone / playoutbundle not present"
+            inventory = self.get_inventory()
+            if all(inventory["namespaces"].get(namespace) is None for namespace in versions.MPE_NAMESPACES):
+                msg = "Project %s not present" % " / ".join(versions.MPE_NAMESPACES)
                 return False, msg
 
-            cmd = "oc describe deployments | grep Image:"
-
-            code, details = self.execute_cmd(cmd)
-            if code != 0:
-                return False, details
-
-            vmp_temp = []
-            mpe_temp = []
-            for ln in details.split("\n"):
-                if "vmp" in ln and "mpe" not in ln:
-                    image_det = ln.split(":")[1]
-                    vmp_temp.append(image_det.split("/")[-2])
-                if "mpe" in ln:
-                    mpe_temp.append(ln.split(":")[-1])
-
-            if vmp_temp:
-                mpe_version["VMP"]=list(set(vmp_temp))[0]
-            if mpe_temp:
-                mpe_version["MPE"]=list(set(mpe_temp))[0]
-
-            return True, mpe_version
+            return True, dict((k, v) for k, v in inventory["versions"].items() if k != "VMR")
 
         except Exception as e:
             return False, str(e)
 
-    def execute_cmd(self, command):
-        """
-        Execute a command on the local machine.
-        :param command: the command to execute
-        :return: (process return/exit code, the output of the executed command)
-        """
-
-        process_return_code = 1  # Can be any non-zero value
-        output = None
-
-        try:
-            process_handler = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-            output, error = process_handler.communicate()  # error contains None, since stderr is also redirected to STDOUT
-            process_return_code = process_handler.returncode
-
-        except (ValueError, OSError, BaseException) as e:
-            print "Unable to execute local command=%s, exception=%s" % (command, e)
-
-        return process_return_code, output.strip()
-
 
 if __name__ == "__main__":
     run = dp_version()
@@ -128,12 +75,14 @@ if __name__ == "__main__":
     vmr_res, vmr_ver = run.get_vmr_version()
     if not vmr_res:
         print "Unable to get the VMR version : ", vmr_ver
+        vmr_ver = []
 
     vmr = ",".join(vmr_ver)
 
     mpe_res, mpe_ver = run.get_mpe_version()
     if not mpe_res:
         print "Unable to get the MPE version :", mpe_ver
+        mpe_ver = {}
 
     print "VMR : ", vmr
     for k,v in mpe_ver.items():
@@ -145,5 +94,7 @@ if __name__ == "__main__":
             fp.write("%s : %s" % (k, v))
             fp.write("\n")
 
-
-
+    # Images and digests of every deployment, for the report
+    if run.inventory is not None:
+        with open("dp_versions.json", "w") as fp:
+            json.dump(run.inventory, fp, indent=2)
@@ -1,4 +1,3 @@
-import time
 import Queue
 import logging
 import datetime
@@ -16,6 +15,7 @@ import helpers.notification.utils as notification_utils
 import validators.validate_common as validate_common
 import validators.validate_recordings as validate_recordings
 import validators.validate_storage as validate_storage
+import framework.clock as clock
 
 from helpers.constants import Cos
 from helpers.constants import Stream
@@ -42,7 +42,7 @@ def test_rtc9757_tc_rec_011_delete_before_recording_start(stream):
 
     assert is_valid, error
 
-    time.sleep(constants.SECONDS * 60)
+    clock.sleep(constants.SECONDS * 60)
     response = a8.delete_recording(recording)
     is_valid, error = validate_common.validate_http_response_status_code(response, requests.codes.no_content)
 
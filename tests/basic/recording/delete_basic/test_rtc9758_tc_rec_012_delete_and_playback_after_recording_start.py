@@ -1,4 +1,3 @@
-import time
 import Queue
 import logging
 import datetime
@@ -16,6 +15,7 @@ import helpers.notification.utils as notification_utils
 import validators.validate_common as validate_common
 import validators.validate_recordings as validate_recordings
 import validators.validate_storage as validate_storage
+import framework.clock as clock
 
 from helpers.constants import Cos
 from helpers.constants import Stream
@@ -65,7 +65,7 @@ def test_rtc9758_tc_rec_012_IPDVRTESTS_52_delete_and_playback_after_recording_st
 
         assert is_valid, error
 
-        time.sleep(15 * constants.SECONDS)
+        clock.sleep(15 * constants.SECONDS)
         delete_time = utils.get_formatted_time(constants.SECONDS * 0, TimeFormat.TIME_FORMAT_MS, stream)
         response = a8.delete_recording(recording)
         is_valid, error = validate_common.validate_http_response_status_code(response, requests.codes.no_content)
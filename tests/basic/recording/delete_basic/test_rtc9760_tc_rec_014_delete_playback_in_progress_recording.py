@@ -1,4 +1,3 @@
-import time
 import Queue
 import logging
 import datetime
@@ -16,6 +15,7 @@ import helpers.notification.utils as notification_utils
 import validators.validate_common as validate_common
 import validators.validate_recordings as validate_recordings
 import validators.validate_storage as validate_storage
+import framework.clock as clock
 
 from helpers.constants import Cos
 from helpers.constants import Stream
@@ -63,7 +63,7 @@ def test_rtc9760_tc_rec_014_delete_playback_in_progress_recording(stream):
         playback_pool = mp_pool.ThreadPool(processes=1)
         playback_pool.apply_async(validate_recordings.validate_playback_using_vle, (recording_id,), callback=queue.put)
 
-        time.sleep(10 * constants.SECONDS)
+        clock.sleep(10 * constants.SECONDS)
         response = a8.delete_recording(recording)
         is_valid, error = validate_common.validate_http_response_status_code(response, requests.codes.no_content)
 
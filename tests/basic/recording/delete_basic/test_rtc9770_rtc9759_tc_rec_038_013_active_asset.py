@@ -9,7 +9,6 @@ import requests
 
 import helpers.utils as utils
 import helpers.constants as constants
-import helpers.vmr.rio.api as rio
 import helpers.vmr.a8.a8_helper as a8
 import helpers.models.recording as recording_model
 import helpers.notification.utils as notification_utils
@@ -23,6 +22,7 @@ from helpers.constants import TestLog
 from helpers.constants import TimeFormat
 from helpers.constants import ValidationError
 from helpers.constants import RecordingAttribute
+from framework.rio import find_recordings
 
 pytestmark = pytest.mark.recording
 LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER",TestLog.TEST_LOGGER))
@@ -72,8 +72,9 @@ def test_tc_rec_038_013_active_asset(stream, name, total_recording):
             is_valid, error = queue.get()
             assert is_valid, error
 
+        responses = find_recordings([recording_id_list[i] for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording_id_list[i]).json()
+            response = responses[recording_id_list[i]]
             is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ACTIVE_STORAGE,
                                                                              Cos.RECORDING_STORED)
             assert is_valid, error
@@ -1,4 +1,3 @@
-import time
 import Queue
 import logging
 import datetime
@@ -9,13 +8,13 @@ import requests
 
 import helpers.utils as utils
 import helpers.constants as constants
-import helpers.vmr.rio.api as rio
 import helpers.vmr.a8.a8_helper as a8
 import helpers.models.recording as recording_model
 import helpers.notification.utils as notification_utils
 import validators.validate_common as validate_common
 import validators.validate_recordings as validate_recordings
 import validators.validate_storage as validate_storage
+import framework.clock as clock
 
 from helpers.constants import Cos
 from helpers.constants import Stream
@@ -25,6 +24,7 @@ from helpers.constants import ValidationError
 from helpers.constants import RecordingAttribute
 from helpers.constants import Vle
 from helpers.vle import vle_validators_configuration
+from framework.rio import find_recordings
 
 pytestmark = pytest.mark.recording
 LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER",TestLog.TEST_LOGGER))
@@ -70,12 +70,13 @@ def test_tc_rec_active_unique_asset(stream, name, total_recording):
             is_valid, error = queue.get()
             assert is_valid, error
 
+        responses = find_recordings([recording_id_list[i] for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording_id_list[i]).json()
+            response = responses[recording_id_list[i]]
             is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ACTIVE_STORAGE,
                                                                              Cos.RECORDING_STORED)
             assert is_valid, error
-        time.sleep(20)
+        clock.sleep(20)
         for i in range(total_recording):
             is_valid, error = validate_recordings.validate_playback(recording.get_entry(i).RecordingId)
             assert is_valid, error
@@ -8,22 +8,21 @@ import requests
 import os
 import helpers.utils as utils
 import helpers.constants as constants
-import helpers.vmr.rio.api as rio
 import helpers.vmr.a8.a8_helper as a8
-import helpers.vmr.archive_helper as archive_helper
 import helpers.models.recording as recording_model
 import helpers.notification.utils as notification_utils
 import validators.validate_common as validate_common
 import validators.validate_storage as validate_storage
 import validators.validate_recordings as validate_recordings
+import framework.poller as poller
 
 from helpers.constants import Stream
 from helpers.constants import Cos
 from helpers.constants import TestLog
-from helpers.constants import Archive
 from helpers.constants import TimeFormat
 from helpers.constants import ValidationError
 from helpers.constants import RecordingAttribute
+from framework.rio import find_recordings
 
 pytestmark = pytest.mark.recording
 LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER",TestLog.TEST_LOGGER))
@@ -72,15 +71,17 @@ def test_tc_rec_033_015_(total_recording, stream, name, copy_type):
             is_valid, error = queue.get()
             assert is_valid, error
 
+        responses = find_recordings([recording.get_entry(i).RecordingId for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording.get_entry(i).RecordingId).json()
+            response = responses[recording.get_entry(i).RecordingId]
             is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ACTIVE_STORAGE,
                                                                              Cos.RECORDING_STORED)
 
             assert is_valid, error
 
+        responses = find_recordings([recording.get_entry(i).RecordingId for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording.get_entry(i).RecordingId).json()
+            response = responses[recording.get_entry(i).RecordingId]
             is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ACTIVE_STORAGE,
                                                                              Cos.RECORDING_STORED)
 
@@ -93,10 +94,12 @@ def test_tc_rec_033_015_(total_recording, stream, name, copy_type):
                 assert is_valid, error
 
         if copy_type == RecordingAttribute.COPY_TYPE_UNIQUE:
-            archive_helper.wait_for_archival(stream, recording.get_entry(0).RecordingId, Archive.ARCHIVE,
-                                             Archive.COMPLETE)
+            archived_ids = [recording.get_entry(i).RecordingId for i in range(total_recording)]
+            is_valid, error = poller.wait_for_archival(archived_ids)
+            assert is_valid, error
+            responses = find_recordings([recording.get_entry(i).RecordingId for i in range(total_recording)])
             for i in range(total_recording):
-                response = rio.find_recording(recording.get_entry(i).RecordingId).json()
+                response = responses[recording.get_entry(i).RecordingId]
                 is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ARCHIVE_STORAGE,
                                                                                  Cos.RECORDING_STORED)
                 assert is_valid, error
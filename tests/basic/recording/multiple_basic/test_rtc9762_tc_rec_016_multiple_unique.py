@@ -8,7 +8,6 @@ import requests
 import os
 import helpers.utils as utils
 import helpers.constants as constants
-import helpers.vmr.rio.api as rio
 import helpers.vmr.a8.a8_helper as a8
 import helpers.vmr.archive_helper as archive_helper
 import helpers.models.recording as recording_model
@@ -24,6 +23,7 @@ from helpers.constants import Archive
 from helpers.constants import TimeFormat
 from helpers.constants import ValidationError
 from helpers.constants import RecordingAttribute
+from framework.rio import find_recordings
 
 pytestmark = pytest.mark.recording
 LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER",TestLog.TEST_LOGGER))
@@ -71,8 +71,9 @@ def test_rtc9762_tc_rec_016_multiple_unique(stream):
             is_valid, error = queue.get()
             assert is_valid, error
 
+        responses = find_recordings([recording.get_entry(i).RecordingId for i in range(total_recordings)])
         for i in range(total_recordings):
-            response = rio.find_recording(recording.get_entry(i).RecordingId).json()
+            response = responses[recording.get_entry(i).RecordingId]
             is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ACTIVE_STORAGE,
                                                                              Cos.RECORDING_STORED, i)
 
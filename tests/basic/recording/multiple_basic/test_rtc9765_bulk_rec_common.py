@@ -5,18 +5,16 @@ import multiprocessing.pool as mp_pool
 import datetime
 import time
 import pytest
-import requests
 import os
 import helpers.utils as utils
 import helpers.constants as constants
-import helpers.vmr.rio.api as rio
 import helpers.vmr.a8.a8_helper as a8
 import helpers.vmr.archive_helper as archive_helper
 import helpers.models.recording as recording_model
-import helpers.notification.utils as notification_utils
-import validators.validate_common as validate_common
-import validators.validate_storage as validate_storage
 import validators.validate_recordings as validate_recordings
+import framework.a8 as a8_bulk
+import framework.clock as clock
+import framework.poller as poller
 
 from helpers.constants import Stream
 from helpers.constants import Cos
@@ -39,7 +37,7 @@ TC_REC_DATA = [("rtc9765_bulk_recordings_common", RecordingAttribute.COPY_TYPE_C
 @pytest.mark.parametrize("total_recording", TOTAL_RECORDINGS_LIST)
 @pytest.mark.parametrize("name, copy_type", TC_REC_DATA)
 
-def test_tc_rec_033_015_(total_recording, stream, name, copy_type):
+def test_tc_rec_033_015_(total_recording, stream, name, copy_type, notification_server):
     """
     Create multiple recordings with copy type as COMMON
     """
@@ -57,15 +55,16 @@ def test_tc_rec_033_015_(total_recording, stream, name, copy_type):
                                               copyType=copy_type, StreamId=stream)
         for i in range(total_recording):
             recording_id = recording.get_entry(i).RecordingId
-            web_service_objects.append(notification_utils.get_web_service_object(recording_id))
+            web_service_objects.append(notification_server.register(recording_id))
             recording.get_entry(i).UpdateUrl = web_service_objects[i].get_url()
 
         LOGGER.debug("Recording instance created=%s", recording.serialize())
-        response = a8.create_recording(recording)
-        is_valid, error = validate_common.validate_http_response_status_code(response, requests.codes.no_content)
+        results = a8_bulk.create_recordings(recording)
+        is_valid, error = a8_bulk.validate_results(results)
 
         assert is_valid, error
 
+        # The validators are fed the routes of the shared listener, in place of one web service per recording
         recording_pool = mp_pool.ThreadPool(processes=total_recording)
         for i in range(total_recording):
             recording_pool.apply_async(validate_recordings.validate_recording,
@@ -75,13 +74,14 @@ def test_tc_rec_033_015_(total_recording, stream, name, copy_type):
             is_valid, error = queue.get()
             assert is_valid, error
 
-        for i in range(total_recording):
-            response = rio.find_recording(recording.get_entry(i).RecordingId).json()
-            is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ACTIVE_STORAGE,
-                                                                             Cos.RECORDING_STORED)
-            assert is_valid, error
+        recording_ids = [recording.get_entry(i).RecordingId for i in range(total_recording)]
+
+        # Checked by polling rather than after a fixed sleep: the recordings leave the active storage once
+        # archived, so the check has to happen as soon as they are stored, whatever the archive time is.
+        is_valid, error = poller.wait_for_storage(recording_ids, Cos.ACTIVE_STORAGE, Cos.RECORDING_STORED,
+                                                  clock.now() + constants.SECONDS * 60)
+        assert is_valid, error
 
-            #time.sleep(20) #THIS SLEEP CAUSES THE TEST TO FAIL IF THE ARCHIVE TIME IS SET TO 4 MINUTES
         for i in range(total_recording):
             is_valid, error = validate_recordings.validate_playback(recording.get_entry(i).RecordingId)
             assert is_valid, error
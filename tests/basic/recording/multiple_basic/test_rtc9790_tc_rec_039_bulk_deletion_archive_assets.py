@@ -8,22 +8,22 @@ import requests
 import os
 import helpers.utils as utils
 import helpers.constants as constants
-import helpers.vmr.rio.api as rio
 import helpers.vmr.a8.a8_helper as a8
-import helpers.vmr.archive_helper as archive_helper
 import helpers.models.recording as recording_model
 import helpers.notification.utils as notification_utils
 import validators.validate_common as validate_common
 import validators.validate_storage as validate_storage
 import validators.validate_recordings as validate_recordings
+import framework.a8 as a8_bulk
+import framework.poller as poller
 
 from helpers.constants import Stream
 from helpers.constants import Cos
 from helpers.constants import TestLog
-from helpers.constants import Archive
 from helpers.constants import TimeFormat
 from helpers.constants import ValidationError
 from helpers.constants import RecordingAttribute
+from framework.rio import find_recordings
 
 pytestmark = pytest.mark.recording
 LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER",TestLog.TEST_LOGGER))
@@ -75,10 +75,12 @@ def test_rtc9790_tc_rec_039_bulk_deletion_archive_assets(total_recording, stream
             is_valid, error = queue.get()
             assert is_valid, error
 
-        archive_helper.wait_for_archival(stream, recording_id_list[0], Archive.ARCHIVE, Archive.COMPLETE)
+        is_valid, error = poller.wait_for_archival(recording_id_list)
+        assert is_valid, error
 
+        responses = find_recordings([recording.get_entry(i).RecordingId for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording.get_entry(i).RecordingId).json()
+            response = responses[recording.get_entry(i).RecordingId]
             is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ACTIVE_STORAGE,
                                                                              Cos.RECORDING_NOT_STORED)
             assert is_valid, error
@@ -87,10 +89,11 @@ def test_rtc9790_tc_rec_039_bulk_deletion_archive_assets(total_recording, stream
                                                                              Cos.RECORDING_STORED)
             assert is_valid, error
 
-        response = a8.delete_recording(recording)
-        is_valid, error = validate_common.validate_http_response_status_code(response, requests.codes.no_content)
+        results = a8_bulk.delete_recordings(recording)
+        is_valid, error = a8_bulk.validate_results(results)
         assert is_valid, error
 
+        # RIO only tells the recordings are gone, the archive and active storage cleanup is validated per recording
         for i in range(total_recording):
             is_valid, error = validate_recordings.validate_recording_deletion(recording_id_list[i])
             assert is_valid, error
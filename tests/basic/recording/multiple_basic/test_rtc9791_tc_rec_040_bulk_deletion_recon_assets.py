@@ -8,7 +8,6 @@ import requests
 import os
 import helpers.utils as utils
 import helpers.constants as constants
-import helpers.vmr.rio.api as rio
 import helpers.vmr.a8.a8_helper as a8
 import helpers.vmr.archive_helper as archive_helper
 import helpers.models.recording as recording_model
@@ -24,6 +23,7 @@ from helpers.constants import Archive
 from helpers.constants import TimeFormat
 from helpers.constants import ValidationError
 from helpers.constants import RecordingAttribute
+from framework.rio import find_recordings
 
 pytestmark = pytest.mark.recording
 LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER",TestLog.TEST_LOGGER))
@@ -80,8 +80,9 @@ def test_rtc9791_tc_rec_040_bulk_deletion_recon_assets(total_recording, stream):
 
         archive_helper.wait_for_archival(stream, recording_id_list[0], Archive.ARCHIVE, Archive.COMPLETE)
 
+        responses = find_recordings([recording.get_entry(i).RecordingId for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording.get_entry(i).RecordingId).json()
+            response = responses[recording.get_entry(i).RecordingId]
 
             is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ARCHIVE_STORAGE,
                                                                              Cos.RECORDING_STORED)
@@ -101,8 +102,9 @@ def test_rtc9791_tc_rec_040_bulk_deletion_recon_assets(total_recording, stream):
             is_valid, error = queue.get()
             assert is_valid, error
 
+        responses = find_recordings([recording.get_entry(i).RecordingId for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording.get_entry(i).RecordingId).json()
+            response = responses[recording.get_entry(i).RecordingId]
 
             is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ARCHIVE_STORAGE,
                                                                              Cos.RECORDING_STORED)
@@ -1,7 +1,6 @@
 import Queue
 import datetime
 import logging
-import time
 import multiprocessing.pool as mp_pool
 import os
 import pytest
@@ -17,6 +16,7 @@ import helpers.vmr.rio.api as rio
 import validators.validate_common as validate_common
 import validators.validate_storage as validate_storage
 import validators.validate_recordings as validate_recordings
+import framework.clock as clock
 
 from helpers.constants import Cos
 from helpers.constants import Archive
@@ -77,14 +77,14 @@ def test_rtc9756_tc_rec_010_recording_stop_after_recording_start(stream):
 
         assert is_valid, error
 
-        time.sleep(constants.SECONDS * 60)
+        clock.sleep(constants.SECONDS * 60)
         recording.get_entry(0).EndTime = utils.get_formatted_time(constants.SECONDS * 0, TimeFormat.TIME_FORMAT_MS, stream)
         response = a8.create_recording(recording)
         is_valid, error = validate_common.validate_http_response_status_code(response, requests.codes.no_content)
 
         assert is_valid, error
 
-        time.sleep(constants.SECONDS * 4)
+        clock.sleep(constants.SECONDS * 4)
         is_valid, error = validate_recordings.validate_recording_end_state(recording_id, [RecordingStatus.COMPLETE],
                                                                            web_service_obj=web_service_obj)
         assert is_valid, error
@@ -13,7 +13,6 @@ import helpers.notification.utils as notification_utils
 import helpers.utils as utils
 import helpers.vmr.a8.a8_helper as a8
 import helpers.vmr.archive_helper as archive_helper
-import helpers.vmr.rio.api as rio
 import validators.validate_common as validate_common
 import validators.validate_storage as validate_storage
 import validators.validate_recordings as validate_recordings
@@ -25,6 +24,7 @@ from helpers.constants import RecordingStatus
 from helpers.constants import TestLog
 from helpers.constants import TimeFormat
 from helpers.constants import Stream
+from framework.rio import find_recordings
 
 pytestmark = pytest.mark.recording
 LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER",TestLog.TEST_LOGGER))
@@ -67,8 +67,9 @@ def test_tc_rec_008_034_(total_recording, stream, name, copy_type):
 
         assert is_valid, error
         recording_pool = mp_pool.ThreadPool(processes=total_recording)
+        responses = find_recordings([recording_id_list[i] for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording_id_list[i]).json()
+            response = responses[recording_id_list[i]]
             LOGGER.debug("Response=%s", response)
             start_time = response[0][RecordingAttribute.START_TIME][:-1]
             LOGGER.debug("Scheduled start time of recording=%s is %s", recording_id_list[i], start_time)
@@ -84,8 +85,9 @@ def test_tc_rec_008_034_(total_recording, stream, name, copy_type):
         assert is_valid, error
 
         # Validating whether the updated start time was populated or not
+        responses = find_recordings([recording_id_list[i] for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording_id_list[i]).json()
+            response = responses[recording_id_list[i]]
             LOGGER.debug("Response=%s", response)
             is_valid, error = validate_recordings.validate_time(response, recording.get_entry(i).StartTime,
                                                                 RecordingAttribute.START_TIME)
@@ -100,8 +102,9 @@ def test_tc_rec_008_034_(total_recording, stream, name, copy_type):
             is_valid, error = queue.get()
             assert is_valid, error
 
+        responses = find_recordings([recording.get_entry(i).RecordingId for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording.get_entry(i).RecordingId).json()
+            response = responses[recording.get_entry(i).RecordingId]
             is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ACTIVE_STORAGE,
                                                                              Cos.RECORDING_STORED)
 
@@ -116,8 +119,9 @@ def test_tc_rec_008_034_(total_recording, stream, name, copy_type):
         if copy_type == RecordingAttribute.COPY_TYPE_UNIQUE:
             archive_helper.wait_for_archival(stream, recording.get_entry(0).RecordingId, Archive.ARCHIVE,
                                              Archive.COMPLETE)
+            responses = find_recordings([recording.get_entry(i).RecordingId for i in range(total_recording)])
             for i in range(total_recording):
-                response = rio.find_recording(recording.get_entry(i).RecordingId).json()
+                response = responses[recording.get_entry(i).RecordingId]
                 is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ARCHIVE_STORAGE,
                                                                                  Cos.RECORDING_STORED)
                 assert is_valid, error
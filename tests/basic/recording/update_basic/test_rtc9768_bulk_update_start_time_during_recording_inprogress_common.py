@@ -11,13 +11,13 @@ import helpers.models.recording as recording_model
 import helpers.notification.utils as notification_utils
 import helpers.utils as utils
 import helpers.vmr.a8.a8_helper as a8
-import helpers.vmr.rio.api as rio
 import validators.validate_common as validate_common
 import validators.validate_recordings as validate_recordings
 
 from helpers.constants import RecordingAttribute
 from helpers.constants import TestLog
 from helpers.constants import TimeFormat
+from framework.rio import find_recordings
 
 pytestmark = pytest.mark.recording
 LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
@@ -82,8 +82,9 @@ def test_rtc9768_bulk_update_start_time_during_recording_inprogress_common(total
         # Change the start times in the recording object instance
         LOGGER.info("UPDATE START TIMES IN RECORDING OBJECT INSTANCE")
         original_start_times = []
+        responses = find_recordings([recording_id_list[i] for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording_id_list[i]).json()
+            response = responses[recording_id_list[i]]
             # Save original start times for verification step later
             original_start_times.append(response[0][RecordingAttribute.START_TIME])
             # Change start time +10 seconds
@@ -102,8 +103,9 @@ def test_rtc9768_bulk_update_start_time_during_recording_inprogress_common(total
 
         # Verify that the updated start time was NOT populated
         LOGGER.info("VERIFY UNCHANGED START TIMES FOR RECORDINGS")
+        responses = find_recordings([recording_id_list[i] for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording_id_list[i]).json()
+            response = responses[recording_id_list[i]]
             is_valid, error = validate_recordings.validate_time(response, original_start_times[i],
                                                                 RecordingAttribute.START_TIME)
             assert is_valid, error
@@ -25,6 +25,7 @@ from helpers.constants import RecordingStatus
 from helpers.constants import TestLog
 from helpers.constants import TimeFormat
 from helpers.constants import Stream
+from framework.rio import find_recordings
 
 pytestmark = pytest.mark.recording
 LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER",TestLog.TEST_LOGGER))
@@ -88,8 +89,9 @@ def test_rtc9769_tc_rec_037_(total_recording, stream, name, copy_type):
             assert is_valid, error
 
         # Updating the end time
+        responses = find_recordings([recording_id_list[i] for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording_id_list[i]).json()
+            response = responses[recording_id_list[i]]
             LOGGER.debug("Response=%s", response)
             end_time = response[0][RecordingAttribute.END_TIME][:-1]
             LOGGER.debug("Scheduled end time of recording=%s is %s", recording_id, end_time)
@@ -117,8 +119,9 @@ def test_rtc9769_tc_rec_037_(total_recording, stream, name, copy_type):
             is_valid, error = queue.get()
             assert is_valid, error
 
+        responses = find_recordings([recording.get_entry(i).RecordingId for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording.get_entry(i).RecordingId).json()
+            response = responses[recording.get_entry(i).RecordingId]
             is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ACTIVE_STORAGE,
                                                                              Cos.RECORDING_STORED)
 
@@ -133,8 +136,9 @@ def test_rtc9769_tc_rec_037_(total_recording, stream, name, copy_type):
         if copy_type == RecordingAttribute.COPY_TYPE_UNIQUE:
             archive_helper.wait_for_archival(stream, recording.get_entry(0).RecordingId, Archive.ARCHIVE,
                                              Archive.COMPLETE)
+            responses = find_recordings([recording.get_entry(i).RecordingId for i in range(total_recording)])
             for i in range(total_recording):
-                response = rio.find_recording(recording.get_entry(i).RecordingId).json()
+                response = responses[recording.get_entry(i).RecordingId]
                 is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ARCHIVE_STORAGE,
                                                                                  Cos.RECORDING_STORED)
                 assert is_valid, error
@@ -150,8 +154,9 @@ def test_rtc9769_tc_rec_037_(total_recording, stream, name, copy_type):
             is_valid, error = queue.get()
             assert is_valid, error
 
+        responses = find_recordings([recording_id_list[i] for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording_id_list[i]).json()
+            response = responses[recording_id_list[i]]
             is_valid, error = validate_recordings.validate_actual_time(response, recording.get_entry(i).EndTime,
                                                                        RecordingAttribute.ACTUAL_END_TIME)
             assert is_valid, error
@@ -10,13 +10,13 @@ import helpers.models.recording as recording_model
 import helpers.notification.utils as notification_utils
 import helpers.utils as utils
 import helpers.vmr.a8.a8_helper as a8
-import helpers.vmr.rio.api as rio
 import validators.validate_common as validate_common
 import validators.validate_recordings as validate_recordings
 
 from helpers.constants import RecordingAttribute
 from helpers.constants import TestLog
 from helpers.constants import TimeFormat
+from framework.rio import find_recordings
 
 pytestmark = pytest.mark.recording
 LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
@@ -56,8 +56,9 @@ def test_rtc9786_bulk_update_end_time_before_recording_start_unique(total_record
 
         assert is_valid, error
         recording_pool = mp_pool.ThreadPool(processes=total_recording)
+        responses = find_recordings([recording_id_list[i] for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording_id_list[i]).json()
+            response = responses[recording_id_list[i]]
             LOGGER.debug("Response=%s", response)
             end_time = response[0][RecordingAttribute.END_TIME][:-1]
             LOGGER.debug("Scheduled end time of recording=%s is %s", recording_id_list[i], end_time)
@@ -72,8 +73,9 @@ def test_rtc9786_bulk_update_end_time_before_recording_start_unique(total_record
         assert is_valid, error
 
         # Validating whether the updated end time was populated or not
+        responses = find_recordings([recording_id_list[i] for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording_id_list[i]).json()
+            response = responses[recording_id_list[i]]
             LOGGER.debug("Response=%s", response)
             is_valid, error = validate_recordings.validate_time(response, recording.get_entry(i).EndTime,
                                                                 RecordingAttribute.END_TIME)
@@ -11,13 +11,13 @@ import helpers.models.recording as recording_model
 import helpers.notification.utils as notification_utils
 import helpers.utils as utils
 import helpers.vmr.a8.a8_helper as a8
-import helpers.vmr.rio.api as rio
 import validators.validate_common as validate_common
 import validators.validate_recordings as validate_recordings
 
 from helpers.constants import RecordingAttribute
 from helpers.constants import TestLog
 from helpers.constants import TimeFormat
+from framework.rio import find_recordings
 
 pytestmark = pytest.mark.recording
 LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
@@ -89,8 +89,9 @@ def test_rtc9787_bulk_update_end_time_prior_to_current_time_during_recording_inp
         new_end_time = utils.get_formatted_time(
             constants.SECONDS * -1, TimeFormat.TIME_FORMAT_MS, stream)
         LOGGER.info("UPDATE END TIMES IN RECORDING OBJECT INSTANCE")
+        responses = find_recordings([recording_id_list[i] for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording_id_list[i]).json()
+            response = responses[recording_id_list[i]]
             original_end_time = response[0][RecordingAttribute.END_TIME]
             recording.get_entry(i).EndTime = new_end_time
             LOGGER.info("%s end time - original=%s, updated=%s", recording_id_list[i],
@@ -106,8 +107,9 @@ def test_rtc9787_bulk_update_end_time_prior_to_current_time_during_recording_inp
 
         # Verify that the updated end time was populated
         LOGGER.info("VERIFY CHANGED END TIMES FOR RECORDINGS")
+        responses = find_recordings([recording_id_list[i] for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording_id_list[i]).json()
+            response = responses[recording_id_list[i]]
             is_valid, error = validate_recordings.validate_time(
                 response, recording.get_entry(i).EndTime, RecordingAttribute.END_TIME)
             assert is_valid, error
@@ -4,20 +4,20 @@ import multiprocessing.pool as mp_pool
 import os
 import pytest
 import requests
-import time
 
 import helpers.constants as constants
 import helpers.models.recording as recording_model
 import helpers.notification.utils as notification_utils
 import helpers.utils as utils
 import helpers.vmr.a8.a8_helper as a8
-import helpers.vmr.rio.api as rio
 import validators.validate_common as validate_common
 import validators.validate_recordings as validate_recordings
+import framework.clock as clock
 
 from helpers.constants import RecordingAttribute
 from helpers.constants import TestLog
 from helpers.constants import TimeFormat
+from framework.rio import find_recordings
 
 pytestmark = pytest.mark.recording
 LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
@@ -64,10 +64,11 @@ def test_rtc9788_bulk_update_end_time_during_recording_inprogress_unique(total_r
         sleep_time = utils.get_sleep_time(start_wait, stream)
         print "[INFO: ] Waiting %d seconds for recording to start" % sleep_time
         LOGGER.debug("Waiting %d seconds for recording to start", sleep_time)
-        time.sleep(sleep_time)
+        clock.sleep(sleep_time)
 
+        responses = find_recordings([recording_id_list[i] for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording_id_list[i]).json()
+            response = responses[recording_id_list[i]]
             LOGGER.debug("Response=%s", response)
             end_time = response[0][RecordingAttribute.END_TIME][:-1]
 
@@ -83,8 +84,9 @@ def test_rtc9788_bulk_update_end_time_during_recording_inprogress_unique(total_r
         assert is_valid, error
 
         # Validating whether the updated end time was populated or not
+        responses = find_recordings([recording_id_list[i] for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording_id_list[i]).json()
+            response = responses[recording_id_list[i]]
             LOGGER.debug("Response=%s", response)
             is_valid, error = validate_recordings.validate_time(response, recording.get_entry(i).EndTime,
                                                                 RecordingAttribute.END_TIME)
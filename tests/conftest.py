@@ -23,6 +23,19 @@ import helpers.setup as test_setup
 import helpers.teardown as test_teardown
 import helpers.utils as utils
 import helpers.constants as constants
+import framework.clock as clock
+import framework.failures as failures
+import framework.fault as fault
+import framework.health as health
+import framework.http_session as http_session
+import framework.log_archive as log_archive
+import framework.manifest_config as manifest_config
+import framework.notification as notification
+import framework.recovery as recovery
+import framework.results as results
+import framework.simulator as simulator
+import framework.ssh as ssh
+import framework.versions as versions
 
 from helpers import dp_lib
 from helpers.constants import Component, VMR_KUBECONFIG
@@ -70,6 +83,19 @@ def pytest_addoption(parser):
     parser.addoption('--skipData', action="store")
     parser.addoption('--labName', action="store", default=constants.LABNAME)
     parser.addoption('--pvt', action="store", default="common")
+    parser.addoption('--overlap', action="store_true", default=False,
+                     help="Let several workers share each stream so that the wait phases of the tests overlap.")
+    parser.addoption('--appendResults', action="store_true", default=False,
+                     help="Keep the results of a previous pass of the same run.")
+    parser.addoption('--simulate', action="store_true", default=False,
+                     help="Run against the local A8/RIO/NSA simulator instead of the lab control plane. "
+                          "The tests validating COS storage or VLE playback are skipped.")
+    parser.addoption('--simulateTimeScale', action="store", type=float, default=1.0,
+                     help="Compression factor of the recording timeline of the simulator.")
+    parser.addoption('--simulateFailRate', action="store", type=float, default=0.0,
+                     help="Fraction of simulated recordings ending FAILED.")
+    parser.addoption('--simulateRejectRate', action="store", type=float, default=0.0,
+                     help="Fraction of simulated A8 requests rejected.")
 
 
 def is_master(config):
@@ -102,8 +128,9 @@ def pytest_configure(config):
     conf_info = yaml.load(config.getoption(constants.GLOBAL_CONFIG_INFO))
     TestDirectory.CONFIG_DIR = conf_info['test_config_dir']
 
-    # Execute PreCheck
-    execute_pre_check()
+    # Execute PreCheck, the simulated control plane needs neither oc nor a kubeconfig
+    if not config.getoption('simulate'):
+        execute_pre_check()
 
     # Let the master node book-keep a list of streams for the slave nodes to work on.
     if is_master(config):
@@ -113,11 +140,24 @@ def pytest_configure(config):
 
 def pytest_unconfigure(config):
     if is_master(config):
+        # One report for every worker, made of the results they sent as their tests ended
+        try:
+            pytest.result_aggregator.write()
+        except Exception as e:
+            LOGGER.error("Unable to write the test report: %s", e)
+        # Only the tails of the stream logs are left to compress, the rest was done during the run. The raw logs
+        # are removed once compressed, archive_logs collects the compressed logs whatever the length of the run
+        if getattr(config, 'log_archiver', None):
+            config.log_archiver.finish()
+            config.log_archiver.remove_logs()
         test_teardown.archive_logs()
 
 
 def pytest_configure_node(node):
     # The master assigns the slaves the stream to work on and pytest-xdist will transfer to the subprocess
+    if node.config.getoption('overlap'):
+        node.slaveinput[RecordingAttribute.STREAM_ID] = node.config.overlap_streams[node.gateway.id]
+        return
     node.slaveinput[RecordingAttribute.STREAM_ID] = node.config.streamInfo.pop()
 
 
@@ -128,13 +168,24 @@ def pytest_xdist_setupnodes(config, specs):
 
     stream_list_reverse = config.streamInfo[::-1]
     log_dir = os.path.join(utils.get_base_dir_path(), TestDirectory.OUTPUT_DIR)
+    log_files = []
+    if config.getoption('overlap'):
+        # Every stream is shared by several workers, the worker ids only have to stay unique
+        config.overlap_streams = {}
+        for i, spec in enumerate(specs):
+            stream = stream_list_reverse[i % len(stream_list_reverse)]
+            spec.id = "%s_%d" % (stream, i / len(stream_list_reverse))
+            config.overlap_streams[spec.id] = stream
+        stream_list_reverse = [spec.id for spec in specs]
     for i,stream in enumerate(stream_list_reverse):
         specs[i].id = stream
         log_file = os.path.join(log_dir, stream+'.log')
+        log_files.append(log_file)
         msg = "All log statements related to stream: %s will be updated to %s" % (stream, log_file)
         logging.info(msg)
         # write in master log file about stream logging details
         logger.info(msg)
+    config.log_archiver = log_archive.LogArchiver(log_files).start()
 
 
 def pytest_sessionstart(session):    
@@ -150,8 +201,15 @@ def pytest_sessionstart(session):
     test_setup.init_logger(TestLog.DEBUG_LOGGER, TestLog.LOG_FORMAT_DEBUG)
         
     rally_result_file = os.path.join(utils.get_base_dir_path(), TestReport.RALLY_RESULT_FILE)
-    if os.path.isfile(rally_result_file):
-        os.unlink(rally_result_file)
+    if not session.config.getoption('appendResults') and is_master(session.config):
+        if os.path.isfile(rally_result_file):
+            os.unlink(rally_result_file)
+        results.reset()
+    if is_master(session.config):
+        # The results of a previous pass are in its journals
+        pytest.result_aggregator = results.load()
+        # The health of the lab is probed again by the first worker asking for it
+        health.reset()
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -166,13 +224,46 @@ def setup(request):
         Clean up the environment post the test run. This will be executed when all the tests are executed.
         """
         test_setup.prepare_test_summary(request)
-
+        http_session.log_latency_summary()
+        http_session.uninstall()
+        # A fault left injected by an aborted destructive test would impair the lab for the next runs
+        for error in fault.get_registry().revert_all():
+            LOGGER.error("Unable to revert the faults left injected: %s", error)
+        ssh.uninstall()
+        if control_plane_simulator:
+            control_plane_simulator.stop()
+            clock.uninstall()
+
+    control_plane_simulator = None
     request.addfinalizer(teardown)
 
+    # A8, RIO, NSA and V2PC calls of the helpers reuse pooled keep-alive connections from here on
+    http_session.install()
+    # SSH commands of the tests and helpers share one connection per node
+    ssh.install()
+
+    if request.config.getoption('simulate'):
+        sim_config = simulator.SimulatorConfig(time_scale=request.config.getoption('simulateTimeScale'),
+                                               fail_rate=request.config.getoption('simulateFailRate'),
+                                               reject_rate=request.config.getoption('simulateRejectRate'))
+        # Sleeps and waits jump ahead instead of waiting out the recording windows
+        clock.install(clock.VirtualClock())
+        control_plane_simulator = simulator.Simulator(sim_config).start()
+        simulator.install(control_plane_simulator,
+                          simulator.get_control_plane_hosts(utils.get_configInfo()[Component.VMR]))
+        # The lab checks below talk to real components, none of which exist in a simulated run
+        return
+
     base_path = os.path.join(utils.get_base_dir_path(), TestDirectory.CONFIG_DIR)
     kubeconfig_path = os.path.join(base_path, VMR_KUBECONFIG)
     config.load_kube_config(os.path.join(os.environ["HOME"], kubeconfig_path))
 
+    # Images and digests of the DP deployments, read from the cluster at most once per versions.INVENTORY_TTL
+    try:
+        pytest.tc_data['versions'] = versions.get_inventory(request.config.getoption('labName'))
+    except Exception as e:
+        LOGGER.warning("Unable to read the DP versions: %s", e)
+
     # to cleanup log and change vle_default.conf file interface value based upon the system interface name"
     utils.vle_log_cleanup()
     utils.vle_default_config_interface_change()
@@ -212,6 +303,11 @@ def setup(request):
             pytest.fail("Unable to fetch V2PC authorization token")
         constants.V2pc.auth_token = v2pc_auth_token
 
+    # Probed once for the workers starting together, the health tests assert on the same snapshot
+    health_snapshot = request.getfixturevalue('health_snapshot')
+    if not health_snapshot.is_healthy():
+        LOGGER.warning("Unhealthy DP components at session start: %s", "; ".join(health_snapshot.get_errors()))
+
 
 # This triggers streams to 1 Tc
 def pytest_generate_tests(metafunc):
@@ -226,6 +322,68 @@ def pytest_generate_tests(metafunc):
             metafunc.parametrize("stream", stream_info, ids=stream_info)
 
 
+@pytest.fixture(scope="session")
+def notification_server():
+    """
+    Single notification listener shared by every recording of the session.
+    """
+    server = notification.get_notification_server()
+    yield server
+    notification.stop_notification_server()
+
+
+@pytest.fixture(scope="session")
+def health_snapshot():
+    """
+    Health of the DP components, probed concurrently and reused by every worker for health.SNAPSHOT_TTL.
+    """
+    return health.get_snapshot()
+
+
+@pytest.fixture
+def recovery_timelines(request):
+    """
+    Recovery timelines of the pod restarts made by a test, reported once the test is done.
+    """
+    timelines = []
+    yield timelines
+    for timeline in timelines:
+        timeline.close()
+    if timelines:
+        data = [results.to_plain(timeline.to_dict()) for timeline in timelines]
+        request.node.user_properties.append((recovery.PROPERTY_NAME, data))
+        testcase = pytest.tc_data['testcases'].get(request.node.name)
+        if testcase is not None:
+            testcase[recovery.PROPERTY_NAME] = data
+
+
+@pytest.fixture(scope="session")
+def manifest_config_state():
+    """
+    Manifest agent configuration of the session, restored to the default once all the tests are done.
+    """
+    state = manifest_config.ManifestConfigState()
+    yield state
+    is_valid, error = state.revert()
+    if not is_valid:
+        LOGGER.error("Unable to revert the manifest agent configuration: %s", error)
+
+
+@pytest.fixture(autouse=True)
+def required_manifest_config(request, manifest_config_state):
+    """
+    Put in place the manifest agent configuration declared by the manifest_config marker of the test, the default
+    one for tests declaring none.
+    """
+    settings = manifest_config.get_required_config(request.node)
+    if settings is None:
+        is_valid, error = manifest_config_state.ensure_default()
+    else:
+        is_valid, error = manifest_config_state.apply(settings)
+    if not is_valid:
+        pytest.fail(error)
+
+
 @pytest.fixture(scope="session")
 def stream(request):
     # this fixture will be used when pytest running in distributed mode
@@ -271,47 +429,56 @@ def pytest_runtest_makereport(item, call):
     outcome = yield
     rep = outcome.get_result()
 
-    # we only look at actual failing test calls, not setup/teardown
+    # the test calls are looked at, and the set up failures (reported as errors)
+
+    if rep.when == "setup" and rep.failed:
+        item.status = "Error"
+        item.duration = rep.duration
+        record_failure(item, call, rep)
 
-    if rep.when == "call":
+    elif rep.when == "call":
         
         item.duration = rep.duration
         
         if rep.failed:
             item.status = "Fail"
-            LOGGER.error("%s %s %s" %(prefix_on_log_errors, '  E R R O R  ', suffix_on_log_errors))            
-            LOGGER.error("Test failed - Traceback")            
-            LOGGER.error(rep.longreprtext)
-            
-            testLocals = str(rep.longrepr.reprtraceback.reprentries[0].reprlocals)
-            testDict = {}
-            
-            for x in re.findall(r'.*=.*', testLocals):
-                result = re.search('([\w\s\t]+)=(.*)', x)
-                if result:
-                    k, v = result.group(1), result.group(2)
-                    k, v = k.strip(), v.lstrip()
-
-                    if k in ['TC', 'US', 'message']:
-                        testDict[k] = ast.literal_eval(v)
-                    else:
-                        testDict[k] = v
-                
-            _issue = re.search(r'> (.*)', rep.longreprtext).group(1)
-            _error = "\n".join([ x.strip() for x in re.findall(r'E\s(.*)', rep.longreprtext)])
-            
-            item.error = _issue.strip() + "\n" + _error            
-            item.message = testDict.get('message', "")
+            record_failure(item, call, rep)
           
         else:
             item.status = "Pass"
             item.message = "TestCase Passed"
             item.error = ""
 
+    elif rep.when == "teardown":
+        # Reported once the fixtures (e.g. recovery_timelines) completed the entry, for the journal and the master
+        entry = pytest.tc_data['testcases'].get(item.name)
+        if entry is not None:
+            rep.user_properties.append((results.PROPERTY_NAME, results.to_plain(entry)))
+
+
+def record_failure(item, call, rep):
+    """
+    Keep the structured record of the failure, read from the exception and the test frame rather than from the
+    rendered traceback, whatever the size of the test locals.
+    """
+    failure = failures.capture(item, call, rep.when)
+    LOGGER.error("%s %s %s" %(prefix_on_log_errors, '  E R R O R  ', suffix_on_log_errors))
+    LOGGER.error("Test failed in %s - Traceback", rep.when)
+    LOGGER.error(failure.traceback)
+    if failure.http_exchange:
+        LOGGER.error("Last HTTP exchange: %(method)s %(url)s -> %(status_code)s in %(elapsed)ss",
+                     failure.http_exchange)
+
+    item.error = failure.get_error()
+    item.message = failure.test_message or ""
+    item.failure = failure.to_dict()
+
 
 def pytest_runtest_setup(item):
     start_time = datetime.utcnow()
     item.start_time = start_time
+    # The failure record reports the last HTTP exchange of this test, not of the previous one
+    http_session.reset_last_exchange()
     
     started_message = "\n%s %s %s %s %s\n" %(str(start_time),'#' * 30, "STARTED : ", item.name, '#' * 30)
     print started_message
@@ -354,13 +521,12 @@ def pytest_runtest_teardown(item):
                 "end_time": str(item.end_time),
                 "id": _tc,
                 "error": error,
-                "file": os.path.join(utils.get_base_dir_path(), item.location[0])
+                "file": os.path.join(utils.get_base_dir_path(), item.location[0]),
+                "stream": get_stream(item)
             }
             try:
-                pytest.tc_data['testcases'][item.name] = {
-                    "start_time": str(item.start_time)
-                }
-            except:
+                pytest.tc_data['testcases'][item.name]["start_time"] = str(item.start_time)
+            except AttributeError:
                 pass
     else:
         message = getattr(item, "message", "Failed")
@@ -377,10 +543,39 @@ def pytest_runtest_teardown(item):
                 "end_time": str(item.end_time),
                 "id": _tc,
                 "error": error,
-                "file": os.path.join(utils.get_base_dir_path(), item.location[0])
+                "file": os.path.join(utils.get_base_dir_path(), item.location[0]),
+                "stream": get_stream(item),
+                "failure": getattr(item, "failure", None)
             }
 
 
+def get_stream(item):
+    """
+    Stream the test ran on: its stream parameter, or the stream of the worker in distributed mode.
+    """
+    if hasattr(item, 'callspec') and 'stream' in item.callspec.params:
+        return item.callspec.params['stream']
+    return getattr(item.config, 'slaveinput', {}).get(RecordingAttribute.STREAM_ID)
+
+
+def pytest_runtest_logreport(report):
+    if report.when != "teardown":
+        return
+    entry = dict(report.user_properties).get(results.PROPERTY_NAME)
+    if entry is None:
+        return
+    # Reports received from the workers carry the node they come from, the worker journaled them already
+    if not hasattr(report, 'node'):
+        results.get_journal().append(entry)
+        # Journaled, the report is made from the journals and the master's aggregator: prepare_test_summary
+        # is left with the suite and setup summary to write
+        pytest.tc_data['testcases'].pop(entry['name'], None)
+    aggregator = getattr(pytest, 'result_aggregator', None)
+    if aggregator is not None:
+        aggregator.add(entry)
+        LOGGER.info("Results so far: %s", aggregator.get_progress())
+
+
 # test_manifest is added by pipeline_test/cdvr_basic.py or cdvr_sanity.py.
 # specifically it gets copied from test_manifests folder into the tests folder
 # so it can get imported here..
@@ -400,9 +595,53 @@ REQUIREMENT_PREFIXES = ['MF', 'CF', 'US', CUSTOM_IDENTIFIER]
 ## Data structures for another pytest version may not be the same so
 ## if you change the pytest version, you may have to change this function!!
 ## ================================================================================
+DESTRUCTIVE_MARKERS = ('destructive', 'cos_destructive')
+DESTRUCTIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'destructive')
+
+
+def is_destructive(item):
+    """
+    Tell whether a test injects faults in the lab: marked destructive (cos_destructive included) or collected
+    from the tests/destructive folder.
+    """
+    if any(item.get_closest_marker(name) for name in DESTRUCTIVE_MARKERS):
+        return True
+    path = os.path.abspath(str(item.fspath))
+    return path.startswith(DESTRUCTIVE_DIR + os.sep)
+
+
+def mark_config_mutating(items):
+    """
+    Mark config_mutating the destructive tests and the tests declaring a manifest agent configuration, on top
+    of the tests marked config_mutating explicitly (redeploys, publish templates, pod restarts), so that none of
+    them overlaps with other tests (see --overlap).
+    """
+    for item in items:
+        if not item.get_closest_marker('config_mutating') and (
+                is_destructive(item) or item.get_closest_marker(manifest_config.MARKER)):
+            item.add_marker(pytest.mark.config_mutating)
+
+
+def skip_cos_vle_tests(items):
+    """
+    Skip the tests validating COS storage or VLE playback, neither of which the simulator stands in for (see
+    --simulate).
+    """
+    for item in items:
+        function = getattr(item, 'function', None)
+        calls = simulator.get_cos_vle_calls(function) if function is not None else []
+        if calls:
+            item.add_marker(pytest.mark.skip(
+                reason="COS storage and VLE playback are not simulated, the test calls %s" % ", ".join(calls)))
+
+
 @pytest.hookimpl(tryfirst=True)
 def pytest_collection_modifyitems(config, items):
 
+    mark_config_mutating(items)
+    if config.getoption('simulate'):
+        skip_cos_vle_tests(items)
+
     # log('enter pytest_collection_modifyitems, len(items)=%s' % len(items))
     generic_confg = utils.get_direct_config()
     if not generic_confg.get(Component.USE_MANIFEST):
@@ -431,6 +670,7 @@ def pytest_collection_modifyitems(config, items):
         sorted_items.extend(unordered_items)
         sorted_items.extend([i[1] for i in end_list])
         items[:] = [item for sublist in sorted_items for item in sublist]
+        manifest_config.group_by_config(items)
         return
 
     debug_logger.info('enter pytest_collection_modifyitems, len(items)=%s' % len(items))
@@ -467,6 +707,8 @@ def pytest_collection_modifyitems(config, items):
                 item.add_marker(requirement)
                 fmapped[item.nodeid].append(requirement)
 
+    manifest_config.group_by_config(items)
+
 
 @pytest.fixture()
 def common_lib(request):
@@ -1,2 +1,6 @@
-MCE_JOB_IDS = {}
-COS_JOB_IDS = {}
\ No newline at end of file
+import framework.fault as fault
+from helpers.constants import Component
+
+# Revert jobs scheduled by the destructive tests, tracked by the session registry of framework.fault
+MCE_JOB_IDS = fault.get_registry().get_job_ids(Component.MCE)
+COS_JOB_IDS = fault.get_registry().get_job_ids(Component.COS)
@@ -1,6 +1,5 @@
 import logging
 import time
-from collections import OrderedDict
 
 import pytest
 import yaml
@@ -13,14 +12,13 @@ import helpers.vle.vle_validators_configuration as vle_validators_configuration
 import helpers.vmr.a8.a8_helper as a8
 import helpers.vmr.rio.api as rio
 import validators.validate_recordings as validate_recordings
+import framework.fault as fault
 from helpers.constants import Component
 from helpers.constants import DestructiveTesting
-from helpers.constants import Interface
 from helpers.constants import RecordingAttribute
 from helpers.constants import RecordingStatus
 from helpers.constants import TestLog
 from helpers.constants import TimeFormat
-from tests import destructive
 from tests.sanity.recording import test_rtc9723_tc_rec_001_future_start_time_future_end_time
 
 pytestmark = pytest.mark.cos_destructive
@@ -44,52 +42,21 @@ def test_rtc9807_tc_des_014_cos_ni_packet_loss():
     Introduce 30% packet loss on the Incoming COS network interface throughout the recording life time,
     Validate recording state against INCOMPLETE or COMPLETE and number of available segments recorded.
     """
-    ssh_client = None
+    plan = None
     response = None
     web_service_obj = None
-    rev_if_dict = {}
-    component_dict = {}
-    ifbcount = 0
     cos_nodes = v2pc_helper.get_cos_node_data()
 
     try:
-        for node in cos_nodes:
-            comp_ip = node[Component.IP]
-            ssh_client = utils.get_ssh_client(COMPONENT_NAME, COMPONENT_USERNAME, component_ip=comp_ip,
-                                              password=COS_PASSWORD)
-
-            # deleting the previously scheduled jobs by other test cases, in order not to tamper
-            # with the current test case
-            destructive_utils.delete_scheduled_job(COMPONENT_NAME, ssh_client, comp_ip, destructive.COS_JOB_IDS)
-
-            # interface takes only data interfaces
-            for interface in node[Interface.INTERFACES]:
-                cos_data_in = interface
-
-                ifb_interface = DestructiveTesting.IFB_INTERFACE + str(ifbcount)
-
-                rev_cmd = destructive_utils.schedule_rev_cmd(ssh_client, cos_data_in, comp_ip,
-                                                             destructive.COS_JOB_IDS,
-                                                             constants.MINUTES * 2, ifb_interface)
-
-                # Storing the revert command with its respective interface
-                rev_if_dict[cos_data_in] = rev_cmd
-
-                des_cmd = DestructiveTesting.PACKET_LOSS_INCOMING_INTERFACE.format(ifb_interface,
-                                                                                   DestructiveTesting.PACKET_LOSS)
-
-                des_cmd = destructive_utils.get_incoming_tc_cmd(cos_data_in, des_cmd, ifb_interface)
-
-                # expected outcome after the destructive commands are run
-                expected_result = {DestructiveTesting.LOSS: DestructiveTesting.PACKET_LOSS,
-                                   DestructiveTesting.SRC: DestructiveTesting.NETWORK}
-                is_des_effective, error = destructive_utils.exec_des_cmd(ssh_client, ifb_interface, des_cmd,
-                                                                         expected_result)
-                assert is_des_effective, error
-                ifbcount += 1
-
-            # Storing Interfaces and Revert Command with its respective Component IP
-            component_dict[comp_ip] = rev_if_dict
+        # expected outcome after the destructive commands are run
+        expected_result = {DestructiveTesting.LOSS: DestructiveTesting.PACKET_LOSS,
+                           DestructiveTesting.SRC: DestructiveTesting.NETWORK}
+        # Incoming traffic of every data interface of every COS node, all impaired within a small skew
+        plan = fault.FaultPlan(COMPONENT_NAME, COMPONENT_USERNAME, fault.get_incoming_faults(
+            cos_nodes, DestructiveTesting.PACKET_LOSS_INCOMING_INTERFACE, DestructiveTesting.PACKET_LOSS,
+            expected_result, revert_delay=constants.MINUTES * 2), password=COS_PASSWORD)
+        is_valid, error = plan.inject()
+        assert is_valid, error
 
         start_time = utils.get_formatted_time(constants.SECONDS * 30, TimeFormat.TIME_FORMAT_MS, STREAM_ID)
         end_time = utils.get_formatted_time(constants.SECONDS * 90, TimeFormat.TIME_FORMAT_MS, STREAM_ID)
@@ -111,17 +78,15 @@ def test_rtc9807_tc_des_014_cos_ni_packet_loss():
             assert is_valid, error
 
         # executing the revert command to undo the destructive commands
-        for component_ip, values in component_dict.items():
-            for interface, rev_cmds in values.items():
-                destructive_utils.exec_rev_cmd(COMPONENT_NAME, ssh_client, component_ip, interface, rev_cmds,
-                                               destructive.COS_JOB_IDS)
+        is_valid, error = plan.revert()
+        assert is_valid, error
 
         # running sanity test to check if the setup is back to normal after reverting the commands
         test_rtc9723_tc_rec_001_future_start_time_future_end_time(STREAM_ID)
 
     finally:
-        if ssh_client:
-            ssh_client.close()
+        if plan:
+            plan.revert()
         if web_service_obj:
             web_service_obj.stop_server()
         if response:
@@ -1,5 +1,4 @@
 import logging
-import time
 
 import pytest
 import yaml
@@ -13,6 +12,7 @@ import helpers.vmr.a8.a8_helper as a8
 import helpers.vmr.nsa.nsa_helper as nsa
 import helpers.vmr.rio.api as rio
 import validators.validate_recordings as validate_recordings
+import framework.clock as clock
 from helpers.constants import Component
 from helpers.constants import DestructiveTesting
 from helpers.constants import Interface
@@ -94,7 +94,7 @@ def test_rtc9809_tc_des_004_dcm_multicast_ip_block_lifetime_recording():
         recording_response = rio.find_recording(response[RecordingAttribute.RECORDING_ID]).json()
         LOGGER.debug("Recording response=%s", recording_response)
 
-        time.sleep(constants.SECONDS * 60)
+        clock.sleep(constants.SECONDS * 60)
         for mce_node in mce_nodes:
             mce_ip = mce_node[Component.IP]
             ssh_client = utils.get_ssh_client(COMPONENT_NAME, COMPONENT_USERNAME, component_ip=mce_ip)
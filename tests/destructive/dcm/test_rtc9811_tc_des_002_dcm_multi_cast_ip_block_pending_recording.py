@@ -1,5 +1,4 @@
 import logging
-import time
 
 import pytest
 import yaml
@@ -13,6 +12,7 @@ import helpers.vmr.a8.a8_helper as a8
 import helpers.vmr.nsa.nsa_helper as nsa
 import helpers.vmr.rio.api as rio
 import validators.validate_recordings as validate_recordings
+import framework.clock as clock
 from helpers.constants import Component
 from helpers.constants import DestructiveTesting
 from helpers.constants import Interface
@@ -91,7 +91,7 @@ def test_rtc9811_tc_des_002_dcm_multi_cast_ip_block_pending_recording():
         response = destructive_utils.create_recording_des(start_time, end_time)
 
         # Block duration 120 seconds
-        time.sleep(constants.SECONDS * (start_duration + block_duration))
+        clock.sleep(constants.SECONDS * (start_duration + block_duration))
 
         web_service_obj = response[RecordingAttribute.WEB_SERVICE_OBJECT]
         # executing the revert command to undo the destructive commands
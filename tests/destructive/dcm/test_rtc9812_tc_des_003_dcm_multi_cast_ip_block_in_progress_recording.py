@@ -1,5 +1,4 @@
 import logging
-import time
 
 import pytest
 import yaml
@@ -13,6 +12,7 @@ import helpers.vmr.a8.a8_helper as a8
 import helpers.vmr.nsa.nsa_helper as nsa
 import helpers.vmr.rio.api as rio
 import validators.validate_recordings as validate_recordings
+import framework.clock as clock
 from helpers.constants import Component
 from helpers.constants import DestructiveTesting
 from helpers.constants import Interface
@@ -91,7 +91,7 @@ def test_rtc9812_tc_des_003_dcm_multi_cast_ip_block_in_progress_recording():
 
         assert is_valid, error
 
-        time.sleep(constants.SECONDS * block_trigger_time)
+        clock.sleep(constants.SECONDS * block_trigger_time)
 
         for mce_node in mce_nodes:
             mce_ip = mce_node[Component.IP]
@@ -108,7 +108,7 @@ def test_rtc9812_tc_des_003_dcm_multi_cast_ip_block_in_progress_recording():
                 LOGGER.info("Executing the command=%s to cause destruction in the component", des_cmds[mce_ip])
                 ssh_client.exec_command(des_cmds[mce_ip])
 
-        time.sleep(constants.SECONDS * block_duration)
+        clock.sleep(constants.SECONDS * block_duration)
         # executing the revert command to undo the destructive commands
         for mce_node in mce_nodes:
             mce_ip = mce_node[Component.IP]
@@ -1,5 +1,4 @@
 import logging
-import time
 
 import pytest
 import yaml
@@ -12,14 +11,14 @@ import helpers.vle.vle_validators_configuration as vle_validators_configuration
 import helpers.vmr.a8.a8_helper as a8
 import helpers.vmr.rio.api as rio
 import validators.validate_recordings as validate_recordings
+import framework.fault as fault
+import framework.clock as clock
 from helpers.constants import Component
 from helpers.constants import DestructiveTesting
-from helpers.constants import Interface
 from helpers.constants import RecordingAttribute
 from helpers.constants import RecordingStatus
 from helpers.constants import TestLog
 from helpers.constants import TimeFormat
-from tests import destructive
 from tests.sanity.recording import test_rtc9723_tc_rec_001_future_start_time_future_end_time
 
 pytestmark = pytest.mark.destructive
@@ -43,14 +42,13 @@ def test_rtc9802_tc_des_009_mce_ni_block_in_progress_recording():
     Block traffic on the outgoing MCE interface after recording starts and unblock before recording ends
     Validate recording state against INCOMPLETE or COMPLETE and number of available segments recorded.
     """
-    ssh_client = None
+    plan = None
     response = None
     web_service_obj = None
     start_duration = 30
     block_trigger_time = 30
     block_duration = 60
     try:
-        rev_cmds = {}
         mce_nodes = v2pc.get_app_worker_nodes(MCE_INSTANCE, COMPONENT_NAME)
 
         # Create recording to block in progress recording
@@ -63,49 +61,20 @@ def test_rtc9802_tc_des_009_mce_ni_block_in_progress_recording():
                                                                     start_duration)
         assert is_valid, error
 
-        time.sleep(constants.SECONDS * block_trigger_time)
+        clock.sleep(constants.SECONDS * block_trigger_time)
 
-        for mce_node in mce_nodes:
-            mce_data_out = mce_node[Interface.DATA_OUT]
-            mce_ip = mce_node[Component.IP]
-
-            ssh_client = utils.get_ssh_client(COMPONENT_NAME, COMPONENT_USERNAME, component_ip=mce_ip)
-
-            # deleting the previously scheduled jobs by other test cases, in order not to tamper with the current test case
-            destructive_utils.delete_scheduled_job(COMPONENT_NAME, ssh_client, mce_ip, destructive.MCE_JOB_IDS)
-
-            des_cmd = DestructiveTesting.PACKET_LOSS_OUTGOING_INTERFACE.format(mce_data_out,
-                                                                               DestructiveTesting.PACKET_LOSS_BLOCK)
-            des_cmd = destructive_utils.get_outgoing_tc_cmd(mce_data_out, des_cmd)
-
-            if mce_node[Interface.DATA_IN] != mce_node[Interface.MGMT]:
-                rev_cmds[mce_ip] = destructive_utils.schedule_rev_cmd(ssh_client, mce_data_out, mce_ip,
-                                                                      destructive.MCE_JOB_IDS, constants.MINUTES * 10)
-
-                expected_result = {DestructiveTesting.LOSS: DestructiveTesting.PACKET_LOSS_BLOCK,
-                                   DestructiveTesting.DST: DestructiveTesting.NETWORK}
-                is_des_effective, error = destructive_utils.exec_des_cmd(ssh_client, mce_data_out,
-                                                                         des_cmd, expected_result)
-                assert is_des_effective, error
-            else:
-                destructive_utils.schedule_rev_cmd(ssh_client, mce_data_out, mce_ip, destructive.MCE_JOB_IDS,
-                                                   constants.MINUTES * 2)
-                rev_cmds[mce_ip] = None
-
-                LOGGER.info("Executing the command=%s to cause destruction in the component", des_cmd)
-                ssh_client.exec_command(des_cmd)
+        expected_result = {DestructiveTesting.LOSS: DestructiveTesting.PACKET_LOSS_BLOCK,
+                           DestructiveTesting.DST: DestructiveTesting.NETWORK}
+        plan = fault.FaultPlan(COMPONENT_NAME, COMPONENT_USERNAME, fault.get_outgoing_faults(
+            mce_nodes, DestructiveTesting.PACKET_LOSS_OUTGOING_INTERFACE, DestructiveTesting.PACKET_LOSS_BLOCK,
+            expected_result))
+        is_valid, error = plan.inject()
+        assert is_valid, error
 
-        time.sleep(constants.SECONDS * block_duration)
+        clock.sleep(constants.SECONDS * block_duration)
         # executing the revert command to undo the destructive commands
-        for mce_node in mce_nodes:
-            mce_ip = mce_node[Component.IP]
-            ssh_client = utils.get_ssh_client(COMPONENT_NAME, COMPONENT_USERNAME, component_ip=mce_ip)
-            if rev_cmds[mce_ip]:
-                rev_effective, error = destructive_utils.exec_rev_cmd(COMPONENT_NAME, ssh_client, mce_ip, rev_cmds[mce_ip],
-                                                                      mce_data_out, destructive.MCE_JOB_IDS)
-            else:
-                rev_effective, error = destructive_utils.is_rev_effective(ssh_client, mce_data_out)
-            assert rev_effective, error
+        is_valid, error = plan.revert()
+        assert is_valid, error
 
         recording_id = response[RecordingAttribute.RECORDING_ID]
 
@@ -123,8 +92,8 @@ def test_rtc9802_tc_des_009_mce_ni_block_in_progress_recording():
         # running sanity test to check if the setup is back to normal after reverting the commands
         test_rtc9723_tc_rec_001_future_start_time_future_end_time(STREAM_ID)
     finally:
-        if ssh_client:
-            ssh_client.close()
+        if plan:
+            plan.revert()
         if web_service_obj:
             web_service_obj.stop_server()
         if response:
@@ -1,5 +1,4 @@
 import logging
-import time
 
 import pytest
 import yaml
@@ -12,14 +11,14 @@ import helpers.vle.vle_validators_configuration as vle_validators_configuration
 import helpers.vmr.a8.a8_helper as a8
 import helpers.vmr.rio.api as rio
 import validators.validate_recordings as validate_recordings
+import framework.fault as fault
+import framework.clock as clock
 from helpers.constants import Component
 from helpers.constants import DestructiveTesting
-from helpers.constants import Interface
 from helpers.constants import RecordingAttribute
 from helpers.constants import RecordingStatus
 from helpers.constants import TestLog
 from helpers.constants import TimeFormat
-from tests import destructive
 from tests.sanity.recording import test_rtc9723_tc_rec_001_future_start_time_future_end_time
 
 pytestmark = pytest.mark.destructive
@@ -44,41 +43,18 @@ def test_rtc9803_tc_des_010_mce_ni_packet_loss():
     Introduce 30% packet loss on the Outgoing MCE network interface throughout the recording life time,
     Validate recording state against INCOMPLETE or COMPLETE. Verify playback if state is COMPLETE
     """
-    ssh_client = None
+    plan = None
     response = None
     try:
-        rev_cmds = {}
         mce_nodes = v2pc.get_app_worker_nodes(MCE_INSTANCE, COMPONENT_NAME)
 
-        for mce_node in mce_nodes:
-            mce_data_out = mce_node[Interface.DATA_OUT]
-            mce_ip = mce_node[Component.IP]
-
-            ssh_client = utils.get_ssh_client(COMPONENT_NAME, COMPONENT_USERNAME, component_ip=mce_ip)
-
-            # deleting the previously scheduled jobs by other test cases, in order not to tamper with the current test case
-            destructive_utils.delete_scheduled_job(COMPONENT_NAME, ssh_client, mce_ip, destructive.MCE_JOB_IDS)
-
-            des_cmd = DestructiveTesting.PACKET_LOSS_OUTGOING_INTERFACE.format(mce_data_out,
-                                                                               DestructiveTesting.PACKET_LOSS)
-            des_cmd = destructive_utils.get_outgoing_tc_cmd(mce_data_out, des_cmd)
-
-            if mce_node[Interface.DATA_OUT] != mce_node[Interface.MGMT]:
-                rev_cmds[mce_ip] = destructive_utils.schedule_rev_cmd(ssh_client, mce_data_out, mce_ip,
-                                                                      destructive.MCE_JOB_IDS, constants.MINUTES * 10)
-
-                expected_result = {DestructiveTesting.LOSS: DestructiveTesting.PACKET_LOSS,
-                                   DestructiveTesting.DST: DestructiveTesting.NETWORK}
-                is_des_effective, error = destructive_utils.exec_des_cmd(ssh_client, mce_data_out,
-                                                                         des_cmd, expected_result)
-                assert is_des_effective, error
-            else:
-                destructive_utils.schedule_rev_cmd(ssh_client, mce_data_out, mce_ip, destructive.MCE_JOB_IDS,
-                                                   constants.MINUTES * 2)
-                rev_cmds[mce_ip] = None
-
-                LOGGER.info("Executing the command=%s to cause destruction in the component", des_cmd)
-                ssh_client.exec_command(des_cmd)
+        expected_result = {DestructiveTesting.LOSS: DestructiveTesting.PACKET_LOSS,
+                           DestructiveTesting.DST: DestructiveTesting.NETWORK}
+        plan = fault.FaultPlan(COMPONENT_NAME, COMPONENT_USERNAME, fault.get_outgoing_faults(
+            mce_nodes, DestructiveTesting.PACKET_LOSS_OUTGOING_INTERFACE, DestructiveTesting.PACKET_LOSS,
+            expected_result))
+        is_valid, error = plan.inject()
+        assert is_valid, error
 
         start_time = utils.get_formatted_time(constants.SECONDS * 30, TimeFormat.TIME_FORMAT_MS, STREAM_ID)
         end_time = utils.get_formatted_time(constants.SECONDS * 90, TimeFormat.TIME_FORMAT_MS, STREAM_ID)
@@ -99,24 +75,16 @@ def test_rtc9803_tc_des_010_mce_ni_packet_loss():
                 recording_id, VALIDATOR_TYPE=vle_validators_configuration.PLAYBACK_VALIDATION_COMPLETE)
             assert is_valid, error
 
-        time.sleep(constants.SECONDS * 60)
+        clock.sleep(constants.SECONDS * 60)
 
-        for mce_node in mce_nodes:
-            mce_ip = mce_node[Component.IP]
-            mce_data_out = mce_node[Interface.DATA_OUT]
-            ssh_client = utils.get_ssh_client(COMPONENT_NAME, COMPONENT_USERNAME, component_ip=mce_ip)
-            if rev_cmds[mce_ip]:
-                rev_effective, error = destructive_utils.exec_rev_cmd(COMPONENT_NAME, ssh_client, mce_ip, rev_cmds[mce_ip],
-                                                                      mce_data_out, destructive.MCE_JOB_IDS)
-            else:
-                rev_effective, error = destructive_utils.is_rev_effective(ssh_client, mce_data_out)
-            assert rev_effective, error
+        is_valid, error = plan.revert()
+        assert is_valid, error
 
         # running sanity test to check if the setup is back to normal after reverting the commands
         test_rtc9723_tc_rec_001_future_start_time_future_end_time(STREAM_ID)
     finally:
-        if ssh_client:
-            ssh_client.close()
+        if plan:
+            plan.revert()
         if response:
             response[RecordingAttribute.WEB_SERVICE_OBJECT].stop_server()
             response = a8.delete_recording(response[RecordingAttribute.RECORDING])
@@ -1,8 +1,6 @@
 import logging
-import time
 import os
 import requests
-import paramiko
 import pytest
 import yaml
 
@@ -20,6 +18,8 @@ import helpers.notification.utils as notification_utils
 import helpers.vmr.a8.a8_helper as a8
 import helpers.vmr.rio.api as rio
 import helpers.models.recording as recording_model
+import framework.ssh as ssh
+import framework.clock as clock
 
 pytestmark = pytest.mark.destructive
 
@@ -54,12 +54,12 @@ def test_tc_des_016_vmr_ntp_out_of_sync():
         response = a8.create_recording(recording)
         is_valid, error = validate_common.validate_http_response_status_code(response, requests.codes.no_content)
         assert is_valid, error
-        time.sleep(40)
+        clock.sleep(40)
 
         # Configure to the right ntp server in VMR
         cmd = "sed -i -E 's/" + ntp_server_v2pc + "/" + india_ntp + "/g' /etc/ntp.conf"
         update_vmr_ntp_server(cmd)
-        time.sleep(ntp_synchronization_time)
+        clock.sleep(ntp_synchronization_time)
 
         # Validate recording is incomplete
         is_valid, error = validate_recordings.validate_recording(recording_id, web_service_obj)
@@ -80,7 +80,7 @@ def test_tc_des_016_vmr_ntp_out_of_sync():
         # revert back the ntp to the original value in vmr
         cmd = "sed -i -E 's/" + india_ntp + "/" + ntp_server_v2pc + "/g' /etc/ntp.conf"
         update_vmr_ntp_server(cmd)
-        time.sleep(ntp_synchronization_time)
+        clock.sleep(ntp_synchronization_time)
         web_service_obj.stop_server()
         response = a8.delete_recording(recording)
         LOGGER.debug("Recording clean up status code=%s", response.status_code)
@@ -96,17 +96,13 @@ def update_vmr_ntp_server(command):
         vmr_ip = CONFIG_INFO[name][Component.A8][Component.IP]
         vmr_name = CONFIG_INFO[Component.VMR][Component.VMR_USERNAME]
         vmr_password = CONFIG_INFO[Component.VMR][Component.VMR_PASSWORD]
-        ssh_connect = paramiko.SSHClient()
-        ssh_connect.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        ssh_connect.connect(hostname=vmr_ip, username=vmr_name, password=vmr_password)
-        ssh_connect.invoke_shell()
+        ssh_connect = ssh.get_client(vmr_ip, vmr_name, password=vmr_password)
         ssh_connect.exec_command(command)
         stp_cmd = "service ntpd stop"
         ssh_connect.exec_command(stp_cmd)
-        time.sleep(120)  # wait time for ntp service to get stopped completely otherwise it is in stopping state.
+        clock.sleep(120)  # wait time for ntp service to get stopped completely otherwise it is in stopping state.
         srt_cmd = "service ntpd start"
         ssh_connect.exec_command(srt_cmd)
-        ssh_connect.close()
 
     except Exception as e:
         LOGGER.info(str(e))
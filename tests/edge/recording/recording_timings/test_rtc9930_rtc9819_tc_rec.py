@@ -1,4 +1,3 @@
-import time
 import logging
 import datetime
 import os
@@ -16,6 +15,7 @@ import helpers.notification.utils as notification_utils
 import validators.validate_common as validate_common
 import validators.validate_storage as validate_storage
 import validators.validate_recordings as validate_recordings
+import framework.clock as clock
 
 from helpers.constants import Cos
 from helpers.constants import TestLog
@@ -107,7 +107,7 @@ def test_tc_rec(name, stream, copy_type):
 
         assert not is_valid, error
         print "[INFO: ] Validating the updated end time in response, it should not be equal "
-        print "[INFO: ] async validate recording wait time ",time.sleep(validate_rec_wait_time)
+        print "[INFO: ] async validate recording wait time ",clock.sleep(validate_rec_wait_time)
         print "[INFO: ] queue list empty ", queue.empty()
 
         # Validating the longer recording
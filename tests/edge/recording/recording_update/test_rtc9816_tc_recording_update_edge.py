@@ -1,5 +1,4 @@
 import logging
-import time
 import os
 import pytest
 import requests
@@ -12,6 +11,7 @@ import helpers.vmr.a8.a8_helper as a8
 import validators.validate_common as validate_common
 import validators.validate_recordings as validate_recordings
 import validators.validate_streams as validate_streams
+import framework.clock as clock
 from helpers.constants import TestLog
 from helpers.constants import TimeFormat
 from helpers.constants import ValidationError
@@ -42,7 +42,7 @@ def test_rtc9816_tc_rec_007_update_stream_id_before_recording_start(stream):
 
         assert is_valid, error
 
-        time.sleep(constants.SECONDS * 60)
+        clock.sleep(constants.SECONDS * 60)
         stream_list_rem = [x for x in STREAM_ID_LIST if x != stream]
         assert stream_list_rem, ValidationError.STREAM_NOT_CONFIGURED
         recording.get_entry(0).StreamId = stream_list_rem[0]
@@ -18,12 +18,7 @@ from helpers.constants import TestLog
 from helpers.constants import TimeFormat
 from helpers.constants import ValidationError
 from helpers.constants import RecordingAttribute
-from helpers.constants import V2pc
 from helpers.constants import Component
-from helpers.utils import cleanup
-from helpers.vmr.vmr_helper import v2pc_edit_manifest_config
-from helpers.vmr.vmr_helper import redeploy_config_map
-from helpers.vmr.vmr_helper import verify_batch_size_update
 
 pytestmark = pytest.mark.recording
 LOGGER = logging.getLogger(TestLog.TEST_LOGGER)
@@ -41,6 +36,7 @@ TC_ER_018_DATA = [("bulk_recordings_common", RecordingAttribute.COPY_TYPE_COMMON
 @pytest.mark.parametrize("name, copy_type", TC_ER_018_DATA, ids=[x[0] for x in TC_ER_018_DATA])
 @pytest.mark.skipif(not generic_conf.get(
     Component.PRIVATE_COPY_STREAM), reason = "Configuration doesn't have private copy stream")
+@pytest.mark.manifest_config(batch_size='4')
 def test_rtc9726_tc_er_018_private_copy(stream, name, copy_type):
     """
     Schedule UNIQUE copy recording (20 - 10 same start/end time, 10 different start/end times), batch size 4.
@@ -54,16 +50,6 @@ def test_rtc9726_tc_er_018_private_copy(stream, name, copy_type):
     same_start_time_recordings = 10
 
     try:
-        #Taking backup of v2pc pod config info, editing the config and then restarting the services
-        is_valid, error = cleanup(redeploy_config_map, V2pc.MANIFEST_AGENT, revert=True)
-        assert is_valid, error
-
-        is_valid, error = v2pc_edit_manifest_config(V2pc.MANIFEST_AGENT, batch_size='4')
-        assert is_valid, error
-
-        is_valid, error = verify_batch_size_update(V2pc.MANIFEST_AGENT, Component.VMR, "4")
-        assert is_valid, error
-
         queue = Queue.Queue()
         start_time = utils.get_formatted_time(constants.SECONDS * 30, TimeFormat.TIME_FORMAT_MS, stream)
         end_time = utils.get_formatted_time(constants.SECONDS * 80, TimeFormat.TIME_FORMAT_MS, stream)
@@ -167,10 +153,6 @@ def test_rtc9726_tc_er_018_private_copy(stream, name, copy_type):
             assert is_valid, error
 
     finally:
-        #Revert back the v2pc config changes
-        is_valid, error = cleanup(redeploy_config_map, V2pc.MANIFEST_AGENT, revert=True)
-        assert is_valid, error
-
         if recording_pool:
             recording_pool.close()
             recording_pool.join()
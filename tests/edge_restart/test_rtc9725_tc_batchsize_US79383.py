@@ -14,16 +14,10 @@ import helpers.notification.utils as notification_utils
 import validators.validate_common as validate_common
 import validators.validate_recordings as validate_recordings
 
-from helpers.constants import Component
 from helpers.constants import TestLog
 from helpers.constants import TimeFormat
 from helpers.constants import ValidationError
 from helpers.constants import RecordingAttribute
-from helpers.constants import V2pc
-from helpers.utils import cleanup
-from helpers.vmr.vmr_helper import v2pc_edit_manifest_config
-from helpers.vmr.vmr_helper import verify_batch_size_update
-from helpers.vmr.vmr_helper import redeploy_config_map
 
 
 pytestmark = pytest.mark.recording
@@ -34,6 +28,7 @@ TC_ER_001_002_DATA = [("rtc9725_bulk_recordings_common", RecordingAttribute.COPY
 @utils.test_case_logger
 @pytest.mark.parametrize("name, copy_type", TC_ER_001_002_DATA, ids=[x[0] for x in
                                                                         TC_ER_001_002_DATA])
+@pytest.mark.manifest_config(batch_size='4')
 def test_rtc9725_tc_change_batch_size_multiple(stream, name, copy_type):
     """
     Schedule UNIQUE copy recording (20 - 10 same start/end time, 10 different start/end times), batch size 4.
@@ -44,20 +39,8 @@ def test_rtc9725_tc_change_batch_size_multiple(stream, name, copy_type):
     total_recording = 20
     diff_start_time_recordings = 10
     same_start_time_recordings = 10
-    service_name = V2pc.MANIFEST_AGENT
-    namespace = Component.VMR
 
     try:
-        #Taking backup of v2pc pod config info, editing the config and then restarting the services
-        is_valid, error = cleanup(redeploy_config_map, service_name, revert=True)
-        assert is_valid, error
-
-        is_valid, error = v2pc_edit_manifest_config(V2pc.MANIFEST_AGENT, batch_size='4')
-        assert is_valid, error
-
-        is_valid, error = verify_batch_size_update(service_name, namespace, "4")
-        assert is_valid, error
-
         queue = Queue.Queue()
         start_time = utils.get_formatted_time(constants.SECONDS * 30, TimeFormat.TIME_FORMAT_MS, stream)
         end_time = utils.get_formatted_time(constants.SECONDS * 90, TimeFormat.TIME_FORMAT_MS, stream)
@@ -143,10 +126,6 @@ def test_rtc9725_tc_change_batch_size_multiple(stream, name, copy_type):
             assert is_valid, error
 
     finally:
-        #Revert back the v2pc config changes
-        is_valid, error = cleanup(redeploy_config_map, service_name, revert=True)
-        assert is_valid, error
-
         if recording_pool:
             recording_pool.close()
             recording_pool.join()
@@ -13,13 +13,8 @@ import helpers.constants as constants
 import helpers.vmr.rio.api as rio
 import helpers.vmr.a8.a8_helper as a8
 import helpers.models.recording as recording_model
-import helpers.notification.utils as notification_utils
+import framework.recovery as recovery
 
-from helpers.vmr.vmr_helper import v2pc_edit_manifest_config
-from helpers.vmr.vmr_helper import redeploy_config_map
-from helpers.vmr.vmr_helper import verify_batch_size_update
-from helpers.vmr.vmr_helper import delete_vmr_pods
-from helpers.utils import cleanup
 from helpers.constants import ValidationError
 from helpers.constants import TestLog
 from helpers.constants import Component
@@ -36,7 +31,8 @@ TC_ER_003_004_DATA = [("rtc9728_bulk_recordings_unique", RecordingAttribute.COPY
 @utils.test_case_logger
 @pytest.mark.parametrize("name, copy_type", TC_ER_003_004_DATA, ids=[x[0] for x in
                                                                       TC_ER_003_004_DATA])
-def test_er_003_004_recording_incomplete(stream, name, copy_type):
+@pytest.mark.manifest_config(batch_size='4')
+def test_er_003_004_recording_incomplete(stream, name, copy_type, notification_server, recovery_timelines):
     """
     Create multiple recordings with copy type as COMMON
     """
@@ -49,22 +45,9 @@ def test_er_003_004_recording_incomplete(stream, name, copy_type):
     same_start_time_recordings = 10
     recording_duration = 30  # in sec
     response_a8 = None
-    service_name = V2pc.MANIFEST_AGENT
-    namespace = Component.VMR
 
     try:
         
-        # backup v2pc master config
-        is_valid, error = cleanup(redeploy_config_map, service_name, revert=True)
-        assert is_valid, error
-
-        is_valid, error = v2pc_edit_manifest_config(V2pc.MANIFEST_AGENT, batch_size='4')
-        assert is_valid, error
-
-        is_valid, error = verify_batch_size_update(service_name, namespace, "4")
-        assert is_valid, error
-        
-    
         queue = Queue.Queue()
         start_time = utils.get_formatted_time(constants.SECONDS * recording_duration, TimeFormat.TIME_FORMAT_MS, stream)
         end_time = utils.get_formatted_time(constants.SECONDS * recording_duration * 5, TimeFormat.TIME_FORMAT_MS,
@@ -92,7 +75,7 @@ def test_er_003_004_recording_incomplete(stream, name, copy_type):
         # get recording id and update url
         for i in range(total_recording):
             recording_id = recording.get_entry(i).RecordingId
-            web_service_objects.append(notification_utils.get_web_service_object(recording_id))
+            web_service_objects.append(notification_server.register(recording_id))
             recording.get_entry(i).UpdateUrl = web_service_objects[i].get_url()
 
         # create recording
@@ -123,7 +106,10 @@ def test_er_003_004_recording_incomplete(stream, name, copy_type):
             assert is_valid, error
 
         #restarting segment recorder to make INCOMPLETE recording
-        is_valid, error = delete_vmr_pods(V2pc.SEGMENT_RECORDER)
+        timeline = recovery.RecoveryTimeline(V2pc.SEGMENT_RECORDER, Component.VMR,
+                                             [entry.RecordingId for entry in recording.Entries])
+        recovery_timelines.append(timeline)
+        is_valid, error = recovery.restart_pods(timeline)
         assert is_valid, error
 
         # validate playback using vle
@@ -179,9 +165,6 @@ def test_er_003_004_recording_incomplete(stream, name, copy_type):
                 assert 'discontinuity' in error, error
 
     finally:
-        is_valid, error = cleanup(redeploy_config_map, service_name, revert=True)
-        assert is_valid, error
-
         if recording_pool:
             recording_pool.close()
             recording_pool.join()
@@ -12,25 +12,26 @@ import helpers.utils as utils
 import helpers.constants as constants
 import helpers.vmr.rio.api as rio
 import helpers.vmr.a8.a8_helper as a8
-import helpers.vmr.archive_helper as archive_helper
 import helpers.models.recording as recording_model
-import helpers.notification.utils as notification_utils
+import framework.poller as poller
+import framework.recovery as recovery
 
+from helpers.constants import Component
 from helpers.constants import Cos
 from helpers.constants import TestLog
-from helpers.constants import Archive
 from helpers.constants import TimeFormat
 from helpers.constants import RecordingAttribute
 from helpers.constants import V2pc
 from helpers.constants import ValidationError
-from helpers.vmr.vmr_helper import delete_vmr_pods
+from framework.rio import find_recordings
 
 PYTESTMARK = pytest.mark.recording
 LOGGER = logging.getLogger(TestLog.TEST_LOGGER)
 
 
 @utils.test_case_logger
-def test_rtc9729_er_005_recording_incomplete_us62460(stream):
+@pytest.mark.config_mutating
+def test_rtc9729_er_005_recording_incomplete_us62460(stream, notification_server, recovery_timelines):
     """
     Archiving of INCOMPELTE UNIQUE copy recordings and playback
     """
@@ -57,7 +58,7 @@ def test_rtc9729_er_005_recording_incomplete_us62460(stream):
         # get recording id and update url
         for i in range(total_rec):
             recording_id = recording.get_entry(i).RecordingId
-            web_service_objects.append(notification_utils.get_web_service_object(recording_id))
+            web_service_objects.append(notification_server.register(recording_id))
             recording.get_entry(i).UpdateUrl = web_service_objects[i].get_url()
 
         # create recording
@@ -88,7 +89,10 @@ def test_rtc9729_er_005_recording_incomplete_us62460(stream):
             assert is_valid, error
 
         #restarting segment recorder to make INCOMPLETE recording
-        is_valid, error = delete_vmr_pods(V2pc.SEGMENT_RECORDER)
+        timeline = recovery.RecoveryTimeline(V2pc.SEGMENT_RECORDER, Component.VMR,
+                                             [entry.RecordingId for entry in recording.Entries])
+        recovery_timelines.append(timeline)
+        is_valid, error = recovery.restart_pods(timeline)
         assert is_valid, error
 
         #Verifying recording INCOMPLETE STATE
@@ -105,9 +109,12 @@ def test_rtc9729_er_005_recording_incomplete_us62460(stream):
 
         # recording should have been completed by this time
         # Verifying recording in archive storage
-        archive_helper.wait_for_archival(stream, recording.get_entry(0).RecordingId, Archive.ARCHIVE, Archive.COMPLETE)
+        archived_ids = [recording.get_entry(i).RecordingId for i in range(total_rec)]
+        is_valid, error = poller.wait_for_archival(archived_ids, rec_status='INCOMPLETE')
+        assert is_valid, error
+        responses = find_recordings([recording.get_entry(i).RecordingId for i in range(total_rec)])
         for i in range(total_rec):
-            response = rio.find_recording(recording.get_entry(i).RecordingId).json()
+            response = responses[recording.get_entry(i).RecordingId]
             is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ARCHIVE_STORAGE,
                                                                              Cos.RECORDING_STORED,
                                                                              rec_status='INCOMPLETE')
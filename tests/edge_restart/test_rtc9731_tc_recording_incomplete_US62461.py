@@ -11,9 +11,9 @@ import helpers.vmr.rio.api as rio
 import helpers.vmr.a8.a8_helper as a8
 import helpers.vmr.archive_helper as archive_helper
 import helpers.models.recording as recording_model
-import helpers.notification.utils as notification_utils
 import validators.validate_common as validate_common
 import validators.validate_recordings as validate_recordings
+import framework.recovery as recovery
 
 from helpers.constants import Component
 from helpers.constants import TestLog
@@ -22,11 +22,6 @@ from helpers.constants import TimeFormat
 from helpers.constants import ValidationError
 from helpers.constants import RecordingAttribute
 from helpers.constants import V2pc
-from helpers.utils import cleanup
-from helpers.vmr.vmr_helper import v2pc_edit_manifest_config
-from helpers.vmr.vmr_helper import redeploy_config_map
-from helpers.vmr.vmr_helper import verify_batch_size_update
-from helpers.vmr.vmr_helper import delete_vmr_pods
 
 
 pytestmark = pytest.mark.recording
@@ -38,7 +33,9 @@ TC_ER_006_007_DATA = [("rtc9731_bulk_recordings_unique", RecordingAttribute.COPY
 
 @utils.test_case_logger
 @pytest.mark.parametrize("name, copy_type", TC_ER_006_007_DATA, ids=[x[0] for x in TC_ER_006_007_DATA])
-def test_tc_er_006_007_incomplete_delete_playback_US62461(stream, name, copy_type):
+@pytest.mark.manifest_config(batch_size='4')
+def test_tc_er_006_007_incomplete_delete_playback_US62461(stream, name, copy_type, notification_server,
+                                                          recovery_timelines):
     """
     Create multiple recordings with copy type as COMMON
     """
@@ -49,20 +46,8 @@ def test_tc_er_006_007_incomplete_delete_playback_US62461(stream, name, copy_typ
     total_recording = 20
     diff_start_time_recordings = 10
     same_start_time_recordings = 10
-    service_name = V2pc.MANIFEST_AGENT
-    namespace = Component.VMR
 
     try:
-        #Taking backup of v2pc pod config info, editing the config and then restarting the services
-        is_valid, error = cleanup(redeploy_config_map, service_name, revert=True)
-        assert is_valid, error
-
-        is_valid, error = v2pc_edit_manifest_config(V2pc.MANIFEST_AGENT, batch_size='4')
-        assert is_valid, error
-
-        is_valid, error = verify_batch_size_update(service_name, namespace, "4")
-        assert is_valid, error
-
         queue = Queue.Queue()
         start_time = utils.get_formatted_time(constants.SECONDS * 30, TimeFormat.TIME_FORMAT_MS, stream)
         end_time = utils.get_formatted_time(constants.SECONDS * 160, TimeFormat.TIME_FORMAT_MS, stream)
@@ -79,7 +64,7 @@ def test_tc_er_006_007_incomplete_delete_playback_US62461(stream, name, copy_typ
 
         for i in range(total_recording):
             recording_id = recording.get_entry(i).RecordingId
-            web_service_objects.append(notification_utils.get_web_service_object(recording_id))
+            web_service_objects.append(notification_server.register(recording_id))
             recording.get_entry(i).UpdateUrl = web_service_objects[i].get_url()
         last_recording_id = rec_with_diff_time.Entries[0].RecordingId
 
@@ -111,7 +96,10 @@ def test_tc_er_006_007_incomplete_delete_playback_US62461(stream, name, copy_typ
             assert is_valid, error
       
         #restarting segment recorder to make INCOMPLETE recording
-        is_valid, error = delete_vmr_pods(V2pc.SEGMENT_RECORDER)
+        timeline = recovery.RecoveryTimeline(V2pc.SEGMENT_RECORDER, Component.VMR,
+                                             [entry.RecordingId for entry in recording.Entries])
+        recovery_timelines.append(timeline)
+        is_valid, error = recovery.restart_pods(timeline)
         assert is_valid, error
 
         #Verifying recording INCOMPLETE STATE
@@ -139,10 +127,6 @@ def test_tc_er_006_007_incomplete_delete_playback_US62461(stream, name, copy_typ
         assert is_valid, error
 
     finally:
-        #Revert back the v2pc config changes
-        is_valid, error = cleanup(redeploy_config_map, service_name, revert=True)
-        assert is_valid, error
-
         if recording_pool:
             recording_pool.close()
             recording_pool.join()
@@ -10,19 +10,19 @@ import helpers.constants as constants
 import helpers.vmr.rio.api as rio
 import helpers.vmr.a8.a8_helper as a8
 import helpers.models.recording as recording_model
-import helpers.notification.utils as notification_utils
 import validators.validate_common as validate_common
 import validators.validate_storage as validate_storage
 import validators.validate_recordings as validate_recordings
+import framework.recovery as recovery
 
+from helpers.constants import Component
 from helpers.constants import Cos
 from helpers.constants import TestLog
 from helpers.constants import TimeFormat
 from helpers.constants import ValidationError
 from helpers.constants import RecordingAttribute
 from helpers.constants import V2pc
-
-from helpers.vmr.vmr_helper import delete_vmr_pods
+from framework.rio import find_recordings
 
 
 pytestmark = pytest.mark.recording
@@ -34,7 +34,9 @@ TC_ER_008_009_DATA = [("rtc9732_bulk_recordings_common", RecordingAttribute.COPY
 
 @utils.test_case_logger
 @pytest.mark.parametrize("name, copy_type", TC_ER_008_009_DATA, ids=[x[0] for x in TC_ER_008_009_DATA])
-def test_er_008_009_recording_recovery_manifest_restart_(stream, name, copy_type):
+@pytest.mark.config_mutating
+def test_er_008_009_recording_recovery_manifest_restart_(stream, name, copy_type, notification_server,
+                                                         recovery_timelines):
     """
     UNIQUE  and COMMON copy Recording recovery
     """
@@ -58,7 +60,7 @@ def test_er_008_009_recording_recovery_manifest_restart_(stream, name, copy_type
 
         for i in range(total_recording):
             recording_id = recording.get_entry(i).RecordingId
-            web_service_objects.append(notification_utils.get_web_service_object(recording_id))
+            web_service_objects.append(notification_server.register(recording_id))
             recording.get_entry(i).UpdateUrl = web_service_objects[i].get_url()
 
         LOGGER.debug("Recording instance created=%s", recording.serialize())
@@ -89,7 +91,10 @@ def test_er_008_009_recording_recovery_manifest_restart_(stream, name, copy_type
             is_valid, error = queue.get()
             assert is_valid, error
 
-        is_valid, error = delete_vmr_pods(V2pc.MANIFEST_AGENT)
+        timeline = recovery.RecoveryTimeline(V2pc.MANIFEST_AGENT, Component.VMR,
+                                             [entry.RecordingId for entry in recording.Entries])
+        recovery_timelines.append(timeline)
+        is_valid, error = recovery.restart_pods(timeline)
         assert is_valid, error
 
         response = rio.find_recording(last_recording_id).json()
@@ -112,8 +117,9 @@ def test_er_008_009_recording_recovery_manifest_restart_(stream, name, copy_type
             assert is_valid, error
 
         #Verifying recording in storage
+        responses = find_recordings([recording.get_entry(i).RecordingId for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording.get_entry(i).RecordingId).json()
+            response = responses[recording.get_entry(i).RecordingId]
             is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ACTIVE_STORAGE,
                                                                              Cos.RECORDING_STORED)
 
@@ -9,26 +9,21 @@ import helpers.utils as utils
 import helpers.constants as constants
 import helpers.vmr.rio.api as rio
 import helpers.vmr.a8.a8_helper as a8
-import helpers.vmr.archive_helper as archive_helper
 import helpers.models.recording as recording_model
-import helpers.notification.utils as notification_utils
 import validators.validate_common as validate_common
 import validators.validate_storage as validate_storage
 import validators.validate_recordings as validate_recordings
+import framework.poller as poller
+import framework.recovery as recovery
 
 from helpers.constants import Component
 from helpers.constants import Cos
 from helpers.constants import TestLog
-from helpers.constants import Archive
 from helpers.constants import TimeFormat
 from helpers.constants import ValidationError
 from helpers.constants import RecordingAttribute
 from helpers.constants import V2pc
-from helpers.utils import cleanup
-from helpers.vmr.vmr_helper import v2pc_edit_manifest_config
-from helpers.vmr.vmr_helper import redeploy_config_map
-from helpers.vmr.vmr_helper import verify_batch_size_update
-from helpers.vmr.vmr_helper import delete_vmr_pods
+from framework.rio import find_recordings
 
 pytestmark = pytest.mark.recording
 LOGGER = logging.getLogger(TestLog.TEST_LOGGER)
@@ -39,7 +34,9 @@ TC_ER_008_009_DATA = [("rtc9733_bulk_recordings_unique", RecordingAttribute.COPY
 
 @utils.test_case_logger
 @pytest.mark.parametrize("name, copy_type", TC_ER_008_009_DATA, ids=[x[0] for x in TC_ER_008_009_DATA])
-def test_er_008_009_recording_recovery_manifest_restart_(stream, name, copy_type):
+@pytest.mark.manifest_config(batch_size='4')
+def test_er_008_009_recording_recovery_manifest_restart_(stream, name, copy_type, notification_server,
+                                                         recovery_timelines):
     """
     UNIQUE  and COMMON copy Recording recovery
     """
@@ -50,20 +47,8 @@ def test_er_008_009_recording_recovery_manifest_restart_(stream, name, copy_type
     total_recording = 20
     diff_start_time_recordings = 10
     same_start_time_recordings = 10
-    service_name = V2pc.MANIFEST_AGENT
-    namespace = Component.VMR
 
     try:
-        #Taking backup of v2pc pod config info and editing the config and then restarting the services
-        is_valid, error = cleanup(redeploy_config_map, service_name, revert=True)
-        assert is_valid, error
-
-        is_valid, error = v2pc_edit_manifest_config(V2pc.MANIFEST_AGENT, batch_size='4')
-        assert is_valid, error
-
-        is_valid, error = verify_batch_size_update(service_name, namespace, "4")
-        assert is_valid, error
-
         queue = Queue.Queue()
         start_time = utils.get_formatted_time(constants.SECONDS * 30, TimeFormat.TIME_FORMAT_MS, stream)
         end_time = utils.get_formatted_time(constants.SECONDS * 150, TimeFormat.TIME_FORMAT_MS, stream)
@@ -83,7 +68,7 @@ def test_er_008_009_recording_recovery_manifest_restart_(stream, name, copy_type
 
         for i in range(total_recording):
             recording_id = recording.get_entry(i).RecordingId
-            web_service_objects.append(notification_utils.get_web_service_object(recording_id))
+            web_service_objects.append(notification_server.register(recording_id))
             recording.get_entry(i).UpdateUrl = web_service_objects[i].get_url()
 
         LOGGER.debug("Recording instance created=%s", recording.serialize())
@@ -116,7 +101,10 @@ def test_er_008_009_recording_recovery_manifest_restart_(stream, name, copy_type
             assert is_valid, error
 
 
-        is_valid, error = delete_vmr_pods(V2pc.MANIFEST_AGENT)
+        timeline = recovery.RecoveryTimeline(V2pc.MANIFEST_AGENT, Component.VMR,
+                                             [entry.RecordingId for entry in recording.Entries])
+        recovery_timelines.append(timeline)
+        is_valid, error = recovery.restart_pods(timeline)
         assert is_valid, error
 
         response = rio.find_recording(last_recording_id).json()
@@ -139,8 +127,9 @@ def test_er_008_009_recording_recovery_manifest_restart_(stream, name, copy_type
             assert is_valid, error
 
         #Verifying recording in storage
+        responses = find_recordings([recording.get_entry(i).RecordingId for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording.get_entry(i).RecordingId).json()
+            response = responses[recording.get_entry(i).RecordingId]
             is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ACTIVE_STORAGE,
                                                                              Cos.RECORDING_STORED)
 
@@ -148,9 +137,12 @@ def test_er_008_009_recording_recovery_manifest_restart_(stream, name, copy_type
 
 
         #Verfying Archive storage
-        archive_helper.wait_for_archival(stream, recording.get_entry(0).RecordingId, Archive.ARCHIVE, Archive.COMPLETE)
+        archived_ids = [recording.get_entry(i).RecordingId for i in range(total_recording)]
+        is_valid, error = poller.wait_for_archival(archived_ids)
+        assert is_valid, error
+        responses = find_recordings([recording.get_entry(i).RecordingId for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording.get_entry(i).RecordingId).json()
+            response = responses[recording.get_entry(i).RecordingId]
             is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ARCHIVE_STORAGE,
                                                                              Cos.RECORDING_STORED)
             assert is_valid, error
@@ -160,9 +152,6 @@ def test_er_008_009_recording_recovery_manifest_restart_(stream, name, copy_type
 
     
     finally:
-        is_valid, error = cleanup(redeploy_config_map, service_name, revert=True)
-        assert is_valid, error
-
         if recording_pool:
             recording_pool.close()
             recording_pool.join()
@@ -9,22 +9,21 @@ import helpers.utils as utils
 import helpers.constants as constants
 import helpers.vmr.rio.api as rio
 import helpers.vmr.a8.a8_helper as a8
-import helpers.vmr.archive_helper as archive_helper
 import helpers.models.recording as recording_model
-import helpers.notification.utils as notification_utils
 import validators.validate_common as validate_common
 import validators.validate_storage as validate_storage
-import validators.validate_recordings as validate_recordings
+import framework.poller as poller
+import framework.recovery as recovery
 
+from helpers.constants import Component
 from helpers.constants import Cos
 from helpers.constants import TestLog
-from helpers.constants import Archive
 from helpers.constants import TimeFormat
 from helpers.constants import ValidationError
 from helpers.constants import RecordingAttribute
 from helpers.constants import V2pc
 
-from helpers.vmr.vmr_helper import delete_vmr_pods
+from framework.rio import find_recordings
 
 
 pytestmark = pytest.mark.recording
@@ -33,7 +32,8 @@ LOGGER = logging.getLogger(TestLog.TEST_LOGGER)
 
 
 @utils.test_case_logger
-def test_rtc9735_er_011_hybrid_recording_recovery_manifest_restart(stream):
+@pytest.mark.config_mutating
+def test_rtc9735_er_011_hybrid_recording_recovery_manifest_restart(stream, notification_server, recovery_timelines):
     """
     Hybrid (UNIQUE  and COMMON) copy Recording recovery
     """
@@ -61,7 +61,7 @@ def test_rtc9735_er_011_hybrid_recording_recovery_manifest_restart(stream):
 
         for i in range(total_recording):
             recording_id = recording.get_entry(i).RecordingId
-            web_service_objects.append(notification_utils.get_web_service_object(recording_id))
+            web_service_objects.append(notification_server.register(recording_id))
             recording.get_entry(i).UpdateUrl = web_service_objects[i].get_url()
 
         LOGGER.debug("Recording instance created=%s", recording.serialize())
@@ -85,8 +85,8 @@ def test_rtc9735_er_011_hybrid_recording_recovery_manifest_restart(stream):
         # Verifying recording is started or not
         recording_pool = mp_pool.ThreadPool()
         for i in range(total_recording):
-            recording_pool.apply_async(validate_recordings.validate_notification,
-                                       (web_service_objects[i], constants.RecordingStatus.STARTED, wait_time),
+            recording_pool.apply_async(web_service_objects[i].wait_for_status,
+                                       (constants.RecordingStatus.STARTED, wait_time + constants.SECONDS * 30),
                                        callback=queue.put)
 
         for i in range(total_recording):
@@ -95,7 +95,10 @@ def test_rtc9735_er_011_hybrid_recording_recovery_manifest_restart(stream):
 
 
         # Restarting manifest agent
-        is_valid, error = delete_vmr_pods(V2pc.MANIFEST_AGENT)
+        timeline = recovery.RecoveryTimeline(V2pc.MANIFEST_AGENT, Component.VMR,
+                                             [entry.RecordingId for entry in recording.Entries])
+        recovery_timelines.append(timeline)
+        is_valid, error = recovery.restart_pods(timeline)
         assert is_valid, error
 
         end_time = utils.get_parsed_time(response[0][RecordingAttribute.END_TIME][:-1])
@@ -105,8 +108,8 @@ def test_rtc9735_er_011_hybrid_recording_recovery_manifest_restart(stream):
             wait_time = 0
 
         for i in range(total_recording):
-            recording_pool.apply_async(validate_recordings.validate_notification,
-                                       (web_service_objects[i], constants.RecordingStatus.COMPLETE, wait_time),
+            recording_pool.apply_async(web_service_objects[i].wait_for_status,
+                                       (constants.RecordingStatus.COMPLETE, wait_time + constants.SECONDS * 30),
                                        callback=queue.put)
 
         for i in range(total_recording):
@@ -114,18 +117,21 @@ def test_rtc9735_er_011_hybrid_recording_recovery_manifest_restart(stream):
             assert is_valid, error
 
         # Verifying recording in storage
+        responses = find_recordings([recording.get_entry(i).RecordingId for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording.get_entry(i).RecordingId).json()
+            response = responses[recording.get_entry(i).RecordingId]
             is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ACTIVE_STORAGE,
                                                                              Cos.RECORDING_STORED)
             assert is_valid, error
 
 
         # Verfying Archive storage
-        archive_helper.wait_for_archival(stream, recording.get_entry(0).RecordingId, Archive.ARCHIVE,
-                                         Archive.COMPLETE)
+        archived_ids = [recording.get_entry(i).RecordingId for i in range(total_recording)]
+        is_valid, error = poller.wait_for_archival(archived_ids)
+        assert is_valid, error
+        responses = find_recordings([recording.get_entry(i).RecordingId for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording.get_entry(i).RecordingId).json()
+            response = responses[recording.get_entry(i).RecordingId]
             is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ARCHIVE_STORAGE,
                                                                              Cos.RECORDING_STORED)
             assert is_valid, error
@@ -10,25 +10,19 @@ import helpers.utils as utils
 import helpers.constants as constants
 import helpers.vmr.rio.api as rio
 import helpers.vmr.a8.a8_helper as a8
-import helpers.vmr.archive_helper as archive_helper
 import helpers.models.recording as recording_model
 import helpers.notification.utils as notification_utils
 import validators.validate_common as validate_common
 import validators.validate_storage as validate_storage
 import validators.validate_recordings as validate_recordings
+import framework.poller as poller
 
-from helpers.constants import Component
 from helpers.constants import Cos
 from helpers.constants import TestLog
-from helpers.constants import Archive
 from helpers.constants import TimeFormat
 from helpers.constants import ValidationError
 from helpers.constants import RecordingAttribute
-from helpers.constants import V2pc
-from helpers.utils import cleanup
-from helpers.vmr.vmr_helper import v2pc_edit_manifest_config
-from helpers.vmr.vmr_helper import redeploy_config_map
-from helpers.vmr.vmr_helper import verify_batch_size_update
+from framework.rio import find_recordings
 
 
 pytestmark = pytest.mark.recording
@@ -36,6 +30,7 @@ LOGGER = logging.getLogger(TestLog.TEST_LOGGER)
 
 
 @utils.test_case_logger
+@pytest.mark.manifest_config(batch_size='4')
 def test_rtc9736_tc_er_012_hybrid_archival_batch_size_multiple(stream):
     """
     Hybrid copy - archiving :Schedule Unique copy and common copy recording (20 - 10 same start/end time, 10 different start/end times), batch size 4.
@@ -47,20 +42,8 @@ def test_rtc9736_tc_er_012_hybrid_archival_batch_size_multiple(stream):
     total_recording = 20
     diff_start_time_recordings = 10
     same_start_time_recordings = 10
-    service_name = V2pc.MANIFEST_AGENT
-    namespace = Component.VMR
 
     try:
-        # Taking backup of v2pc pod config info and editing the config and then restarting the services
-        is_valid, error = cleanup(redeploy_config_map, service_name, revert=True)
-        assert is_valid, error
-
-        is_valid, error = v2pc_edit_manifest_config(V2pc.MANIFEST_AGENT, batch_size='4')
-        assert is_valid, error
-
-        is_valid, error = verify_batch_size_update(service_name, namespace, "4")
-        assert is_valid, error
-    
         queue = Queue.Queue()
         start_time = utils.get_formatted_time(constants.SECONDS * 30, TimeFormat.TIME_FORMAT_MS, stream)
         end_time = utils.get_formatted_time(constants.SECONDS * 80, TimeFormat.TIME_FORMAT_MS, stream)
@@ -132,11 +115,13 @@ def test_rtc9736_tc_er_012_hybrid_archival_batch_size_multiple(stream):
 
 
         #Verfying storage archive storage after archival time
-        archive_helper.wait_for_archival(stream, recording.get_entry(0).RecordingId, Archive.ARCHIVE,
-                                         Archive.COMPLETE)
+        archived_ids = [recording.get_entry(i).RecordingId for i in range(total_recording)]
+        is_valid, error = poller.wait_for_archival(archived_ids)
+        assert is_valid, error
 
+        responses = find_recordings([recording.get_entry(i).RecordingId for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording.get_entry(i).RecordingId).json()
+            response = responses[recording.get_entry(i).RecordingId]
             is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ARCHIVE_STORAGE,
                                                                               Cos.RECORDING_STORED)
             assert is_valid, error
@@ -155,10 +140,6 @@ def test_rtc9736_tc_er_012_hybrid_archival_batch_size_multiple(stream):
 
         	
     finally:
-        #Revert back the v2pc config changes
-        is_valid, error = cleanup(redeploy_config_map, service_name, revert=True)
-        assert is_valid, error
-
         if recording_pool:
             recording_pool.close()
             recording_pool.join()
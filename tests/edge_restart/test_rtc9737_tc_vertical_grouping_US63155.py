@@ -15,11 +15,7 @@ import helpers.v2pc.v2pc_helper as v2pc
 from helpers.constants import TestLog
 from helpers.constants import TimeFormat
 from helpers.constants import RecordingAttribute
-from helpers.constants import V2pc
 from helpers.v2pc.v2pc_helper import verify_vertical_grouping
-from helpers.utils import cleanup
-from helpers.vmr.vmr_helper import v2pc_edit_manifest_config
-from helpers.vmr.vmr_helper import redeploy_config_map
 
 pytestmark = pytest.mark.recording
 LOGGER = logging.getLogger(TestLog.TEST_LOGGER)
@@ -30,6 +26,7 @@ TC_ER_013_DATA = [("common", RecordingAttribute.COPY_TYPE_COMMON), ("unique", Re
 @utils.test_case_logger
 @pytest.mark.parametrize("name, copy_type", TC_ER_013_DATA, ids=[x[0] for x in
                                                                         TC_ER_013_DATA])
+@pytest.mark.manifest_config(vertical_grouping="*")
 def test_rtc9737_tc_er_013_vertical_grouping(stream, name, copy_type):
     """
     Vertical Grouping - Enable vertical grouping on all profiles in MA.
@@ -37,19 +34,11 @@ def test_rtc9737_tc_er_013_vertical_grouping(stream, name, copy_type):
 
     web_service_obj = None
     recording = None
-    service_name = V2pc.MANIFEST_AGENT
     stream_name = nsa.get_stream(stream).json()[0][constants.STREAM_NAME]
     profile_data = v2pc.get_all_stream_profile_data(stream_name)
     assert len(profile_data)>=3, "Vertical grouping required minimum 3 profile for a stream"
 
     try:
-        #Taking backup of v2pc pod config info and editing the config and then restarting the services
-        is_valid, error = cleanup(redeploy_config_map, service_name, revert=True)
-        assert is_valid, error
-
-        is_valid, error = v2pc_edit_manifest_config(V2pc.MANIFEST_AGENT, vertical_grouping="*")
-        assert is_valid, error
-
         start_time = utils.get_formatted_time(constants.SECONDS * 30, TimeFormat.TIME_FORMAT_MS, stream)
         end_time = utils.get_formatted_time(constants.SECONDS * 60, TimeFormat.TIME_FORMAT_MS, stream)
         recording = recording_model.Recording(StartTime=start_time, EndTime=end_time, copyType=copy_type, StreamId=stream)
@@ -72,10 +61,6 @@ def test_rtc9737_tc_er_013_vertical_grouping(stream, name, copy_type):
     
         	
     finally:
-        #Revert back the v2pc config changes
-        is_valid, error = cleanup(redeploy_config_map, service_name, revert=True)
-        assert is_valid, error
-
         if web_service_obj:
             web_service_obj.stop_server()
 
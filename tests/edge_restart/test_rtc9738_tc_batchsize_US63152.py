@@ -9,25 +9,20 @@ import helpers.utils as utils
 import helpers.constants as constants
 import helpers.vmr.rio.api as rio
 import helpers.vmr.a8.a8_helper as a8
-import helpers.vmr.archive_helper as archive_helper
 import helpers.models.recording as recording_model
-import helpers.notification.utils as notification_utils
 import validators.validate_common as validate_common
 import validators.validate_storage as validate_storage
 import validators.validate_recordings as validate_recordings
+import framework.clock as clock
+import framework.waiters as waiters
+import framework.poller as poller
 
-from helpers.constants import Component
 from helpers.constants import Cos
 from helpers.constants import TestLog
-from helpers.constants import Archive
 from helpers.constants import TimeFormat
 from helpers.constants import ValidationError
 from helpers.constants import RecordingAttribute
-from helpers.constants import V2pc
-from helpers.utils import cleanup
-from helpers.vmr.vmr_helper import v2pc_edit_manifest_config
-from helpers.vmr.vmr_helper import redeploy_config_map
-from helpers.vmr.vmr_helper import verify_batch_size_update
+from framework.rio import find_recordings
 
 
 pytestmark = pytest.mark.recording
@@ -35,7 +30,8 @@ LOGGER = logging.getLogger(TestLog.TEST_LOGGER)
 
 
 @utils.test_case_logger
-def test_rtc9738_tc_er_014_hybrid_copy_different_batchsize(stream):
+@pytest.mark.manifest_config(batch_size='4')
+def test_rtc9738_tc_er_014_hybrid_copy_different_batchsize(stream, notification_server):
     """
     Schedule Hybrid copy recording (20 - 10 same start/end time, 10 different start/end times), batch size 4.
     """
@@ -46,20 +42,8 @@ def test_rtc9738_tc_er_014_hybrid_copy_different_batchsize(stream):
     total_recording = 20
     common_copy_recordings = 10
     unique_copy_recording_recordings = 10
-    service_name = V2pc.MANIFEST_AGENT
-    namespace = Component.VMR
    
     try:
-        #Taking backup of v2pc pod config info and editing the config and then restarting the services
-        is_valid, error = cleanup(redeploy_config_map, service_name, revert=True)
-        assert is_valid, error
-
-        is_valid, error = v2pc_edit_manifest_config(V2pc.MANIFEST_AGENT, batch_size='4')
-        assert is_valid, error
-
-        is_valid, error = verify_batch_size_update(service_name, namespace, "4")
-        assert is_valid, error
-
         queue = Queue.Queue()
         start_time = utils.get_formatted_time(constants.SECONDS * 30, TimeFormat.TIME_FORMAT_MS, stream)
         end_time = utils.get_formatted_time(constants.SECONDS * 80, TimeFormat.TIME_FORMAT_MS, stream)
@@ -79,7 +63,7 @@ def test_rtc9738_tc_er_014_hybrid_copy_different_batchsize(stream):
 
         for i in range(total_recording):
             recording_id = recording.get_entry(i).RecordingId
-            web_service_objects.append(notification_utils.get_web_service_object(recording_id))
+            web_service_objects.append(notification_server.register(recording_id))
             recording.get_entry(i).UpdateUrl = web_service_objects[i].get_url()
         last_recording_id = rec_with_diff_time.Entries[0].RecordingId
 
@@ -102,14 +86,12 @@ def test_rtc9738_tc_er_014_hybrid_copy_different_batchsize(stream):
             wait_time = 0
 
         #Verifying recording is started or not
+        recording_ids = [recording.get_entry(i).RecordingId for i in range(total_recording)]
+        is_valid, error = waiters.wait_for_states(recording_ids, constants.RecordingStatus.STARTED,
+                                                  clock.now() + wait_time, server=notification_server)
+        assert is_valid, error
+
         recording_pool = mp_pool.ThreadPool()
-        for i in range(total_recording):
-            recording_pool.apply_async(validate_recordings.validate_notification,
-                                       (web_service_objects[i], constants.RecordingStatus.STARTED, wait_time),
-                                       callback=queue.put)
-        for i in range(total_recording):
-            is_valid, error = queue.get()
-            assert is_valid, error
 
         #Verifying playback of recording in progress
         for i in range(total_recording):
@@ -131,19 +113,17 @@ def test_rtc9738_tc_er_014_hybrid_copy_different_batchsize(stream):
             assert is_valid, error
 
         #Verifying recording is completed or not
-        for i in range(total_recording):
-            recording_pool.apply_async(validate_recordings.validate_notification,
-                                       (web_service_objects[i], constants.RecordingStatus.COMPLETE),
-                                       callback=queue.put)
-
-        for i in range(total_recording):
-            is_valid, error = queue.get()
-            assert is_valid, error
+        is_valid, error = waiters.wait_for_states(recording_ids, constants.RecordingStatus.COMPLETE,
+                                                  clock.now() + constants.SECONDS * 120, server=notification_server)
+        assert is_valid, error
 
         #verify the recording in archive storage after archival time
-        archive_helper.wait_for_archival(stream, recording.get_entry(0).RecordingId, Archive.ARCHIVE, Archive.COMPLETE)
+        archived_ids = [recording.get_entry(i).RecordingId for i in range(total_recording)]
+        is_valid, error = poller.wait_for_archival(archived_ids)
+        assert is_valid, error
+        responses = find_recordings([recording.get_entry(i).RecordingId for i in range(total_recording)])
         for i in range(total_recording):
-            response = rio.find_recording(recording.get_entry(i).RecordingId).json()
+            response = responses[recording.get_entry(i).RecordingId]
             is_valid, error = validate_storage.validate_recording_in_storage(response, Cos.ARCHIVE_STORAGE,
                                                                              Cos.RECORDING_STORED)
             assert is_valid, error
@@ -162,10 +142,6 @@ def test_rtc9738_tc_er_014_hybrid_copy_different_batchsize(stream):
 
         	
     finally:
-        #Revert back the v2pc config changes
-        is_valid, error = cleanup(redeploy_config_map, service_name, revert=True)
-        assert is_valid, error
-
         if recording_pool:
             recording_pool.close()
             recording_pool.join()
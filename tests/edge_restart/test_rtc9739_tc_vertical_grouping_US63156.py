@@ -30,6 +30,7 @@ TC_ER_015_DATA = [("common", RecordingAttribute.COPY_TYPE_COMMON), ("unique", Re
 @utils.test_case_logger
 @pytest.mark.parametrize("name, copy_type", TC_ER_015_DATA, ids=[x[0] for x in
                                                                         TC_ER_015_DATA])
+@pytest.mark.config_mutating
 def test_rtc9739_tc_er_015_vertical_grouping(stream, name, copy_type):
     """
     Vertical Grouping - Enable vertical grouping excluding some top bitrates in MA
@@ -13,20 +13,18 @@ import validators.validate_recordings as validate_recordings
 from helpers.constants import TestLog
 from helpers.constants import TimeFormat
 from helpers.constants import RecordingAttribute
-from helpers.constants import V2pc
 from helpers.v2pc.v2pc_helper import verify_horizontal_grouping
-from helpers.utils import cleanup
-from helpers.vmr.vmr_helper import v2pc_edit_manifest_config
-from helpers.vmr.vmr_helper import redeploy_config_map
 
 pytestmark = pytest.mark.recording
 LOGGER = logging.getLogger(TestLog.TEST_LOGGER)
+GROUPING_DURATION = '12s'
 
 TC_ER_016_DATA = [("common", RecordingAttribute.COPY_TYPE_COMMON), ("unique", RecordingAttribute.COPY_TYPE_UNIQUE)]
 
 
 @utils.test_case_logger
 @pytest.mark.parametrize("name, copy_type", TC_ER_016_DATA, ids=[x[0] for x in TC_ER_016_DATA])
+@pytest.mark.manifest_config(horizontal_grouping=GROUPING_DURATION)
 def test_rtc9740_tc_er_016_horizontal_grouping(stream, name, copy_type):
     """
     Horizontal Grouping - Enable horizotal grouping for 12s.
@@ -34,16 +32,8 @@ def test_rtc9740_tc_er_016_horizontal_grouping(stream, name, copy_type):
 
     web_service_obj = None
     recording = None
-    grouping_duration= '12s'
 
     try:
-        #Taking backup of v2pc pod config info and editing the config and then restarting the services
-        is_valid, error = cleanup(redeploy_config_map, V2pc.MANIFEST_AGENT, revert=True)
-        assert is_valid, error
-
-        is_valid,error = v2pc_edit_manifest_config(V2pc.MANIFEST_AGENT, horizontal_grouping=grouping_duration)
-        assert is_valid, error
-
         start_time = utils.get_formatted_time(constants.SECONDS * 30, TimeFormat.TIME_FORMAT_MS, stream)
         end_time = utils.get_formatted_time(constants.SECONDS * 60, TimeFormat.TIME_FORMAT_MS, stream)
         recording = recording_model.Recording(StartTime=start_time, EndTime=end_time, copyType=copy_type, StreamId=stream)
@@ -60,17 +50,13 @@ def test_rtc9740_tc_er_016_horizontal_grouping(stream, name, copy_type):
 
         assert is_valid, error
 
-        is_valid, error = verify_horizontal_grouping(recording_id, grouping_duration)
+        is_valid, error = verify_horizontal_grouping(recording_id, GROUPING_DURATION)
         assert is_valid, error
 
         is_valid, error = validate_recordings.validate_playback(recording_id)
         assert is_valid, error
         
     finally:
-        #Revert back the v2pc config changes
-        is_valid, error = cleanup(redeploy_config_map, V2pc.MANIFEST_AGENT, revert=True)
-        assert is_valid, error
-
         if web_service_obj:
             web_service_obj.stop_server()
 
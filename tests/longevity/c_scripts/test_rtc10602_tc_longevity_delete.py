@@ -1,27 +1,25 @@
 import os
-import requests
-import time
 import json
 import random
 import pytest
+from collections import OrderedDict
 
 import helpers.constants as constants
-import helpers.models.recording as recording_model
 import helpers.utils as utils
-import helpers.vmr.a8.a8_helper as a8
 import helpers.vmr.rio.api as rio_api
-import validators.validate_common as validate_common
 import validators.validate_recordings as validate_recordings
-from helpers.models import recording as recording_model
+import framework.a8 as a8_bulk
+import framework.clock as clock
 from helpers.constants import ValidationError, TestDirectory
 
 
-def delete_recordings(del_ct, rec_list, rec_dict):
+def delete_recordings(del_ct, rec_list, rec_dict, deleted_results):
     """
     Delete the list of Recording from recording list
     :param del_ct: deleting count
     :param rec_list: list of recording idenitifers to delete
     :param rec_dict: recording details of recording
+    :param deleted_results: per recording results of the deletions, verified in RIO at the end of the test
     :return: (rec_list, rec_dict) - recording identifiers list, recording details list
     """
 
@@ -32,14 +30,20 @@ def delete_recordings(del_ct, rec_list, rec_dict):
     else:
         counts = rec_list_len
 
-    for inx in range(counts):
-        rec_id = rec_list[inx]
-        recording = recording_model.Recording(RecordingId=rec_id)
-        print "[DEBUG: ] deletion on recid ", rec_id
-        response = a8.delete_recording(recording)
-        is_valid, error = validate_common.validate_http_response_status_code(response, requests.codes.no_content)
-        assert is_valid, error
-        rec_list.remove(rec_id)
+    if counts == 0:
+        return rec_list, rec_dict
+
+    rec_ids = rec_list[:counts]
+    print "[DEBUG: ] deletion on recids ", rec_ids
+    # verification is done once for all deletions at the end, so the deletion rate is not slowed down
+    results = a8_bulk.delete_recordings(rec_ids, verify=False)
+    is_valid, error = a8_bulk.validate_results(results)
+    assert is_valid, error
+    deleted_results.update(results)
+
+    # the deleted identifiers are the head of the list, drop them in one slice instead of searching each
+    del rec_list[:counts]
+    for rec_id in rec_ids:
         rec_dict['items'].pop(rec_id)
     return rec_list, rec_dict
 
@@ -98,9 +102,15 @@ def test_rtc10602_tc_launch_delete(stream):
                 print
 
                 rec_list = rec_dict.get('rec_ids')
+                deleted_results = OrderedDict()
                 for i in range(total_test_loop_counts):
-                    rec_list, rec_dict = delete_recordings(deletions_per_sec_rounded, rec_list, rec_dict)
-                    time.sleep(sleep_duration)
+                    rec_list, rec_dict = delete_recordings(deletions_per_sec_rounded, rec_list, rec_dict,
+                                                           deleted_results)
+                    clock.sleep(sleep_duration)
+
+                a8_bulk.verify_deletion(deleted_results)
+                is_valid, error = a8_bulk.validate_results(deleted_results)
+                assert is_valid, error
             else:
                 assert False, ValidationError.TYPE_MISMATCH.format('deletespermin is not a number: {0}'.format(deletespermin))
 
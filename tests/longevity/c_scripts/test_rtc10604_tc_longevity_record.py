@@ -2,7 +2,6 @@ import logging
 import pytest
 import requests
 import yaml
-import time
 import os
 import json
 import errno
@@ -21,6 +20,7 @@ from helpers.constants import TestLog, RecordingAttribute
 from helpers.constants import TimeFormat, TestDirectory
 from validators.validate_recordings import validate_recording_avail
 import datetime as dt
+import framework.clock as clock
 
 
 def send_recording(req_ct, stream, rec_duration, recording_list, rec_idx):
@@ -119,7 +119,7 @@ def test_rtc10604_tc_launch_recordings(stream):
                 print "[INFO: ] recordingduration: ", recordingduration
                 recording_list, rec_idx = send_recording(
                     recordings_per_sec_round, stream, recordingduration, recording_list, rec_idx)
-                time.sleep(sleep_duration)
+                clock.sleep(sleep_duration)
             for rec_id in recording_list.get('rec_ids'):
                 status, msg = validate_recording_avail(rec_id)
                 recording_list['items'].update({rec_id: {"status": status, "msg": msg}})
@@ -136,7 +136,7 @@ def test_rtc10604_tc_launch_recordings(stream):
             sec_to_sleep, msg = utils.get_sec_to_complte_rec(response)
 
             print "[INFO: ] Waiting till recording moves to complete state in seconds ", sec_to_sleep
-            time.sleep(sec_to_sleep)
+            clock.sleep(sec_to_sleep)
             print "[INFO: ] wait time completed "
         else:
             assert False, ValidationError.TYPE_MISMATCH.format('recordingspermin is not a number: {0}'.format(recordingspermin))
@@ -42,6 +42,7 @@ mpe_config = utils.get_spec_config(Component.MPE)
 @utils.test_case_logger
 @pytest.mark.parametrize("channel", channels)
 @pytest.mark.skipif(V2PC_EXIST is False, reason="V2PC Doesn't Exist")
+@pytest.mark.config_mutating
 def test_HLS_Verify_codec_based_audio_filtering_V2PC_ipdvrtests_46(channel):
     """
     JIRA ID : IPDVRTESTS-46
@@ -194,6 +195,7 @@ def test_HLS_Verify_codec_based_audio_filtering_V2PC_ipdvrtests_46(channel):
 @utils.test_case_logger
 @pytest.mark.parametrize("channel", channels)
 @pytest.mark.skipif(V2PC_EXIST is True, reason="V2PC Exist")
+@pytest.mark.config_mutating
 def test_HLS_Verify_codec_based_audio_filtering_STANDALONE_ipdvrtests_46(channel):
     stream = channel
     web_service_obj = None
@@ -5,7 +5,6 @@ import os
 import m3u8
 import sys
 import yaml
-import time
 import json
 import helpers.constants as constants
 import helpers.utils as utils
@@ -27,6 +26,7 @@ from subprocess import check_output
 from helpers.constants import VMR_SERVICES_RESTART
 from helpers.constants import V2pc
 import helpers.v2pc.v2pc_helper as v2pc
+import framework.clock as clock
 
 LOGGER = logging.getLogger(os.environ.get("PYTEST_XDIST_WORKER", TestLog.TEST_LOGGER))
 CONFIG_INFO = utils.get_configInfo()
@@ -39,6 +39,7 @@ channels = streams_info[Component.STREAMS]
 @utils.test_case_logger
 @pytest.mark.parametrize("channel", channels)
 @pytest.mark.skipif(not V2PC_EXIST, reason="V2PC Doesn't Exist")
+@pytest.mark.config_mutating
 def test_TC10949_validate_pid_based_audio_filtering(channel):
     """
     TC10949: Modify existing publish template to filter audios based
@@ -167,6 +168,7 @@ def test_TC10949_validate_pid_based_audio_filtering(channel):
 @utils.test_case_logger
 @pytest.mark.parametrize("channel", channels)
 @pytest.mark.skipif(V2PC_EXIST is True, reason="V2PC Exist")
+@pytest.mark.config_mutating
 def test_TC10949_validate_pid_based_audio_filtering_no_v2pc(channel):
     """
     TC10949: Modify existing publish template to filter audios based
@@ -223,7 +225,7 @@ def test_TC10949_validate_pid_based_audio_filtering_no_v2pc(channel):
         assert redeploy_res, resp
         delete_pods, resp = vmr.delete_vmr_pods("All", "mpe-standalone")
         assert delete_pods, resp
-        time.sleep(10)        
+        clock.sleep(10)        
         
         # Create recording
         LOGGER.info("Creating Recording")
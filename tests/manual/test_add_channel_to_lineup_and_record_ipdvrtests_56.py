@@ -16,6 +16,7 @@ import helpers.vmr.rio.api as rio
 import validators.validate_common as validate_common
 import validators.validate_recordings as validate_recordings
 import validators.validate_storage as validate_storage
+import framework.logs as logs
 from helpers.constants import Cos, Feed, V2pc
 from helpers.constants import Component
 from helpers.constants import TestLog
@@ -166,10 +167,10 @@ def test_new_channel_to_lineup_ipdvrtests_56(stream):
         e_stamp = datetime.utcnow().strftime(TimeFormat.TIME_FORMAT_LOG)
 
         # Step 4: No errors in MA/SR
-        is_valid, error  = vmr_helper.verify_error_logs_in_vmr(stream, V2pc.MANIFEST_AGENT, Component.VMR, search_string="ERROR", start_time=start_stamp,end_time=e_stamp)
+        is_valid, error  = logs.verify_no_logs(stream, V2pc.MANIFEST_AGENT, Component.VMR, ["ERROR"], start_stamp, e_stamp)
         assert is_valid, error
 
-        is_valid, error  = vmr_helper.verify_error_logs_in_vmr(stream, V2pc.SEGMENT_RECORDER,Component.VMR, search_string="ERROR", start_time=start_stamp,end_time=e_stamp)
+        is_valid, error  = logs.verify_no_logs(stream, V2pc.SEGMENT_RECORDER, Component.VMR, ["ERROR"], start_stamp, e_stamp)
         assert is_valid, error
 
         # Step 5: Verify Memsql for recording information
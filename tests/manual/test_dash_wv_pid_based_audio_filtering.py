@@ -24,6 +24,7 @@ channels = streams_info[Component.STREAMS]
 
 @pytest.mark.parametrize("channel", channels)
 @pytest.mark.skipif(not V2PC_EXIST, reason="V2PC Doesn't Exist")
+@pytest.mark.config_mutating
 def test_dash_wv_pid_based_audio_filtering_ipdvrtests_143(channel):
     """
     JIRA_URL: https://jira01.engit.synamedia.com/browse/IPDVRTESTS-143
@@ -26,6 +26,7 @@ channels = streams_info[Component.STREAMS]
 
 @utils.test_case_logger
 @pytest.mark.parametrize("channel", channels)
+@pytest.mark.config_mutating
 def test_filter_video_based_on_rank_ipdvrtests_235(channel):
     """
     JIRA ID : IPDVRTESTS-235
@@ -14,9 +14,9 @@ import helpers.vmr.a8.a8_helper as a8
 import validators.validate_common as validate_common
 import validators.validate_recordings as validate_recordings
 import validators.validate_storage as validate_storage
+import framework.logs as logs
 
 from datetime import datetime
-from helpers.vmr import vmr_helper
 from helpers.constants import Cos
 from helpers.constants import Component
 from helpers.constants import TestLog
@@ -70,20 +70,17 @@ def test_schedule_recording_ipdvrtests_47(stream):
 
 
         #STEP 4: Check MA/SR pod logs for any errors while recording
-        LOGGER.info("Check MA/SR pod logs for any errors while recording")
+        #STEP 5:  Check no discontinuity errors in MA
+        LOGGER.info("Check MA/SR pod logs for any errors and MA for discontinuities while recording")
         s_time = utils.get_parsed_time(str(start_time)[:-1])
         e_time = utils.get_parsed_time(str(end_time)[:-1])
-        is_valid, error  = vmr_helper.verify_error_logs_in_vmr(stream,'manifest-agent', 'vmr', search_string="ERROR", start_time=s_time,end_time=e_time)
+        is_valid, error  = logs.verify_no_logs(stream, 'manifest-agent', 'vmr', ["ERROR", "discontinuity"], s_time,
+                                               e_time)
         assert is_valid,error
 
-        is_valid, error  = vmr_helper.verify_error_logs_in_vmr(stream,'segment-recorder', 'vmr', search_string="ERROR", start_time=s_time,end_time=e_time)
+        is_valid, error  = logs.verify_no_logs(stream, 'segment-recorder', 'vmr', ["ERROR"], s_time, e_time)
         assert is_valid,error
 
-        #STEP 5:  Check no discontinuity errors in MA
-        LOGGER.info("Check no discontinuity in MA")
-        is_valid, error  = vmr_helper.verify_error_logs_in_vmr(stream,"manifest-agent","vmr", search_string="discontinuity", start_time=s_time,end_time=e_time)
-        assert is_valid, error
-
         #STEP 6: Check recording goes to complete state without any coredumps on MCE/ABRGW
         LOGGER.info("Check core dumps")
         is_valid, msg = utils.core_dump("mce")
@@ -18,7 +18,7 @@ import helpers.vmr.a8.a8_helper as a8
 import validators.validate_common as validate_common
 import validators.validate_recordings as validate_recordings
 import validators.validate_storage as validate_storage
-from helpers.vmr import vmr_helper
+import framework.logs as logs
 from helpers.constants import Component
 from helpers.constants import RecordingAttribute, ValidationError
 from helpers.constants import TestLog
@@ -74,15 +74,13 @@ def test_update_recording_ipdvrtests_48(common_lib, stream):
         assert is_valid, error
 
         #step 4:Check MA/SR pod logs for any errors while recording
+        #step 5:Check no discontinuity errors in MA
         s_time = utils.get_parsed_time(str(start_time_new)[:-1])
         e_time = utils.get_parsed_time(str(end_time_new)[:-1])
-        is_valid, error  = vmr_helper.verify_error_logs_in_vmr(stream,'manifest-agent', 'vmr', search_string="ERROR", start_time=s_time,end_time=e_time)
-        assert is_valid,error
-        is_valid, error  = vmr_helper.verify_error_logs_in_vmr(stream,'segment-recorder', 'vmr', search_string="ERROR", start_time=s_time,end_time=e_time)
+        is_valid, error  = logs.verify_no_logs(stream, 'manifest-agent', 'vmr', ["ERROR", "discontinuity"], s_time,
+                                               e_time)
         assert is_valid,error
-
-        #step 5:Check no discontinuity errors in MA
-        is_valid, error  = vmr_helper.verify_error_logs_in_vmr(stream,'manifest-agent', 'vmr', search_string="discontinuity", start_time=s_time,end_time=e_time)
+        is_valid, error  = logs.verify_no_logs(stream, 'segment-recorder', 'vmr', ["ERROR"], s_time, e_time)
         assert is_valid,error
 
     finally:
@@ -2,23 +2,42 @@
 UpdateResults.py module is used to update the Test Case Result in Rally.
 The test results are read from the JSON file.
 
-It requires python's pyral and request modules installed.
+It requires python's request module installed.
 
-pyral - https://pypi.python.org/pypi/pyral
 request - https://pypi.python.org/pypi/requests
 
 We need to have the apikey generated from rally to update the results.
 -https://rally1.rallydev.com/login/accounts/index.html#/apps
+
+The Test Cases of the report are resolved with a few batched OR queries, and the FormattedID -> ObjectID map is
+cached on disk. The results are then posted concurrently over a pooled session retrying the throttled requests.
+Every result posted is written to a journal next to the result file, so an upload interrupted half way can be
+started again on the same report without posting twice the results already in Rally. The journal is removed
+once every result is posted.
+
+The Rally server is given by --server (or the RALLY_SERVER environment variable). --standin starts a local
+stand-in of the Rally web services and uploads to it, to try the uploader out without touching Rally:
+
+    python update_rally_results.py --standin output/report.json
 """
 
+import argparse
+import BaseHTTPServer
+import datetime
+import hashlib
 import json
-import sys
+import multiprocessing.pool as mp_pool
 import os
-from pyral import Rally
-import requests
-import datetime
+import re
+import SocketServer
+import threading
 import time
+import urlparse
+
+import requests
 import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -27,79 +46,114 @@ apikey = "_6X9zsSqXTYM2vMNEiBtQTWJ4iP1E7PpT8yQoIxxw"
 wrkspc = "SPVSS"
 project = "Republic-Cruiser"
 
-URL = "https://rally1.rallydev.com/slm/webservice/v3.0/testcaseresult/create"
-rally_url = "rally1.rallydev.com"
+rally_server = os.environ.get("RALLY_SERVER", "https://rally1.rallydev.com")
+wsapi_path = "/slm/webservice/v3.0"
+create_path = "/testcaseresult/create"
 
 approved_modules = ("basic-feature", "corner")
 allowed_results = ("Pass", "Fail", "Error", "Blocked")
 
-timeout = 5
+timeout = 30
 result_file_name = "output/report.json"
+cache_file_name = "output/rally_testcases.json"
+journal_suffix = ".rally_journal"
+
+# FormattedIDs per OR query, the query stays well within the URL length limits
+batch_size = 50
+post_workers = 16
+# Queries are retried when throttled (429) or when the server is unavailable
+query_retry = Retry(total=3, connect=3, read=0, backoff_factor=0.5, status_forcelist=(429, 502, 503, 504))
+# A result is posted again only when throttled: after a gateway error the result may have been created already
+post_retry = Retry(total=3, connect=3, read=0, backoff_factor=0.5, status_forcelist=(429,), method_whitelist=False)
 # -------------------------------------------------------------------------------------
 
 
-def send_url(method, url, server_timeout=None, header=None, payload_content=None):
+def get_session(server, pool_size=post_workers):
     """
-    Make the request to the API method.
+    Session sharing keep-alive connections between the posting threads.
     """
-
-    try:
-        if method == "post":
-            r = requests.post(url, data=payload_content, headers=header, timeout=server_timeout, allow_redirects=True,  verify=False)
-            return r
-        elif method == "put":
-            r = requests.put(url, data=payload_content, headers=header, timeout=server_timeout, allow_redirects=True, verify=False)
-            return r
-        elif method == "delete":
-            r = requests.delete(url, data=payload_content, headers=header, timeout=server_timeout, allow_redirects=True, verify=False)
-            return r
-        else:
-            r = requests.get(url, headers=header, timeout=server_timeout, allow_redirects=True, verify=False)
-            return r
-    except requests.exceptions.RequestException as error:
-        print error
-        print "Problem accessing ...... " + url
-    return None
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=query_retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Longest prefix wins, the result creations get their own retry policy
+    session.mount(server + wsapi_path + create_path,
+                  HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=post_retry))
+    session.headers.update({'zsessionid': apikey, 'Content-Type': 'application/json'})
+    session.verify = False
+    return session
+
+
+def get_or_query(field, values):
+    """
+    Rally query matching any of the values, the OR operator of Rally being binary:
+    (((field = "a") OR (field = "b")) OR (field = "c"))
+    """
+    query = None
+    for value in values:
+        condition = '(%s = "%s")' % (field, value)
+        query = condition if query is None else "(%s OR %s)" % (query, condition)
+    return query
 
 
 class ReadJson(object):
-    def __init__(self, result_file=result_file_name):
+    def __init__(self, result_file=result_file_name, server=rally_server, cache_file=cache_file_name,
+                 journal_file=None):
         try:
             self.result_file = result_file
+            self.server = server
+            self.cache_file = cache_file
+            self.journal_file = journal_file or result_file + journal_suffix
 
             self.notes = "Automation : "
-            self.rally = None
+            self.session = None
             self.workspace = None
             self.result_json = None
             self.run_date = None
             self.build = None
+            self.report_id = None
+            self.testcases = {}
+            self.posted = set()
+            self.journal = None
+            self.journal_lock = threading.Lock()
         except Exception as e:
             print "Exception :\n", str(e)
 
+    def get_url(self, path):
+        return self.server + wsapi_path + path
+
+    def query(self, artifact, query, fetch, page_size=200):
+        r = self.session.get(self.get_url("/" + artifact),
+                             params={'query': query, 'fetch': fetch, 'pagesize': page_size,
+                                     'workspace': self.workspace}, timeout=timeout)
+        r.raise_for_status()
+        return r.json()['QueryResult']['Results']
+
     def read_result(self):
         try:
             print "Read the Result from JSON file"
             assert os.path.exists(self.result_file), "Result file %s not present" % self.result_file
             print "Result file : ", self.result_file
-            res_file = open(self.result_file, "r")
-            self.result_json = json.load(res_file)
+            with open(self.result_file, "r") as res_file:
+                content = res_file.read()
+            self.result_json = json.loads(content)
+            # Identifies the report, a new report of the same build is a new upload
+            self.report_id = hashlib.sha1(content).hexdigest()
 
             print "\nEstablishing the connection"
-            self.rally = Rally(rally_url, apikey=apikey, workspace=wrkspc, project=project, verify_ssl_cert=False)
+            self.session = get_session(self.server)
 
-            assert self.rally, "Unable to communicate to Rally"
-
-            _wksp = self.rally.getWorkspace()
-            self.workspace = str(_wksp.ref)
-            assert self.workspace, "Unable to get the Workspace reference"
+            _wksp = self.query('workspace', '(Name = "%s")' % wrkspc, 'ObjectID')
+            assert _wksp, "Unable to get the Workspace reference"
+            self.workspace = str(_wksp[0]['_ref'])
             print "Workspace :", self.workspace
 
-            self.run_date = str(datetime.datetime.utcnow().isoformat())
-            print "Run Date : ", self.run_date
-
             self.build = str(self.result_json['summary']['suite']['git_lastcommit'])
             print "Build : ", self.build
 
+            self.run_date = self.read_journal() or str(datetime.datetime.utcnow().isoformat())
+            print "Run Date : ", self.run_date
+
             self.notes = self.notes + str(self.result_json["summary"]["setup"]["dcname"]) + " : "
             return True
 
@@ -107,66 +161,116 @@ class ReadJson(object):
             print "Exception in read_result :\n", str(e)
             return False
 
-    def update_result(self):
+    def read_journal(self):
+        """
+        Results of this report already posted by a previous, interrupted upload.
+        :return: run date of that upload, None if there was none
+        """
+        self.posted = set()
+        run_date = None
+        if os.path.isfile(self.journal_file):
+            with open(self.journal_file) as journal:
+                for line in journal:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Last line cut by the interruption
+                        continue
+                    if entry.get('report') == self.report_id:
+                        self.posted.add(entry['id'])
+                        run_date = entry['date']
+        if self.posted:
+            print "Resuming the upload of %s : %d result(s) already posted" % (run_date, len(self.posted))
+        return run_date
+
+    def write_journal(self, tc_format_id):
+        with self.journal_lock:
+            self.journal.write(json.dumps({'report': self.report_id, 'build': self.build, 'date': self.run_date,
+                                           'id': tc_format_id}) + "\n")
+            self.journal.flush()
+            os.fsync(self.journal.fileno())
+
+    def load_cache(self):
         try:
-            headers = {
-                        'zsessionid': apikey,
-                        'Content-Type': 'application/json'
-                       }
+            with open(self.cache_file) as cache:
+                return json.load(cache).get(self.workspace, {})
+        except (IOError, ValueError):
+            return {}
 
-            print "\nHeaders :", headers
+    def save_cache(self):
+        try:
+            with open(self.cache_file) as cache:
+                data = json.load(cache)
+        except (IOError, ValueError):
+            data = {}
+        data[self.workspace] = self.testcases
+        try:
+            with open(self.cache_file, "w") as cache:
+                json.dump(data, cache, indent=1, sort_keys=True)
+        except IOError as e:
+            print "Unable to save the Test Case cache %s : %s" % (self.cache_file, str(e))
+
+    def resolve_testcases(self, tc_format_ids):
+        """
+        Map the FormattedIDs to their ObjectID, the ones not cached yet in batched OR queries.
+        """
+        self.testcases = self.load_cache()
+        missing = sorted(set(tc_format_ids) - set(self.testcases))
+        print "\nTest Cases : %d cached, %d to look up" % (len(tc_format_ids) - len(missing), len(missing))
+        for i in range(0, len(missing), batch_size):
+            batch = missing[i:i + batch_size]
+            try:
+                for result in self.query('testcase', get_or_query('FormattedID', batch), 'FormattedID,ObjectID',
+                                         page_size=len(batch)):
+                    self.testcases[str(result['FormattedID'])] = result['ObjectID']
+            except Exception as e:
+                print "Exception while retrieving the testcases %s :\n%s" % (batch, str(e))
+        if missing:
+            self.save_cache()
 
+    def update_result(self):
+        try:
             testcase_list = []
             skipped_testcase = []
             final_list = []
             update_failed = []
+            to_post = []
+
+            self.resolve_testcases([tc['id'] for tc in self.result_json['testcases'].values()])
 
             for tc in self.result_json['testcases']:
                 tc = self.result_json['testcases'][tc]
                 tc_format_id = tc['id']
-                try:
-                    testcase_list.append(tc_format_id)
-
-                    tcname, tcresult, tc_duration, notes = self.get_testcase_details(tc, tc_format_id)
-
-                    if tcresult is None or tcresult == "Skip":
-                        skipped_testcase.append(tc_format_id)
-                        continue
-
-                    print "TestCase id of %s is %s Result : %s Duration : %s" \
-                          % (tc_format_id, tcname, tcresult, tc_duration)
-
-                    res1, payload = self.post_result(headers, self.build, tcname, self.run_date,
-                                                     tcresult, self.workspace, tc_duration, notes)
-
-                    if res1 is None:
-                        update_failed.append(tc_format_id)
-                        continue
-
-                    if res1.status_code != 200:
-                        print "#######################################"
-                        print "Update Failed for %s" % tc_format_id
-                        print "Status Code : ", res1.status_code
-                        print "#######################################"
-                        update_failed.append(tc_format_id)
-                        continue
-
-                    res = json.loads(res1.content)
-                    if res['CreateResult']['Errors']:
-                        print "#######################################"
-                        print "Update Failed for %s" % tc_format_id
-                        print "Error :", res['CreateResult']['Errors']
-                        print "Payload : ", payload
-                        print "#######################################"
-                        update_failed.append(tc_format_id)
-                        continue
-
+                testcase_list.append(tc_format_id)
+                if tc_format_id in self.posted:
                     final_list.append(tc_format_id)
-                except Exception as e:
-                    print "\nException when updating ", tc_format_id, "\nError : ", str(e)
-                    update_failed.append(tc_format_id)
+                    continue
+
+                tcname, tcresult, tc_duration, notes = self.get_testcase_details(tc, tc_format_id)
+
+                if tcresult is None or tcresult == "Skip":
+                    skipped_testcase.append(tc_format_id)
+                    continue
+
+                print "TestCase id of %s is %s Result : %s Duration : %s" \
+                      % (tc_format_id, tcname, tcresult, tc_duration)
+                to_post.append((tc_format_id, tcname, tcresult, tc_duration, notes))
+
+            start = time.time()
+            self.journal = open(self.journal_file, "a")
+            pool = mp_pool.ThreadPool(processes=post_workers)
+            try:
+                for tc_format_id, is_updated in pool.imap_unordered(self.post_testcase, to_post):
+                    (final_list if is_updated else update_failed).append(tc_format_id)
+            finally:
+                pool.close()
+                self.journal.close()
+            if not update_failed:
+                # Everything is in Rally, nothing left to resume
+                os.unlink(self.journal_file)
 
             print "\n", "#" * 10, " SUMMARY ", "#" * 10
+            print "\n%d result(s) posted in %.1f seconds" % (len(to_post), time.time() - start)
             print "\nTest Results updated for : ", final_list
             print "\nTest Case not Present :", skipped_testcase
             print "\nTest case failed to update result :", update_failed
@@ -177,13 +281,44 @@ class ReadJson(object):
             print "Exception in update_result:\n", str(ae)
             return False
 
+    def post_testcase(self, details):
+        tc_format_id, tcname, tcresult, tc_duration, notes = details
+        try:
+            res1, payload = self.post_result(self.build, tcname, self.run_date, tcresult, self.workspace,
+                                             tc_duration, notes)
+
+            if res1 is None:
+                return tc_format_id, False
+
+            if res1.status_code != 200:
+                print "#######################################"
+                print "Update Failed for %s" % tc_format_id
+                print "Status Code : ", res1.status_code
+                print "#######################################"
+                return tc_format_id, False
+
+            res = json.loads(res1.content)
+            if res['CreateResult']['Errors']:
+                print "#######################################"
+                print "Update Failed for %s" % tc_format_id
+                print "Error :", res['CreateResult']['Errors']
+                print "Payload : ", payload
+                print "#######################################"
+                return tc_format_id, False
+
+            self.write_journal(tc_format_id)
+            return tc_format_id, True
+        except Exception as e:
+            print "\nException when updating ", tc_format_id, "\nError : ", str(e)
+            return tc_format_id, False
+
     def get_testcase_details(self, tc, tc_format_id):
         try:
             # Get the Test Case name
             tcname = self.get_testcase_name(tc_format_id)
             if not tcname:
                 # print "Test case Skipped : ", tc_format_id
-                return tc_format_id, "SKIPPED", None, None
+                return tc_format_id, None, None, None
 
             tcresult = str(tc['status'])
             assert tcresult, "Test Result not found for %s" % tc_format_id
@@ -213,59 +348,109 @@ class ReadJson(object):
             print "Error in getting the details of ", tc_format_id, " Error : ", str(e)
             return tc_format_id, None, None, None
 
-    def post_result(self, headers, build, tc_name, run_date, tc_result, workspace, duration, notes):
+    def post_result(self, build, tc_name, run_date, tc_result, workspace, duration, notes):
         payload = None
         try:
-            payload = """{"TestCaseResult":
-                                        {
-                                        "Build":"%s",
-                                        "TestCase":"%s",
-                                        "Date":"%s",
-                                        "Verdict":"%s",
-                                        "Workspace":"%s",
-                                        "Duration":"%s",
-                                        "Notes":"%s"
-                                        }
-                                    }
-                                """ % (build, tc_name, run_date, tc_result, workspace, duration, notes)
-
-            r = send_url("post", URL, timeout, headers, payload)
+            payload = json.dumps({"TestCaseResult": {
+                "Build": build,
+                "TestCase": tc_name,
+                "Date": run_date,
+                "Verdict": tc_result,
+                "Workspace": workspace,
+                "Duration": duration,
+                "Notes": notes,
+            }})
+
+            r = self.session.post(self.get_url(create_path), data=payload, timeout=timeout)
 
             return r, payload
 
-        except Exception as ae:
-            print "Exception in post_result :\n", str(ae)
+        except requests.exceptions.RequestException as error:
+            print error
+            print "Problem accessing ...... " + self.get_url(create_path)
             return None, payload
 
     def get_testcase_name(self, tc):
-        try:
-            # print "Test Case :",tc
-            name = self.rally.get('TestCase', query='FormattedID = "%s"' % tc, fetch=True, projectScopeUp=True)
-            assert name.data['Results'], "Unable to find the Testcase %s" % tc
-            assert name.data['Results'][0]['ObjectID'], \
-                "Unable to get the details of the Testcase %s \nData Fetched %s" % (tc, name.data['Results'])
-
-            tcname = "testcase/%s" % (name.data['Results'][0]['ObjectID'])
-            return str(tcname)
-        except Exception as e:
-            print "Exception while retrieving the testcase %s :\n%s" % (tc, str(e))
+        object_id = self.testcases.get(tc)
+        if not object_id:
+            print "Unable to find the Testcase %s" % tc
             return None
+        return "testcase/%s" % object_id
+
+
+class StandInHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """
+    Answers the few Rally web services used here: workspace and testcase queries, testcaseresult/create.
+    Every FormattedID exists, its ObjectID is derived from its number.
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, data):
+        body = json.dumps(data)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse.urlparse(self.path)
+        query = urlparse.parse_qs(url.query).get('query', [""])[0]
+        if url.path.endswith("/workspace"):
+            results = [{"_ref": "http://%s:%d%s/workspace/1" % (self.server.server_address + (wsapi_path,)),
+                        "ObjectID": 1}]
+        else:
+            results = [{"FormattedID": tc, "ObjectID": int(re.sub(r"\D", "", tc) or 0) + 1000000}
+                       for tc in re.findall(r'FormattedID = "([^"]+)"', query)]
+        self._send({"QueryResult": {"Results": results, "TotalResultCount": len(results), "Errors": []}})
+
+    def do_POST(self):
+        result = json.loads(self.rfile.read(int(self.headers.getheader("Content-Length", 0))))
+        # Rally answers in a few tens of milliseconds
+        time.sleep(0.05)
+        self._send({"CreateResult": {"Errors": [], "Warnings": [], "Object": result["TestCaseResult"]}})
+
+
+class StandInServer(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+def start_standin():
+    server = StandInServer(("127.0.0.1", 0), StandInHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    print "Rally stand-in listening on port %d" % server.server_address[1]
+    return server, "http://127.0.0.1:%d" % server.server_address[1]
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Update the Test Case Results in Rally")
+    parser.add_argument("result_file", nargs="?", default=result_file_name)
+    parser.add_argument("--server", default=rally_server, help="Rally server URL")
+    parser.add_argument("--standin", action="store_true", help="Upload to a local stand-in of Rally")
+    args = parser.parse_args()
+
+    standin = None
     try:
-        sa = sys.argv
-        if len(sa) == 2:
-            result = sa[1]
-            rj = ReadJson(result_file=result)
-        else:
-            rj = ReadJson()
+        server, cache_file, journal_file = args.server, cache_file_name, None
+        if args.standin:
+            # Nothing posted to the stand-in may be taken for posted to Rally
+            standin, server = start_standin()
+            cache_file = os.path.join(os.path.dirname(args.result_file), "rally_standin_testcases.json")
+            journal_file = args.result_file + ".standin" + journal_suffix
+        rj = ReadJson(result_file=args.result_file, server=server, cache_file=cache_file, journal_file=journal_file)
         assert rj.read_result(), "Error in Read Result"
         assert rj.update_result(), "Error in Update Result"
         return True
     except Exception as e:
         print "Exception :\n", str(e)
         return False
+    finally:
+        if standin:
+            standin.shutdown()
 
 if __name__ == "__main__":
     main()